@@ -1,4 +1,5 @@
 import argparse
+import inspect
 import json
 import logging
 from typing import Any, Dict
@@ -12,6 +13,41 @@ from aws_resources.output.markdown import render_markdown_report
 logger = logging.getLogger(__name__)
 
 
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+
+def analyzer_options(args) -> Dict[str, Dict[str, Any]]:
+    """Collect per-analyzer constructor options from the CLI flags.
+
+    Only flags the user actually set are passed, so analyzer defaults apply
+    otherwise. Keys match the ones used by the registry factories.
+    """
+    options: Dict[str, Dict[str, Any]] = {}
+    if getattr(args, "sns_attributes", False):
+        options.setdefault("sns", {})["fetch_attributes"] = True
+    if getattr(args, "dynamodb_sample_size", None) is not None:
+        options.setdefault("dynamodb", {})["sample_size"] = args.dynamodb_sample_size
+    if getattr(args, "route53_deep_scan", False):
+        options.setdefault("route53", {})["deep_scan"] = True
+    if getattr(args, "s3_inventory_dir", None):
+        options.setdefault("s3", {})["inventory_dir"] = args.s3_inventory_dir
+    if getattr(args, "s3_deep_scan", False):
+        options.setdefault("s3", {})["deep_scan"] = True
+    if getattr(args, "kms_include_aws_managed", False):
+        options.setdefault("kms", {})["include_aws_managed"] = True
+    if getattr(args, "kms_cache_ttl", None) is not None:
+        options.setdefault("kms", {})["cache_ttl_seconds"] = args.kms_cache_ttl
+    return options
+
+
 def discover_command(args):
     # Use Cost Explorer to find which services have cost activity in the given period
     # Default to the current month's first and last day if not provided.
@@ -34,6 +70,7 @@ def discover_command(args):
         return
 
     output: Dict[str, Any] = {"period": {"start": start, "end": end}, "services": []}
+    options = analyzer_options(args)
 
     # built-in blacklist: fragments of service names (lowercase) that should
     # always be excluded from analysis. Common example: tax-related charges.
@@ -95,9 +132,16 @@ def discover_command(args):
             try:
                 # Create analyzer instance passing through profile/region if the
                 # factory accepts them. Factories for built-in analyzers accept
-                # (profile, region_name) as optional keyword args.
+                # (profile, region_name) as optional keyword args; configurable
+                # ones also take the per-analyzer CLI `options`.
+                kwargs: Dict[str, Any] = {"profile": args.profile, "region_name": args.region}
+                try:
+                    if "options" in inspect.signature(analyzer_factory).parameters:
+                        kwargs["options"] = options
+                except (TypeError, ValueError):
+                    pass
                 try:
-                    analyzer = analyzer_factory(profile=args.profile, region_name=args.region)
+                    analyzer = analyzer_factory(**kwargs)
                 except TypeError:
                     # backward-compat: factory may not accept args
                     analyzer = analyzer_factory()
@@ -120,6 +164,14 @@ def discover_command(args):
     # markdown renderer moved to `aws_resources.output.markdown`
 
 
+def s3_inventory_command(args):
+    # Purely local: aggregate downloaded S3 Inventory reports without calling AWS
+    from aws_resources.collectors.s3_inventory import S3InventoryCollector
+
+    collector = S3InventoryCollector(args.dir, prefix_depth=args.prefix_depth, max_workers=args.workers)
+    print(json.dumps({"buckets": collector.collect()}, indent=2))
+
+
 def main():
     parser = argparse.ArgumentParser(prog="aws_resources")
     subparsers = parser.add_subparsers(dest="command")
@@ -136,11 +188,34 @@ def main():
     discover.add_argument("--format", "--output-format", dest="out_format",
                           choices=["json", "md"], default="json",
                           help="Output format: 'json' (default) or 'md' for a pretty Markdown report")
+    discover.add_argument("--sns-attributes", action="store_true", dest="sns_attributes",
+                          help="Also fetch SNS topic attributes in details mode (one call per topic)")
+    discover.add_argument("--dynamodb-sample-size", dest="dynamodb_sample_size", type=positive_int, default=None,
+                          help="Describe a random sample of N DynamoDB tables for the summary estimates")
+    discover.add_argument("--route53-deep-scan", action="store_true", dest="route53_deep_scan",
+                          help="Count Route 53 records by type (one ListResourceRecordSets sweep per zone)")
+    discover.add_argument("--s3-inventory-dir", dest="s3_inventory_dir", required=False,
+                          help="Merge local S3 Inventory reports from this directory into the S3 details")
+    discover.add_argument("--s3-deep-scan", action="store_true", dest="s3_deep_scan",
+                          help="List objects of buckets without metrics or inventory (budgeted, slow)")
+    discover.add_argument("--kms-include-aws-managed", action="store_true", dest="kms_include_aws_managed",
+                          help="Also describe AWS-managed KMS keys in details mode")
+    discover.add_argument("--kms-cache-ttl", dest="kms_cache_ttl", type=float, default=None,
+                          help="Re-describe cached KMS keys older than this many seconds (default: 86400)")
+
+    inventory = subparsers.add_parser("s3-inventory", help="Aggregate local S3 Inventory reports (offline)")
+    inventory.add_argument("--dir", required=True, help="Directory containing downloaded S3 Inventory reports")
+    inventory.add_argument("--prefix-depth", dest="prefix_depth", type=int, default=1,
+                           help="Number of key prefix levels to aggregate by (default: 1)")
+    inventory.add_argument("--workers", type=int, default=None,
+                           help="Number of worker processes (default: number of CPUs)")
 
     args = parser.parse_args()
 
     if args.command == "discover":
         discover_command(args)
+    elif args.command == "s3-inventory":
+        s3_inventory_command(args)
     else:
         parser.print_help()
 
@@ -29,6 +29,14 @@ from .kms import KMSAnalyzer
 from .ec2_other import EC2OtherAnalyzer
 from .documentdb import DocumentDBAnalyzer
 
+
+def _with_options(cls, key):
+    """Factory that also passes the CLI's per-analyzer options (`options[key]`) to `cls`."""
+    def factory(profile=None, region_name=None, options=None):
+        return cls(profile=profile, region_name=region_name, **((options or {}).get(key) or {}))
+    return factory
+
+
 # Register EC2 analyzer for the Cost Explorer service token used by AWS
 register_analyzer("Amazon Elastic Compute Cloud - Compute", lambda profile=None, region_name=None: EC2Analyzer(profile=profile, region_name=region_name))
 # Register RDS analyzer
@@ -38,14 +46,14 @@ from .vpc import VPCAnalyzer
 register_analyzer("Amazon VPC", lambda profile=None, region_name=None: VPCAnalyzer(profile=profile, region_name=region_name))
 register_analyzer("Amazon Virtual Private Cloud", lambda profile=None, region_name=None: VPCAnalyzer(profile=profile, region_name=region_name))
 # Register S3
-register_analyzer("Amazon Simple Storage Service", lambda profile=None, region_name=None: S3Analyzer(profile=profile, region_name=region_name))
-register_analyzer("Amazon S3", lambda profile=None, region_name=None: S3Analyzer(profile=profile, region_name=region_name))
+register_analyzer("Amazon Simple Storage Service", _with_options(S3Analyzer, "s3"))
+register_analyzer("Amazon S3", _with_options(S3Analyzer, "s3"))
 # Register CloudFront
 register_analyzer("Amazon CloudFront", lambda profile=None, region_name=None: CloudFrontAnalyzer(profile=profile, region_name=region_name))
 register_analyzer("Amazon CloudFront (Amazon)", lambda profile=None, region_name=None: CloudFrontAnalyzer(profile=profile, region_name=region_name))
 # Register DynamoDB
-register_analyzer("Amazon DynamoDB", lambda profile=None, region_name=None: DynamoDBAnalyzer(profile=profile, region_name=region_name))
-register_analyzer("Amazon DynamoDB (Amazon)", lambda profile=None, region_name=None: DynamoDBAnalyzer(profile=profile, region_name=region_name))
+register_analyzer("Amazon DynamoDB", _with_options(DynamoDBAnalyzer, "dynamodb"))
+register_analyzer("Amazon DynamoDB (Amazon)", _with_options(DynamoDBAnalyzer, "dynamodb"))
 # Register ECR
 register_analyzer("Amazon Elastic Container Registry", lambda profile=None, region_name=None: ECRAnalyzer(profile=profile, region_name=region_name))
 register_analyzer("Amazon ECR", lambda profile=None, region_name=None: ECRAnalyzer(profile=profile, region_name=region_name))
@@ -74,27 +82,27 @@ register_analyzer("Amazon ElastiCache (Amazon)", lambda profile=None, region_nam
 register_analyzer("Amazon OpenSearch Service", lambda profile=None, region_name=None: OpenSearchAnalyzer(profile=profile, region_name=region_name))
 register_analyzer("Amazon Elasticsearch", lambda profile=None, region_name=None: OpenSearchAnalyzer(profile=profile, region_name=region_name))
 # Register Route53
-register_analyzer("Amazon Route 53", lambda profile=None, region_name=None: Route53Analyzer(profile=profile, region_name=region_name))
+register_analyzer("Amazon Route 53", _with_options(Route53Analyzer, "route53"))
 # Register SES
 register_analyzer("Amazon Simple Email Service", lambda profile=None, region_name=None: SESAnalyzer(profile=profile, region_name=region_name))
 # Register SNS
-register_analyzer("Amazon Simple Notification Service", lambda profile=None, region_name=None: SNSAnalyzer(profile=profile, region_name=region_name))
+register_analyzer("Amazon Simple Notification Service", _with_options(SNSAnalyzer, "sns"))
 # Register SQS
 register_analyzer("Amazon Simple Queue Service", lambda profile=None, region_name=None: SQSAnalyzer(profile=profile, region_name=region_name))
 register_analyzer("Amazon SQS", lambda profile=None, region_name=None: SQSAnalyzer(profile=profile, region_name=region_name))
 # Register Direct Connect
 register_analyzer("AWS Direct Connect", lambda profile=None, region_name=None: DirectConnectAnalyzer(profile=profile, region_name=region_name))
 # Register KMS
-register_analyzer("AWS Key Management Service", lambda profile=None, region_name=None: KMSAnalyzer(profile=profile, region_name=region_name))
-register_analyzer("Amazon Key Management Service", lambda profile=None, region_name=None: KMSAnalyzer(profile=profile, region_name=region_name))
+register_analyzer("AWS Key Management Service", _with_options(KMSAnalyzer, "kms"))
+register_analyzer("Amazon Key Management Service", _with_options(KMSAnalyzer, "kms"))
 # Register EC2 - Other
 register_analyzer("EC2 - Other", lambda profile=None, region_name=None: EC2OtherAnalyzer(profile=profile, region_name=region_name))
 register_analyzer("Amazon EC2 - Other", lambda profile=None, region_name=None: EC2OtherAnalyzer(profile=profile, region_name=region_name))
 
-# Register DocumentDB (cost explorer shows the long service name in some reports)
-# This one I coment out because it overlaps with RDS analyzer
-#register_analyzer("Amazon DocumentDB (with MongoDB compatibility)", lambda profile=None, region_name=None: DocumentDBAnalyzer(profile=profile, region_name=region_name))
-#register_analyzer("Amazon DocumentDB", lambda profile=None, region_name=None: DocumentDBAnalyzer(profile=profile, region_name=region_name))
+# Register DocumentDB (cost explorer shows the long service name in some reports).
+# RDS skips DocumentDB/Neptune engines and DocumentDB filters on engine=docdb, so they do not overlap.
+register_analyzer("Amazon DocumentDB (with MongoDB compatibility)", lambda profile=None, region_name=None: DocumentDBAnalyzer(profile=profile, region_name=region_name))
+register_analyzer("Amazon DocumentDB", lambda profile=None, region_name=None: DocumentDBAnalyzer(profile=profile, region_name=region_name))
 
 # Import the module named `lambda` using importlib because `lambda` is a
 # Python keyword and `from .lambda import ...` is a syntax error. We import the
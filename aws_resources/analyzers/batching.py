@@ -0,0 +1,80 @@
+"""Batching helpers shared by analyzers
+
+Small utilities for splitting API inputs into service-sized batches and for
+fanning out independent API calls with a bounded thread pool. boto3 clients are
+thread-safe, so analyzers can share a single client across workers. Calls
+against APIs with low rate limits can be wrapped in `call_with_retries`, which
+backs off and retries throttling errors.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Sequence, TypeVar
+import time
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Default number of concurrent API calls per analyzer. Kept small so that we
+# stay well below the per-account throttling limits of most AWS APIs.
+DEFAULT_MAX_WORKERS = 8
+
+# error codes AWS APIs use to reject calls over their request rate
+THROTTLING_ERROR_CODES = frozenset({
+    "PriorRequestNotComplete",
+    "RequestLimitExceeded",
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+})
+DEFAULT_RETRY_ATTEMPTS = 5
+DEFAULT_RETRY_BASE_DELAY = 1.0
+
+
+def chunks(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    """Yield consecutive slices of `items` with at most `size` elements."""
+    if size < 1:
+        raise ValueError("size must be >= 1")
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def bounded_map(fn: Callable[[T], R], items: Iterable[T], max_workers: int = DEFAULT_MAX_WORKERS) -> List[R]:
+    """Apply `fn` to every item using at most `max_workers` threads.
+
+    Results are returned in input order. `fn` is expected to handle (and log)
+    its own per-item failures; an exception escaping `fn` is re-raised here.
+    """
+    items = list(items)
+    if not items:
+        return []
+    if max_workers <= 1 or len(items) == 1:
+        return [fn(i) for i in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(fn, items))
+
+
+def is_throttling_error(exc: BaseException) -> bool:
+    """Return True if `exc` is a botocore ClientError for a throttled request."""
+    response = getattr(exc, "response", None) or {}
+    return (response.get("Error") or {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+def call_with_retries(
+    fn: Callable[[], R],
+    attempts: int = DEFAULT_RETRY_ATTEMPTS,
+    base_delay: float = DEFAULT_RETRY_BASE_DELAY,
+) -> R:
+    """Call `fn`, retrying throttling errors with exponential backoff.
+
+    Other errors, and the last throttling error once `attempts` are used up,
+    are re-raised.
+    """
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except Exception as exc:
+            if attempt == attempts - 1 or not is_throttling_error(exc):
+                raise
+            time.sleep(base_delay * 2 ** attempt)
+    raise ValueError("attempts must be >= 1")
@@ -2,11 +2,20 @@
 
 Summarizes AWS Direct Connect connections. Lightweight summary only by default
 with optional per-connection details.
+
+Virtual interfaces (one DescribeVirtualInterfaces call returns every VIF in the
+region) and Direct Connect gateways (one paginated sweep) are indexed in dicts
+and joined to connections by connectionId, giving VIF counts, VLAN usage and
+bandwidth totals per connection without per-connection calls. VIFs whose
+connectionId is not a listed connection (VIFs on a LAG carry the `dxlag-` id)
+are counted as `unattached_virtual_interfaces`, so the per-connection counts
+plus that figure add up to the VIF total.
 """
 from __future__ import annotations
 
 from typing import Dict, List, Optional
 import logging
+import re
 
 try:
     import boto3
@@ -15,6 +24,17 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+_BANDWIDTH_RE = re.compile(r"^\s*([\d.]+)\s*([GM])bps\s*$", re.IGNORECASE)
+
+
+def _bandwidth_mbps(value: Optional[str]) -> int:
+    """Parse Direct Connect bandwidth strings such as '1Gbps' or '500Mbps'."""
+    m = _BANDWIDTH_RE.match(value or "")
+    if not m:
+        return 0
+    amount = float(m.group(1))
+    return int(amount * 1000) if m.group(2).upper() == "G" else int(amount)
+
 
 class DirectConnectAnalyzer:
     def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
@@ -29,6 +49,13 @@ class DirectConnectAnalyzer:
         # Direct Connect is a regional/global service; client name 'directconnect'
         self.client = self.session.client("directconnect", region_name=region_name)
 
+    def _gateways(self) -> Dict[str, Dict]:
+        gateways: Dict[str, Dict] = {}
+        for page in self.client.get_paginator("describe_direct_connect_gateways").paginate():
+            for g in page.get("directConnectGateways", []) or []:
+                gateways[g.get("directConnectGatewayId")] = g
+        return gateways
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
         try:
             resp = self.client.describe_connections()
@@ -36,12 +63,67 @@ class DirectConnectAnalyzer:
         except Exception:
             conns = []
 
-        result = {"summary": {"total_connections": len(conns)}}
+        try:
+            vifs = self.client.describe_virtual_interfaces().get("virtualInterfaces", []) or []
+        except Exception:
+            logger.debug("Failed to describe virtual interfaces", exc_info=True)
+            vifs = []
+
+        try:
+            gateways = self._gateways()
+        except Exception:
+            logger.debug("Failed to describe Direct Connect gateways", exc_info=True)
+            gateways = {}
+
+        vifs_by_conn: Dict[str, List[Dict]] = {}
+        vifs_by_type: Dict[str, int] = {}
+        for v in vifs:
+            vifs_by_conn.setdefault(v.get("connectionId"), []).append(v)
+            t = v.get("virtualInterfaceType") or "unknown"
+            vifs_by_type[t] = vifs_by_type.get(t, 0) + 1
+
+        conn_ids = {c.get("connectionId") for c in conns}
+        unattached = sum(len(v) for cid, v in vifs_by_conn.items() if cid not in conn_ids)
+
+        result = {
+            "summary": {
+                "total_connections": len(conns),
+                "total_bandwidth_mbps": sum(_bandwidth_mbps(c.get("bandwidth")) for c in conns),
+                "total_virtual_interfaces": len(vifs),
+                "virtual_interfaces_by_type": vifs_by_type,
+                "unattached_virtual_interfaces": unattached,
+                "total_direct_connect_gateways": len(gateways),
+            }
+        }
 
         if include_details and conns:
             details = []
             for c in conns:
-                details.append({"connectionId": c.get("connectionId"), "location": c.get("location"), "bandwidth": c.get("bandwidth"), "connectionState": c.get("connectionState")})
+                cvifs = vifs_by_conn.get(c.get("connectionId"), [])
+                gw_ids = sorted({v.get("directConnectGatewayId") for v in cvifs if v.get("directConnectGatewayId")})
+                details.append({
+                    "connectionId": c.get("connectionId"),
+                    "location": c.get("location"),
+                    "bandwidth": c.get("bandwidth"),
+                    "bandwidth_mbps": _bandwidth_mbps(c.get("bandwidth")),
+                    "connectionState": c.get("connectionState"),
+                    "virtual_interface_count": len(cvifs),
+                    "vlans": sorted(v.get("vlan") for v in cvifs if v.get("vlan") is not None),
+                    "virtual_interfaces": [
+                        {
+                            "id": v.get("virtualInterfaceId"),
+                            "name": v.get("virtualInterfaceName"),
+                            "type": v.get("virtualInterfaceType"),
+                            "vlan": v.get("vlan"),
+                            "state": v.get("virtualInterfaceState"),
+                            "direct_connect_gateway_id": v.get("directConnectGatewayId"),
+                        }
+                        for v in cvifs
+                    ],
+                    "direct_connect_gateways": [
+                        {"id": g, "name": (gateways.get(g) or {}).get("directConnectGatewayName")} for g in gw_ids
+                    ],
+                })
             result["connections"] = details
 
         return result
@@ -5,17 +5,25 @@ Summarizes Amazon DocumentDB (with MongoDB compatibility) clusters and nodes.
 This is best-effort:
 - lists DB clusters via the `docdb` client
 - lists DB instances via the `docdb` client and groups them by cluster
+- both listings pass an `engine=docdb` filter; the docdb client shares the RDS
+  endpoint and would otherwise also return RDS and Neptune resources
 - derives instance-class -> EC2 instance type by stripping leading "db." where appropriate
 - calls EC2 DescribeInstanceTypes to enrich vCPU/memory per instance type
 - returns summary with total_clusters, total_nodes, by_instance_class and best-effort total_vCPU/total_memory_mib
 
 The analyzer keeps detailed per-cluster and per-instance lists when `include_details=True`.
+Clusters and instances are projected to the fields declared below as each page
+arrives, so raw DBCluster/DBInstance payloads are never retained.
 """
 from __future__ import annotations
 
 from typing import Dict, List, Optional
 import logging
 
+from .instance_types import InstanceTypeLookup
+from .filters import engine_filter
+from .projection import project_pages
+
 try:
     import boto3
 except Exception:  # pragma: no cover - tests inject a fake boto3
@@ -23,6 +31,24 @@ except Exception:  # pragma: no cover - tests inject a fake boto3
 
 logger = logging.getLogger(__name__)
 
+DOCDB_ENGINE = "docdb"
+
+CLUSTER_FIELDS = {
+    "cluster_identifier": lambda c: c.get("DBClusterIdentifier") or c.get("DBClusterId"),
+    "engine": "Engine",
+    "status": lambda c: c.get("Status") or c.get("DBClusterStatus"),
+}
+INSTANCE_FIELDS = {
+    "instance_id": lambda i: i.get("DBInstanceIdentifier") or i.get("DBInstanceId"),
+    "class": lambda i: i.get("DBInstanceClass") or i.get("InstanceClass"),
+    "engine": "Engine",
+    "cluster_identifier": lambda i: i.get("DBClusterIdentifier") or i.get("DBClusterId"),
+    "endpoint": "Endpoint.Address",
+    "status": "DBInstanceStatus",
+    "availability_zone": "AvailabilityZone",
+    "created": "InstanceCreateTime",
+}
+
 
 class DocumentDBAnalyzer:
     def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
@@ -37,49 +63,50 @@ class DocumentDBAnalyzer:
         self.client = self.session.client("docdb", region_name=region_name)
 
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
+        filters = engine_filter([DOCDB_ENGINE])
+
         # list clusters
         try:
             paginator = self.client.get_paginator("describe_db_clusters")
-            clusters: List[Dict] = []
-            for page in paginator.paginate():
-                clusters.extend(page.get("DBClusters", []) or [])
+            clusters: List[Dict] = list(project_pages(paginator.paginate(Filters=filters), "DBClusters", CLUSTER_FIELDS))
         except Exception:
             # fallback: call describe_db_clusters once
             try:
-                resp = self.client.describe_db_clusters()
-                clusters = resp.get("DBClusters", [])
+                resp = self.client.describe_db_clusters(Filters=filters)
+                clusters = list(project_pages([resp], "DBClusters", CLUSTER_FIELDS))
             except Exception:
                 logger.exception("Failed to list DocumentDB clusters")
                 clusters = []
 
         # list instances and group by cluster
-        instances: List[Dict] = []
         try:
             paginator = self.client.get_paginator("describe_db_instances")
-            for page in paginator.paginate():
-                instances.extend(page.get("DBInstances", []) or [])
+            instances: List[Dict] = list(project_pages(paginator.paginate(Filters=filters), "DBInstances", INSTANCE_FIELDS))
         except Exception:
             try:
-                resp = self.client.describe_db_instances()
-                instances = resp.get("DBInstances", [])
+                resp = self.client.describe_db_instances(Filters=filters)
+                instances = list(project_pages([resp], "DBInstances", INSTANCE_FIELDS))
             except Exception:
                 logger.debug("Failed to list DocumentDB instances", exc_info=True)
                 instances = []
 
+        # guard against endpoints that ignore the filter
+        clusters = [c for c in clusters if (c["engine"] or DOCDB_ENGINE) == DOCDB_ENGINE]
+        instances = [i for i in instances if (i["engine"] or DOCDB_ENGINE) == DOCDB_ENGINE]
+
         # map cluster identifier -> instances
         cluster_to_instances: Dict[str, List[Dict]] = {}
         for inst in instances:
-            cluster = inst.get("DBClusterIdentifier") or inst.get("DBClusterId") or inst.get("DBClusterIdentifier")
-            if cluster:
-                cluster_to_instances.setdefault(cluster, []).append(inst)
+            if inst["cluster_identifier"]:
+                cluster_to_instances.setdefault(inst["cluster_identifier"], []).append(inst)
 
         total_clusters = len(clusters)
-        total_nodes = sum(len(cluster_to_instances.get(c.get("DBClusterIdentifier") or c.get("DBClusterId"), [])) for c in clusters)
+        total_nodes = sum(len(cluster_to_instances.get(c["cluster_identifier"], [])) for c in clusters)
 
         # compute per-instance-class counts
         per_class_counts: Dict[str, int] = {}
         for inst in instances:
-            clazz = inst.get("DBInstanceClass") or inst.get("InstanceClass")
+            clazz = inst["class"]
             if clazz:
                 per_class_counts[clazz] = per_class_counts.get(clazz, 0) + 1
 
@@ -100,21 +127,7 @@ class DocumentDBAnalyzer:
                 if ec2_t:
                     ec2_types.add(ec2_t)
 
-            type_specs: Dict[str, Dict[str, int]] = {}
-            if ec2_types:
-                ec2_client = self.session.client("ec2", region_name=self.region_name)
-                itypes = list(ec2_types)
-                for i in range(0, len(itypes), 100):
-                    chunk = itypes[i : i + 100]
-                    try:
-                        resp = ec2_client.describe_instance_types(InstanceTypes=chunk)
-                        for it in resp.get("InstanceTypes", []):
-                            name = it.get("InstanceType")
-                            vcpu = it.get("VCpuInfo", {}).get("DefaultVCpus") or 0
-                            mem_mib = it.get("MemoryInfo", {}).get("SizeInMiB") or 0
-                            type_specs[name] = {"vCPU": vcpu, "memory_mib": mem_mib}
-                    except Exception:
-                        logger.exception("Failed to describe EC2 instance types for %s", chunk)
+            type_specs = InstanceTypeLookup(self.session, self.region_name).resolve(ec2_types)
 
             # build by_instance_type summary using mapped ec2 types
             by_instance_type: Dict[str, Dict[str, int]] = {}
@@ -143,20 +156,13 @@ class DocumentDBAnalyzer:
             # include per-cluster and per-instance lists
             details = []
             for c in clusters:
-                cid = c.get("DBClusterIdentifier") or c.get("DBClusterId")
+                members = cluster_to_instances.get(c["cluster_identifier"], [])
                 details.append({
-                    "cluster_identifier": cid,
-                    "engine": c.get("Engine"),
-                    "status": c.get("Status") or c.get("DBClusterStatus"),
-                    "instance_count": len(cluster_to_instances.get(cid, [])),
+                    **c,
+                    "instance_count": len(members),
                     "instances": [
-                        {
-                            "instance_id": i.get("DBInstanceIdentifier") or i.get("DBInstanceId"),
-                            "class": i.get("DBInstanceClass"),
-                            "endpoint": (i.get("Endpoint") or {}).get("Address"),
-                            "status": i.get("DBInstanceStatus") or i.get("DBInstanceStatus"),
-                        }
-                        for i in cluster_to_instances.get(cid, [])
+                        {"instance_id": i["instance_id"], "class": i["class"], "endpoint": i["endpoint"], "status": i["status"]}
+                        for i in members
                     ],
                 })
             result["clusters"] = details
@@ -4,11 +4,21 @@ Summary by default: total table count and counts by billing mode (PROVISIONED vs
 When include_details=True the analyzer will call DescribeTable for each table and
 return per-table metadata: table name, status, billing mode, item count, table size bytes,
 and provisioned throughput if applicable.
+
+DescribeTable calls run concurrently on a bounded thread pool. In summary mode
+the analyzer can optionally describe a random sample of `sample_size` tables and
+extrapolate the billing-mode split and provisioned capacity totals (with 95%
+confidence intervals), so a useful summary costs O(sample_size) calls instead
+of one call per table.
 """
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 import logging
+import math
+import random
+
+from .batching import DEFAULT_MAX_WORKERS, bounded_map
 
 try:
     import boto3
@@ -17,11 +27,56 @@ except Exception:  # pragma: no cover - tests inject a fake boto3
 
 logger = logging.getLogger(__name__)
 
+# two-sided 95% normal quantile used for the sampling confidence intervals
+_Z_95 = 1.96
+
+
+def _estimate_total(values: Sequence[float], population: int, upper: Optional[float] = None) -> Dict[str, Optional[float]]:
+    """Estimate a population total from a simple random sample of non-negative values.
+
+    Uses the expansion estimator N * mean with a finite population correction.
+    The observed sample sum is a hard lower bound; `upper` optionally caps the
+    interval (e.g. the number of tables that could still be in a category).
+    Intervals need at least two sampled values and are None otherwise.
+    """
+    n = len(values)
+    if n == 0:
+        return {"estimate": None, "ci95_low": None, "ci95_high": None}
+    observed = float(sum(values))
+    mean = observed / n
+    estimate = population * mean
+    if n >= population:
+        return {"estimate": round(observed), "ci95_low": round(observed), "ci95_high": round(observed)}
+    if n < 2:
+        return {"estimate": round(estimate), "ci95_low": None, "ci95_high": None}
+
+    variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+    se = population * math.sqrt(variance / n * (1 - n / population))
+    low = max(observed, estimate - _Z_95 * se)
+    high = estimate + _Z_95 * se
+    if upper is not None:
+        high = min(upper, high)
+    return {"estimate": round(estimate), "ci95_low": math.floor(low), "ci95_high": math.ceil(high)}
+
 
 class DynamoDBAnalyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(
+        self,
+        profile: Optional[str] = None,
+        region_name: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        sample_size: Optional[int] = None,
+        random_seed: Optional[int] = None,
+    ):
         self.profile = profile
         self.region_name = region_name
+        self.max_workers = max_workers
+        if sample_size is not None and sample_size < 1:
+            raise ValueError(f"sample_size must be >= 1, got {sample_size}")
+        # number of tables to describe in summary mode; None keeps the
+        # summary call-free (billing modes reported as "unknown")
+        self.sample_size = sample_size
+        self._rng = random.Random(random_seed)
         if boto3 is None:
             raise RuntimeError("boto3 is required for DynamoDBAnalyzer")
         if profile:
@@ -30,6 +85,74 @@ class DynamoDBAnalyzer:
             self.session = boto3.Session()
         self.client = self.session.client("dynamodb", region_name=region_name)
 
+    def _describe_table(self, name: str) -> Optional[Dict]:
+        """Describe one table and return normalized metadata, or None on failure."""
+        try:
+            resp = self.client.describe_table(TableName=name)
+        except Exception:
+            logger.exception("Failed to describe DynamoDB table %s", name)
+            return None
+        table = resp.get("Table", {})
+        billing = (table.get("BillingModeSummary") or {}).get("BillingMode") or "PROVISIONED"
+        prov = table.get("ProvisionedThroughput") or {}
+        return {
+            "name": name,
+            "status": table.get("TableStatus"),
+            "billing_mode": billing,
+            "item_count": table.get("ItemCount"),
+            "table_size_bytes": table.get("TableSizeBytes"),
+            "provisioned_throughput": {
+                "read_capacity_units": prov.get("ReadCapacityUnits"),
+                "write_capacity_units": prov.get("WriteCapacityUnits"),
+            },
+        }
+
+    @staticmethod
+    def _provisioned_units(table: Dict) -> Dict[str, int]:
+        if table.get("billing_mode") != "PROVISIONED":
+            return {"read": 0, "write": 0}
+        prov = table.get("provisioned_throughput") or {}
+        return {"read": prov.get("read_capacity_units") or 0, "write": prov.get("write_capacity_units") or 0}
+
+    def _sample_summary(self, table_names: List[str]) -> Dict[str, object]:
+        """Describe a random sample of tables and extrapolate summary figures."""
+        total = len(table_names)
+        k = min(self.sample_size or 0, total)
+        sample = self._rng.sample(table_names, k)
+        described = [t for t in bounded_map(self._describe_table, sample, self.max_workers) if t is not None]
+        n = len(described)
+
+        modes = sorted({t["billing_mode"] for t in described})
+        by_mode_estimates: Dict[str, Dict[str, Optional[float]]] = {}
+        for mode in modes:
+            indicators = [1 if t["billing_mode"] == mode else 0 for t in described]
+            # tables observed in other modes cannot belong to this one
+            upper = total - (n - sum(indicators))
+            by_mode_estimates[mode] = _estimate_total(indicators, total, upper=upper)
+
+        units = [self._provisioned_units(t) for t in described]
+        read_est = _estimate_total([u["read"] for u in units], total)
+        write_est = _estimate_total([u["write"] for u in units], total)
+
+        by_billing: Dict[str, int] = {m: e["estimate"] for m, e in by_mode_estimates.items()}
+        if n == 0 and total:
+            by_billing["unknown"] = total
+
+        return {
+            "by_billing_mode": by_billing,
+            "provisioned_read_capacity_units_total": read_est["estimate"] or 0,
+            "provisioned_write_capacity_units_total": write_est["estimate"] or 0,
+            "sampling": {
+                "sample_size": k,
+                "described": n,
+                "exact": n == total,
+                "confidence": 0.95,
+                "by_billing_mode": by_mode_estimates,
+                "provisioned_read_capacity_units_total": read_est,
+                "provisioned_write_capacity_units_total": write_est,
+            },
+        }
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
         paginator = self.client.get_paginator("list_tables")
 
@@ -43,37 +166,22 @@ class DynamoDBAnalyzer:
         tables: List[Dict] = []
 
         if include_details and table_names:
-            # Describe each table to collect metadata. This can be a bit chatty but
-            # is acceptable for small numbers of tables and when user explicitly
-            # asks for details.
-            for t in table_names:
-                try:
-                    resp = self.client.describe_table(TableName=t)
-                    table = resp.get("Table", {})
-                    billing = (table.get("BillingModeSummary") or {}).get("BillingMode") or "PROVISIONED"
-                    item_count = table.get("ItemCount")
-                    size_bytes = table.get("TableSizeBytes")
-                    prov = table.get("ProvisionedThroughput") or {}
-
-                    tables.append({
-                        "name": t,
-                        "status": table.get("TableStatus"),
-                        "billing_mode": billing,
-                        "item_count": item_count,
-                        "table_size_bytes": size_bytes,
-                        "provisioned_throughput": {
-                            "read_capacity_units": prov.get("ReadCapacityUnits"),
-                            "write_capacity_units": prov.get("WriteCapacityUnits"),
-                        },
-                    })
-
-                    by_billing[billing] = by_billing.get(billing, 0) + 1
-                except Exception:
-                    logger.exception("Failed to describe DynamoDB table %s", t)
+            # Describe every table on a bounded pool; results keep listing order.
+            for table in bounded_map(self._describe_table, table_names, self.max_workers):
+                if table is None:
                     by_billing["unknown"] = by_billing.get("unknown", 0) + 1
+                    continue
+                tables.append(table)
+                billing = table["billing_mode"]
+                by_billing[billing] = by_billing.get(billing, 0) + 1
+        elif self.sample_size and table_names:
+            sampled = self._sample_summary(table_names)
+            summary = {"total_tables": total}
+            summary.update(sampled)
+            return {"summary": summary}
         else:
-            # only produce billing-mode counts by sampling via DescribeTable is expensive
-            # so we default to unknown when details are not requested
+            # describing every table is expensive, so without details (and
+            # without sampling) billing modes are reported as unknown
             by_billing["unknown"] = total
 
         result: Dict[str, object] = {
@@ -90,12 +198,9 @@ class DynamoDBAnalyzer:
             total_provisioned_read = 0
             total_provisioned_write = 0
             for tb in tables:
-                if tb.get("billing_mode") == "PROVISIONED":
-                    prov = tb.get("provisioned_throughput") or {}
-                    r = prov.get("read_capacity_units") or 0
-                    w = prov.get("write_capacity_units") or 0
-                    total_provisioned_read += r
-                    total_provisioned_write += w
+                units = self._provisioned_units(tb)
+                total_provisioned_read += units["read"]
+                total_provisioned_write += units["write"]
 
             result["summary"]["provisioned_read_capacity_units_total"] = total_provisioned_read
             result["summary"]["provisioned_write_capacity_units_total"] = total_provisioned_write
@@ -1,12 +1,20 @@
 """EC2 analyzer
 
-Collects EC2 instances and enriches instance types with vCPU and memory using DescribeInstanceTypes.
+Collects EC2 instances and enriches instance types with vCPU and memory through
+the shared DescribeInstanceTypes lookup in `instance_types`.
+With include_details=True, running instances also get CPU utilization from the
+shared batched CloudWatch metrics engine.
 """
 from __future__ import annotations
 
 from typing import Dict, List, Optional
 import logging
 
+from .aggregate import Aggregator
+from .instance_types import InstanceTypeLookup
+from .metrics import CloudWatchMetrics
+from .records import EC2InstanceRecord
+
 try:
     import boto3
 except Exception:  # pragma: no cover - tests will inject a fake boto3
@@ -16,9 +24,10 @@ logger = logging.getLogger(__name__)
 
 
 class EC2Analyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None, collect_utilization: bool = True):
         self.profile = profile
         self.region_name = region_name
+        self.collect_utilization = collect_utilization
         if boto3 is None:
             raise RuntimeError("boto3 is required for EC2Analyzer")
         if profile:
@@ -38,7 +47,7 @@ class EC2Analyzer:
         """
         paginator = self.client.get_paginator("describe_instances")
 
-        instances: List[Dict] = []
+        instances: List[EC2InstanceRecord] = []
         instance_types = set()
 
         for page in paginator.paginate():
@@ -62,118 +71,68 @@ class EC2Analyzer:
                     else:
                         inst_arch = None
 
-                    instances.append({
-                        "instance_id": iid,
-                        "type": itype,
-                        "state": state,
-                        "lifecycle": lifecycle,
-                        "architecture": inst_arch,
-                    })
+                    instances.append(EC2InstanceRecord(
+                        instance_id=iid,
+                        type=itype,
+                        state=state,
+                        lifecycle=lifecycle,
+                        architecture=inst_arch,
+                    ))
                     if itype:
                         instance_types.add(itype)
 
-        # Fetch instance type specs in batches
-        type_specs: Dict[str, Dict] = {}
-        if instance_types:
-            itypes_list = list(instance_types)
-            # describe_instance_types accepts up to 100 types at once
-            for i in range(0, len(itypes_list), 100):
-                chunk = itypes_list[i : i + 100]
-                resp = self.client.describe_instance_types(InstanceTypes=chunk)
-                for it in resp.get("InstanceTypes", []):
-                    name = it.get("InstanceType")
-                    vcpu = it.get("VCpuInfo", {}).get("DefaultVCpus")
-                    mem_mib = it.get("MemoryInfo", {}).get("SizeInMiB")
-                    # Determine primary architecture: prefer arm if present, otherwise x86
-                    proc = it.get("ProcessorInfo", {})
-                    supported = proc.get("SupportedArchitectures") or []
-                    arch = None
-                    if supported:
-                        # Normalize common values
-                        if "arm64" in supported or "aarch64" in supported:
-                            arch = "arm"
-                        else:
-                            arch = "x86"
-                    else:
-                        arch = "unknown"
-
-                    type_specs[name] = {"vCPU": vcpu, "memory_mib": mem_mib, "architecture": arch}
-
-        total_vcpu = 0
-        total_memory = 0
-        spot_vcpu = 0
-        spot_memory = 0
-        ondemand_vcpu = 0
-        ondemand_memory = 0
-        enriched = []
-
-        # per-architecture aggregates
-        arch_summary: Dict[str, Dict[str, int]] = {}
-        lifecycle_by_arch: Dict[str, Dict[str, int]] = {}
+        # vCPU/memory/architecture per type, batched and memoized by the shared lookup
+        type_specs = InstanceTypeLookup(self.session, self.region_name).resolve(instance_types)
 
+        # one row per instance; every summary below is a rollup of the same groups
+        agg = Aggregator(keys=("architecture", "lifecycle"), measures=("vCPU", "memory_mib"))
         for inst in instances:
-            t = inst.get("type")
-            spec = type_specs.get(t, {})
+            spec = type_specs.get(inst.type, {})
             v = spec.get("vCPU") or 0
             m = spec.get("memory_mib") or 0
             # prefer instance-level architecture measurement when available
-            arch = inst.get("architecture") or spec.get("architecture", "unknown")
-            total_vcpu += v
-            total_memory += m
-            enriched.append({**inst, "vCPU": v, "memory_mib": m, "architecture": arch})
-
-            # add to lifecycle buckets
-            if inst.get("lifecycle") == "spot":
-                spot_vcpu += v
-                spot_memory += m
-            else:
-                ondemand_vcpu += v
-                ondemand_memory += m
-
-            # update architecture summary
-            if arch not in arch_summary:
-                arch_summary[arch] = {"count": 0, "vCPU": 0, "memory_mib": 0}
-            arch_summary[arch]["count"] += 1
-            arch_summary[arch]["vCPU"] += v
-            arch_summary[arch]["memory_mib"] += m
-
-            # update lifecycle-by-architecture
-            if arch not in lifecycle_by_arch:
-                lifecycle_by_arch[arch] = {
-                    "spot_count": 0,
-                    "on_demand_count": 0,
-                    "spot_vCPU": 0,
-                    "spot_memory_mib": 0,
-                    "on_demand_vCPU": 0,
-                    "on_demand_memory_mib": 0,
-                }
-            if inst.get("lifecycle") == "spot":
-                lifecycle_by_arch[arch]["spot_count"] += 1
-                lifecycle_by_arch[arch]["spot_vCPU"] += v
-                lifecycle_by_arch[arch]["spot_memory_mib"] += m
-            else:
-                lifecycle_by_arch[arch]["on_demand_count"] += 1
-                lifecycle_by_arch[arch]["on_demand_vCPU"] += v
-                lifecycle_by_arch[arch]["on_demand_memory_mib"] += m
-
-        # lifecycle breakdown
-        total_spot = sum(1 for i in enriched if i.get("lifecycle") == "spot")
-        total_on_demand = sum(1 for i in enriched if i.get("lifecycle") == "on_demand")
+            arch = inst.architecture or spec.get("architecture", "unknown")
+            # enrich in place; records are converted to dicts only for the result
+            inst.vCPU = v
+            inst.memory_mib = m
+            inst.architecture = arch
+            agg.add(arch, inst.lifecycle, v, m)
+
+        total = agg.total()
+        by_lifecycle = agg.rollup("lifecycle")
+        empty = {"count": 0, "vCPU": 0, "memory_mib": 0}
+        spot = by_lifecycle.get("spot", empty)
+        ondemand = by_lifecycle.get("on_demand", empty)
+        arch_summary = agg.rollup("architecture")
+
+        by_arch_lifecycle = agg.groups()
+        lifecycle_by_arch: Dict[str, Dict[str, int]] = {}
+        for arch in arch_summary:
+            arch_spot = by_arch_lifecycle.get((arch, "spot"), empty)
+            arch_ondemand = by_arch_lifecycle.get((arch, "on_demand"), empty)
+            lifecycle_by_arch[arch] = {
+                "spot_count": arch_spot["count"],
+                "on_demand_count": arch_ondemand["count"],
+                "spot_vCPU": arch_spot["vCPU"],
+                "spot_memory_mib": arch_spot["memory_mib"],
+                "on_demand_vCPU": arch_ondemand["vCPU"],
+                "on_demand_memory_mib": arch_ondemand["memory_mib"],
+            }
 
         result: Dict[str, object] = {
             "summary": {
                 "total_instances": len(instances),
-                "total_vCPU": total_vcpu,
-                "total_memory_mib": total_memory,
-                "total_spot": total_spot,
-                "total_on_demand": total_on_demand,
+                "total_vCPU": total["vCPU"],
+                "total_memory_mib": total["memory_mib"],
+                "total_spot": spot["count"],
+                "total_on_demand": ondemand["count"],
                 "spot": {
-                    "vCPU": spot_vcpu,
-                    "memory_mib": spot_memory,
+                    "vCPU": spot["vCPU"],
+                    "memory_mib": spot["memory_mib"],
                 },
                 "ondemand": {
-                    "vCPU": ondemand_vcpu,
-                    "memory_mib": ondemand_memory,
+                    "vCPU": ondemand["vCPU"],
+                    "memory_mib": ondemand["memory_mib"],
                 },
                 "architecture": arch_summary,
                 "lifecycle_by_architecture": lifecycle_by_arch,
@@ -181,6 +140,14 @@ class EC2Analyzer:
         }
 
         if include_details:
-            result["instances"] = enriched
+            if self.collect_utilization:
+                metrics = CloudWatchMetrics(self.session, self.region_name)
+                for inst in instances:
+                    if inst.state == "running":
+                        metrics.add(inst.instance_id, "AWS/EC2", "CPUUtilization", {"InstanceId": inst.instance_id}, label="cpu_utilization")
+                usage = metrics.fetch() if len(metrics) else {}
+                for inst in instances:
+                    inst.utilization = usage.get(inst.instance_id, {})
+            result["instances"] = [inst.to_dict() for inst in instances]
 
         return result
@@ -1,12 +1,20 @@
 """ECR analyzer
 
-Summarizes ECR repositories and (optionally) per-repository image counts.
+Summarizes ECR repositories and (optionally) per-repository image statistics.
+
+With include_details=True each repository's images are paged through
+DescribeImages (repositories run concurrently on a bounded pool) and streamed
+into per-repository aggregates: image count, total bytes, untagged bytes and
+push-age buckets. Image lists are never retained.
 """
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 import logging
 
+from .batching import DEFAULT_MAX_WORKERS, bounded_map
+
 try:
     import boto3
 except Exception:
@@ -14,11 +22,32 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# Image push-age buckets as (label, upper bound in days); the last bucket is open-ended.
+AGE_BUCKETS: Tuple[Tuple[str, Optional[int]], ...] = (
+    ("0-30d", 30),
+    ("30-90d", 90),
+    ("90-365d", 365),
+    ("365d+", None),
+)
+
+
+def _age_bucket(pushed_at, now: datetime) -> str:
+    if not isinstance(pushed_at, datetime):
+        return "unknown"
+    if pushed_at.tzinfo is None:
+        pushed_at = pushed_at.replace(tzinfo=timezone.utc)
+    age_days = (now - pushed_at).days
+    for label, limit in AGE_BUCKETS:
+        if limit is None or age_days < limit:
+            return label
+    return "unknown"  # pragma: no cover - last bucket is open-ended
+
 
 class ECRAnalyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None, max_workers: int = DEFAULT_MAX_WORKERS):
         self.profile = profile
         self.region_name = region_name
+        self.max_workers = max_workers
         if boto3 is None:
             raise RuntimeError("boto3 is required for ECRAnalyzer")
         if profile:
@@ -27,6 +56,33 @@ class ECRAnalyzer:
             self.session = boto3.Session()
         self.client = self.session.client("ecr", region_name=region_name)
 
+    def _image_stats(self, name: str, now: datetime) -> Optional[Dict[str, object]]:
+        """Stream a repository's images into aggregates; None if listing fails."""
+        count = 0
+        total_bytes = 0
+        untagged_bytes = 0
+        by_age: Dict[str, Dict[str, int]] = {}
+        try:
+            for page in self.client.get_paginator("describe_images").paginate(repositoryName=name):
+                for img in page.get("imageDetails") or []:
+                    size = img.get("imageSizeInBytes") or 0
+                    count += 1
+                    total_bytes += size
+                    if not img.get("imageTags"):
+                        untagged_bytes += size
+                    bucket = by_age.setdefault(_age_bucket(img.get("imagePushedAt"), now), {"count": 0, "size_bytes": 0})
+                    bucket["count"] += 1
+                    bucket["size_bytes"] += size
+        except Exception:
+            logger.debug("Failed to describe images for %s", name, exc_info=True)
+            return None
+        return {
+            "image_count": count,
+            "total_size_bytes": total_bytes,
+            "untagged_size_bytes": untagged_bytes,
+            "by_age": by_age,
+        }
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
         paginator = self.client.get_paginator("describe_repositories")
         repos: List[Dict] = []
@@ -39,18 +95,27 @@ class ECRAnalyzer:
         result = {"summary": {"total_repositories": total}}
 
         if include_details:
-            # attempt to count images per repo (may be slow)
+            now = datetime.now(timezone.utc)
+            stats = bounded_map(lambda r: self._image_stats(r.get("name"), now), repos, self.max_workers)
+
             details = []
-            for r in repos:
-                name = r.get("name")
-                try:
-                    resp = self.client.list_images(repositoryName=name)
-                    images = resp.get("imageIds", [])
-                    count = len(images)
-                except Exception:
-                    logger.debug("Failed to list images for %s", name, exc_info=True)
-                    count = None
-                details.append({"name": name, "uri": r.get("uri"), "image_count": count})
+            total_images = 0
+            total_bytes = 0
+            untagged_bytes = 0
+            for r, s in zip(repos, stats):
+                if s is None:
+                    details.append({"name": r.get("name"), "uri": r.get("uri"), "image_count": None})
+                    continue
+                details.append({"name": r.get("name"), "uri": r.get("uri"), **s})
+                total_images += s["image_count"]
+                total_bytes += s["total_size_bytes"]
+                untagged_bytes += s["untagged_size_bytes"]
+
+            result["summary"].update({
+                "total_images": total_images,
+                "total_size_bytes": total_bytes,
+                "untagged_size_bytes": untagged_bytes,
+            })
             result["repositories"] = details
 
         return result
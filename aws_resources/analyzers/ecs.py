@@ -1,12 +1,23 @@
 """ECS analyzer
 
 Summarizes ECS clusters and counts services/tasks.
+
+With include_details=True clusters are described in batches of 100, services
+and running tasks are paginated per cluster, and tasks are described in batches
+of 100 to sum CPU/memory reservations per cluster and launch type. Per-cluster
+work runs concurrently on a bounded thread pool. Cluster descriptions are
+projected to the fields in CLUSTER_FIELDS as they arrive. A cluster whose
+services or tasks cannot be listed keeps its name and status, gets None counts
+and an `error` flag, and is counted in the summary's `failed_clusters`.
 """
 from __future__ import annotations
 
 from typing import Dict, List, Optional
 import logging
 
+from .batching import DEFAULT_MAX_WORKERS, bounded_map, chunks
+from .projection import project_pages
+
 try:
     import boto3
 except Exception:
@@ -14,11 +25,30 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# DescribeClusters and DescribeTasks accept at most 100 identifiers per call
+DESCRIBE_BATCH_SIZE = 100
+# ECS expresses task CPU in CPU units; 1024 units == 1 vCPU
+CPU_UNITS_PER_VCPU = 1024
+
+CLUSTER_FIELDS = {
+    "cluster_arn": "clusterArn",
+    "cluster_name": "clusterName",
+    "status": "status",
+}
+
+
+def _to_int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
 
 class ECSAnalyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None, max_workers: int = DEFAULT_MAX_WORKERS):
         self.profile = profile
         self.region_name = region_name
+        self.max_workers = max_workers
         if boto3 is None:
             raise RuntimeError("boto3 is required for ECSAnalyzer")
         if profile:
@@ -27,6 +57,74 @@ class ECSAnalyzer:
             self.session = boto3.Session()
         self.client = self.session.client("ecs", region_name=region_name)
 
+    def _describe_clusters(self, arns: List[str]) -> Dict[str, Dict]:
+        """Describe clusters in batches of 100 and index the projected descriptions by ARN."""
+        def describe(batch):
+            try:
+                return list(project_pages([self.client.describe_clusters(clusters=list(batch))], "clusters", CLUSTER_FIELDS))
+            except Exception:
+                logger.debug("Failed to describe clusters %s", batch, exc_info=True)
+                return []
+
+        by_arn: Dict[str, Dict] = {}
+        for described in bounded_map(describe, list(chunks(arns, DESCRIBE_BATCH_SIZE)), self.max_workers):
+            for c in described:
+                by_arn[c["cluster_arn"]] = c
+        return by_arn
+
+    def _count_services(self, arn: str) -> int:
+        count = 0
+        for page in self.client.get_paginator("list_services").paginate(cluster=arn):
+            count += len(page.get("serviceArns") or [])
+        return count
+
+    def _task_totals(self, arn: str) -> Dict[str, object]:
+        """Page through running tasks and sum reservations by launch type.
+
+        Each page of task ARNs is described and folded into the totals before
+        the next page is fetched, so only one page of tasks is held at a time.
+        """
+        task_count = 0
+        by_launch_type: Dict[str, Dict[str, float]] = {}
+        for page in self.client.get_paginator("list_tasks").paginate(cluster=arn):
+            task_arns = page.get("taskArns") or []
+            task_count += len(task_arns)
+            for batch in chunks(task_arns, DESCRIBE_BATCH_SIZE):
+                tasks = self.client.describe_tasks(cluster=arn, tasks=list(batch)).get("tasks", [])
+                for t in tasks:
+                    lt = t.get("launchType") or "unknown"
+                    cpu = _to_int(t.get("cpu"))
+                    mem = _to_int(t.get("memory"))
+                    if lt not in by_launch_type:
+                        by_launch_type[lt] = {"task_count": 0, "cpu_units": 0, "vCPU": 0, "memory_mib": 0}
+                    by_launch_type[lt]["task_count"] += 1
+                    by_launch_type[lt]["cpu_units"] += cpu
+                    by_launch_type[lt]["memory_mib"] += mem
+        for totals in by_launch_type.values():
+            totals["vCPU"] = totals["cpu_units"] / CPU_UNITS_PER_VCPU
+        return {"task_count": task_count, "by_launch_type": by_launch_type}
+
+    def _cluster_detail(self, arn: str, desc: Optional[Dict]) -> Dict[str, object]:
+        detail: Dict[str, object] = {
+            "cluster_arn": arn,
+            "cluster_name": (desc or {}).get("cluster_name"),
+            "status": (desc or {}).get("status") or "unknown",
+        }
+        try:
+            services = self._count_services(arn)
+            tasks = self._task_totals(arn)
+        except Exception:
+            logger.debug("Failed to list services or tasks of cluster %s", arn, exc_info=True)
+            # the cluster itself is known; only its counts are missing
+            detail.update({"service_count": None, "task_count": None, "by_launch_type": None, "error": True})
+            return detail
+        detail.update({
+            "service_count": services,
+            "task_count": tasks["task_count"],
+            "by_launch_type": tasks["by_launch_type"],
+        })
+        return detail
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
         paginator = self.client.get_paginator("list_clusters")
         clusters: List[str] = []
@@ -37,16 +135,26 @@ class ECSAnalyzer:
         result = {"summary": {"total_clusters": total_clusters}}
 
         if include_details:
-            details = []
-            for arn in clusters:
-                try:
-                    desc = self.client.describe_clusters(clusters=[arn]).get("clusters", [])[0]
-                    services = self.client.list_services(cluster=arn).get("serviceArns", [])
-                    tasks = self.client.list_tasks(cluster=arn).get("taskArns", [])
-                    details.append({"cluster_arn": arn, "status": desc.get("status"), "service_count": len(services), "task_count": len(tasks)})
-                except Exception:
-                    logger.debug("Failed to describe cluster %s", arn, exc_info=True)
-                    details.append({"cluster_arn": arn, "status": "unknown"})
+            described = self._describe_clusters(clusters)
+            details = bounded_map(lambda arn: self._cluster_detail(arn, described.get(arn)), clusters, self.max_workers)
+
+            total_services = 0
+            total_tasks = 0
+            by_launch_type: Dict[str, Dict[str, float]] = {}
+            for d in details:
+                total_services += d.get("service_count") or 0
+                total_tasks += d.get("task_count") or 0
+                for lt, totals in (d.get("by_launch_type") or {}).items():
+                    agg = by_launch_type.setdefault(lt, {"task_count": 0, "cpu_units": 0, "vCPU": 0, "memory_mib": 0})
+                    for k, v in totals.items():
+                        agg[k] += v
+
+            result["summary"].update({
+                "total_services": total_services,
+                "total_tasks": total_tasks,
+                "by_launch_type": by_launch_type,
+                "failed_clusters": sum(1 for d in details if d.get("error")),
+            })
             result["clusters"] = details
 
         return result
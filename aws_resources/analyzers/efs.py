@@ -1,12 +1,20 @@
 """EFS analyzer
 
 Summarizes EFS file systems. Optional details include per-filesystem size/mount targets.
+
+File systems are paginated. The storage-class split (Standard / IA / Archive)
+comes from the SizeInBytes block of the listing payload, so it costs no extra
+calls; bytes per class and per throughput mode are aggregated in one pass.
+With include_details=True mount targets are described concurrently per file
+system.
 """
 from __future__ import annotations
 
 from typing import Dict, List, Optional
 import logging
 
+from .batching import DEFAULT_MAX_WORKERS, bounded_map
+
 try:
     import boto3
 except Exception:
@@ -14,11 +22,23 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# SizeInBytes keys for each storage class
+STORAGE_CLASS_KEYS = {
+    "standard": "ValueInStandard",
+    "infrequent_access": "ValueInIA",
+    "archive": "ValueInArchive",
+}
+
+
+def _class_bytes(size: Dict) -> Dict[str, int]:
+    return {cls: size.get(key) or 0 for cls, key in STORAGE_CLASS_KEYS.items()}
+
 
 class EFSAnalyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None, max_workers: int = DEFAULT_MAX_WORKERS):
         self.profile = profile
         self.region_name = region_name
+        self.max_workers = max_workers
         if boto3 is None:
             raise RuntimeError("boto3 is required for EFSAnalyzer")
         if profile:
@@ -27,32 +47,65 @@ class EFSAnalyzer:
             self.session = boto3.Session()
         self.client = self.session.client("efs", region_name=region_name)
 
+    def _mount_targets(self, fs_id: str) -> Optional[List[Dict]]:
+        targets: List[Dict] = []
+        try:
+            for page in self.client.get_paginator("describe_mount_targets").paginate(FileSystemId=fs_id):
+                for mt in page.get("MountTargets", []) or []:
+                    targets.append({
+                        "mount_target_id": mt.get("MountTargetId"),
+                        "subnet_id": mt.get("SubnetId"),
+                        "availability_zone": mt.get("AvailabilityZoneName"),
+                        "state": mt.get("LifeCycleState"),
+                    })
+        except Exception:
+            logger.debug("Failed to describe mount targets for %s", fs_id, exc_info=True)
+            return None
+        return targets
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
-        resp = self.client.describe_file_systems()
-        fss = resp.get("FileSystems", [])
+        fss: List[Dict] = []
+        for page in self.client.get_paginator("describe_file_systems").paginate():
+            fss.extend(page.get("FileSystems", []) or [])
         total = len(fss)
 
-        # summarize sizes/counts by throughput mode for non-detailed summary
+        # summarize sizes/counts by throughput mode and storage class in one pass
         by_throughput: Dict[str, Dict[str, int]] = {}
+        by_storage_class: Dict[str, int] = {cls: 0 for cls in STORAGE_CLASS_KEYS}
         for fs in fss:
             mode = fs.get("ThroughputMode") or "unknown"
-            size = (fs.get("SizeInBytes") or {}).get("Value") or 0
+            size_info = fs.get("SizeInBytes") or {}
+            size = size_info.get("Value") or 0
             if mode not in by_throughput:
                 by_throughput[mode] = {"count": 0, "total_size_bytes": 0}
             by_throughput[mode]["count"] += 1
             by_throughput[mode]["total_size_bytes"] += size
+            for cls, n in _class_bytes(size_info).items():
+                by_storage_class[cls] += n
 
-        result = {"summary": {"total_file_systems": total, "by_throughput_mode": by_throughput}}
+        result = {
+            "summary": {
+                "total_file_systems": total,
+                "by_throughput_mode": by_throughput,
+                "by_storage_class_bytes": by_storage_class,
+            }
+        }
 
         if include_details:
+            ids = [fs.get("FileSystemId") for fs in fss]
+            mount_targets = bounded_map(self._mount_targets, ids, self.max_workers)
             details = []
-            for fs in fss:
+            for fs, mts in zip(fss, mount_targets):
                 details.append({
                     "file_system_id": fs.get("FileSystemId"),
                     "creation_time": str(fs.get("CreationTime")),
                     "size_bytes": fs.get("SizeInBytes", {}).get("Value"),
+                    "size_bytes_by_storage_class": _class_bytes(fs.get("SizeInBytes") or {}),
                     "throughput_mode": fs.get("ThroughputMode"),
+                    "mount_target_count": len(mts) if mts is not None else None,
+                    "mount_targets": mts,
                 })
+            result["summary"]["total_mount_targets"] = sum(len(m) for m in mount_targets if m)
             result["file_systems"] = details
 
         return result
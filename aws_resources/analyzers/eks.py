@@ -1,12 +1,22 @@
 """EKS analyzer
 
 Summarizes EKS clusters and optionally returns per-cluster details.
+
+With include_details=True every cluster is described and its managed
+nodegroups and Fargate profiles are enumerated. Per-cluster listing runs on a
+bounded thread pool, then all nodegroups are described on the same pool, so an
+account finishes in roughly the time of its slowest cluster. Nodegroup instance
+types are resolved to vCPU/memory through the shared instance-type lookup and
+desired/min/max capacity is aggregated per cluster.
 """
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 
+from .batching import DEFAULT_MAX_WORKERS, bounded_map
+from .instance_types import InstanceTypeLookup
+
 try:
     import boto3
 except Exception:
@@ -15,10 +25,22 @@ except Exception:
 logger = logging.getLogger(__name__)
 
 
+def _empty_capacity() -> Dict[str, int]:
+    return {
+        "nodegroup_count": 0,
+        "desired_nodes": 0,
+        "min_nodes": 0,
+        "max_nodes": 0,
+        "desired_vCPU": 0,
+        "desired_memory_mib": 0,
+    }
+
+
 class EKSAnalyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None, max_workers: int = DEFAULT_MAX_WORKERS):
         self.profile = profile
         self.region_name = region_name
+        self.max_workers = max_workers
         if boto3 is None:
             raise RuntimeError("boto3 is required for EKSAnalyzer")
         if profile:
@@ -27,6 +49,49 @@ class EKSAnalyzer:
             self.session = boto3.Session()
         self.client = self.session.client("eks", region_name=region_name)
 
+    def _cluster_inventory(self, name: str) -> Dict[str, object]:
+        """Describe a cluster and list its nodegroups and Fargate profiles."""
+        try:
+            info = self.client.describe_cluster(name=name).get("cluster", {})
+        except Exception:
+            logger.debug("Failed to describe EKS cluster %s", name, exc_info=True)
+            return {"name": name, "status": "unknown", "nodegroups": [], "fargate_profiles": []}
+
+        nodegroups: List[str] = []
+        fargate_profiles: List[str] = []
+        try:
+            for page in self.client.get_paginator("list_nodegroups").paginate(clusterName=name):
+                nodegroups.extend(page.get("nodegroups") or [])
+            for page in self.client.get_paginator("list_fargate_profiles").paginate(clusterName=name):
+                fargate_profiles.extend(page.get("fargateProfileNames") or [])
+        except Exception:
+            logger.debug("Failed to list compute for EKS cluster %s", name, exc_info=True)
+        return {
+            "name": name,
+            "status": info.get("status"),
+            "version": info.get("version"),
+            "nodegroups": nodegroups,
+            "fargate_profiles": fargate_profiles,
+        }
+
+    def _describe_nodegroup(self, key: Tuple[str, str]) -> Optional[Dict[str, object]]:
+        cluster, nodegroup = key
+        try:
+            ng = self.client.describe_nodegroup(clusterName=cluster, nodegroupName=nodegroup).get("nodegroup", {})
+        except Exception:
+            logger.debug("Failed to describe nodegroup %s/%s", cluster, nodegroup, exc_info=True)
+            return None
+        scaling = ng.get("scalingConfig") or {}
+        return {
+            "name": nodegroup,
+            "status": ng.get("status"),
+            "capacity_type": ng.get("capacityType"),
+            "instance_types": ng.get("instanceTypes") or [],
+            "desired_size": scaling.get("desiredSize") or 0,
+            "min_size": scaling.get("minSize") or 0,
+            "max_size": scaling.get("maxSize") or 0,
+        }
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
         paginator = self.client.get_paginator("list_clusters")
         clusters: List[str] = []
@@ -36,14 +101,56 @@ class EKSAnalyzer:
         result = {"summary": {"total_clusters": len(clusters)}}
 
         if include_details:
+            inventory = bounded_map(self._cluster_inventory, clusters, self.max_workers)
+
+            # describe every nodegroup of every cluster on one pool
+            keys = [(c["name"], ng) for c in inventory for ng in c["nodegroups"]]
+            described = dict(zip(keys, bounded_map(self._describe_nodegroup, keys, self.max_workers)))
+
+            lookup = InstanceTypeLookup(self.session, self.region_name)
+            specs = lookup.resolve(t for ng in described.values() if ng for t in ng["instance_types"][:1])
+
             details = []
-            for name in clusters:
-                try:
-                    info = self.client.describe_cluster(name=name).get("cluster", {})
-                    details.append({"name": name, "status": info.get("status"), "version": info.get("version")})
-                except Exception:
-                    logger.debug("Failed to describe EKS cluster %s", name, exc_info=True)
-                    details.append({"name": name, "status": "unknown"})
+            totals = _empty_capacity()
+            totals["fargate_profile_count"] = 0
+            for c in inventory:
+                capacity = _empty_capacity()
+                nodegroups = []
+                for ng_name in c["nodegroups"]:
+                    ng = described.get((c["name"], ng_name))
+                    if ng is None:
+                        nodegroups.append({"name": ng_name, "status": "unknown"})
+                        continue
+                    # mixed-type nodegroups are sized by their first (primary) type
+                    spec = specs.get(ng["instance_types"][0], {}) if ng["instance_types"] else {}
+                    ng = {
+                        **ng,
+                        "vCPU_each": spec.get("vCPU", 0),
+                        "memory_mib_each": spec.get("memory_mib", 0),
+                    }
+                    nodegroups.append(ng)
+                    capacity["nodegroup_count"] += 1
+                    capacity["desired_nodes"] += ng["desired_size"]
+                    capacity["min_nodes"] += ng["min_size"]
+                    capacity["max_nodes"] += ng["max_size"]
+                    capacity["desired_vCPU"] += ng["vCPU_each"] * ng["desired_size"]
+                    capacity["desired_memory_mib"] += ng["memory_mib_each"] * ng["desired_size"]
+
+                for k, v in capacity.items():
+                    totals[k] += v
+                totals["fargate_profile_count"] += len(c["fargate_profiles"])
+
+                entry = {"name": c["name"], "status": c["status"]}
+                if c.get("version") is not None:
+                    entry["version"] = c["version"]
+                entry.update({
+                    "capacity": capacity,
+                    "nodegroups": nodegroups,
+                    "fargate_profiles": c["fargate_profiles"],
+                })
+                details.append(entry)
+
+            result["summary"]["compute"] = totals
             result["clusters"] = details
 
         return result
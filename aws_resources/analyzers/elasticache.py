@@ -1,12 +1,26 @@
 """ElastiCache analyzer
 
 Summarizes ElastiCache clusters (Redis/Memcached). Optional details per-cluster.
+
+Summary mode lists clusters without per-node payloads (node counts come from
+NumCacheNodes); node info is only requested with include_details=True.
+Replication groups and serverless caches are collected with one paginated sweep
+each and joined to clusters by id, so shard/replica topology needs no
+per-cluster calls.
+
+With include_details=True each cluster also gets its memory usage from the
+shared batched CloudWatch metrics engine (percentage for Redis/Valkey, bytes
+used for cache for Memcached).
 """
 from __future__ import annotations
 
 from typing import Dict, List, Optional
 import logging
 
+from .instance_types import InstanceTypeLookup
+from .metrics import CloudWatchMetrics
+from .projection import project_pages
+
 try:
     import boto3
 except Exception:
@@ -15,10 +29,31 @@ except Exception:
 logger = logging.getLogger(__name__)
 
 
+def _node_type(c: Dict) -> Optional[str]:
+    # some responses may have node type per CacheNode; fall back accordingly
+    nodes = c.get("CacheNodes") or []
+    return c.get("CacheNodeType") or (nodes[0].get("CacheNodeType") if nodes else None)
+
+
+CLUSTER_FIELDS = {
+    "cache_cluster_id": "CacheClusterId",
+    "engine": "Engine",
+    "num_cache_nodes": lambda c: c.get("NumCacheNodes") or len(c.get("CacheNodes") or []),
+    "status": "CacheClusterStatus",
+    "cache_node_type": _node_type,
+    "replication_group_id": "ReplicationGroupId",
+    "cache_nodes": lambda c: [
+        {"id": n.get("CacheNodeId"), "status": n.get("CacheNodeStatus"), "availability_zone": n.get("CustomerAvailabilityZone")}
+        for n in c.get("CacheNodes") or []
+    ],
+}
+
+
 class ElastiCacheAnalyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None, collect_utilization: bool = True):
         self.profile = profile
         self.region_name = region_name
+        self.collect_utilization = collect_utilization
         if boto3 is None:
             raise RuntimeError("boto3 is required for ElastiCacheAnalyzer")
         if profile:
@@ -27,6 +62,52 @@ class ElastiCacheAnalyzer:
             self.session = boto3.Session()
         self.client = self.session.client("elasticache", region_name=region_name)
 
+    def _replication_groups(self) -> List[Dict]:
+        groups: List[Dict] = []
+        try:
+            for page in self.client.get_paginator("describe_replication_groups").paginate():
+                for g in page.get("ReplicationGroups", []) or []:
+                    node_groups = g.get("NodeGroups") or []
+                    roles = {
+                        m.get("CacheClusterId"): m.get("CurrentRole")
+                        for ng in node_groups
+                        for m in ng.get("NodeGroupMembers") or []
+                    }
+                    groups.append({
+                        "replication_group_id": g.get("ReplicationGroupId"),
+                        "status": g.get("Status"),
+                        "engine": g.get("Engine"),
+                        "cache_node_type": g.get("CacheNodeType"),
+                        "cluster_enabled": bool(g.get("ClusterEnabled")),
+                        "multi_az": g.get("MultiAZ"),
+                        "shard_count": len(node_groups),
+                        "replicas_per_shard": [max(len(ng.get("NodeGroupMembers") or []) - 1, 0) for ng in node_groups],
+                        "member_clusters": g.get("MemberClusters") or [],
+                        "member_roles": roles,
+                    })
+        except Exception:
+            logger.debug("Failed to describe replication groups", exc_info=True)
+        return groups
+
+    def _serverless_caches(self) -> List[Dict]:
+        caches: List[Dict] = []
+        try:
+            for page in self.client.get_paginator("describe_serverless_caches").paginate():
+                for c in page.get("ServerlessCaches", []) or []:
+                    limits = c.get("CacheUsageLimits") or {}
+                    caches.append({
+                        "name": c.get("ServerlessCacheName"),
+                        "engine": c.get("Engine"),
+                        "status": c.get("Status"),
+                        "data_storage_max": (limits.get("DataStorage") or {}).get("Maximum"),
+                        "data_storage_unit": (limits.get("DataStorage") or {}).get("Unit"),
+                        "ecpu_per_second_max": (limits.get("ECPUPerSecond") or {}).get("Maximum"),
+                    })
+        except Exception:
+            # older botocore releases do not know about serverless caches
+            logger.debug("Failed to describe serverless caches", exc_info=True)
+        return caches
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
         paginator = self.client.get_paginator("describe_cache_clusters")
         clusters: List[Dict] = []
@@ -34,52 +115,47 @@ class ElastiCacheAnalyzer:
         per_type_counts: Dict[str, int] = {}
         total_nodes = 0
 
-        for page in paginator.paginate(ShowCacheNodeInfo=True):
-            for c in page.get("CacheClusters", []) or []:
-                clusters.append(c)
-                eng = c.get("Engine")
-                engines[eng] = engines.get(eng, 0) + 1
-
-                # determine node type and count
-                node_type = c.get("CacheNodeType")
-                node_count = c.get("NumCacheNodes") or len(c.get("CacheNodes", []) or [])
-
-                # some responses may have node type per CacheNode; fall back accordingly
-                if not node_type:
-                    nodes = c.get("CacheNodes") or []
-                    if nodes and isinstance(nodes, list):
-                        node_type = nodes[0].get("CacheNodeType")
-
-                # normalize: ElastiCache node types often are prefixed with 'cache.'
-                norm_type = None
-                if isinstance(node_type, str):
-                    if node_type.startswith("cache."):
-                        norm_type = node_type[len("cache."):]
-                    else:
-                        norm_type = node_type
-
-                if norm_type:
-                    per_type_counts[norm_type] = per_type_counts.get(norm_type, 0) + (node_count or 0)
-                    total_nodes += (node_count or 0)
-
-        summary: Dict[str, object] = {"total_clusters": len(clusters), "by_engine": engines}
+        # per-node payloads are only needed for details; clusters are projected
+        # as each page arrives so raw descriptions are not retained
+        for c in project_pages(paginator.paginate(ShowCacheNodeInfo=include_details), "CacheClusters", CLUSTER_FIELDS):
+            clusters.append(c)
+            eng = c["engine"]
+            engines[eng] = engines.get(eng, 0) + 1
+
+            node_type = c["cache_node_type"]
+            node_count = c["num_cache_nodes"]
+
+            # normalize: ElastiCache node types often are prefixed with 'cache.'
+            norm_type = None
+            if isinstance(node_type, str):
+                if node_type.startswith("cache."):
+                    norm_type = node_type[len("cache."):]
+                else:
+                    norm_type = node_type
+
+            if norm_type:
+                per_type_counts[norm_type] = per_type_counts.get(norm_type, 0) + (node_count or 0)
+                total_nodes += (node_count or 0)
+
+        groups = self._replication_groups()
+        serverless = self._serverless_caches()
+        serverless_by_engine: Dict[str, int] = {}
+        for c in serverless:
+            eng = c.get("engine") or "unknown"
+            serverless_by_engine[eng] = serverless_by_engine.get(eng, 0) + 1
+
+        summary: Dict[str, object] = {
+            "total_clusters": len(clusters),
+            "by_engine": engines,
+            "total_replication_groups": len(groups),
+            "total_shards": sum(g["shard_count"] for g in groups),
+            "total_serverless_caches": len(serverless),
+            "serverless_by_engine": serverless_by_engine,
+        }
 
         if per_type_counts:
             # enrich via EC2 DescribeInstanceTypes
-            ec2_client = self.session.client("ec2", region_name=self.region_name)
-            type_specs: Dict[str, Dict[str, int]] = {}
-            itypes = list(per_type_counts.keys())
-            for i in range(0, len(itypes), 100):
-                chunk = itypes[i : i + 100]
-                try:
-                    resp = ec2_client.describe_instance_types(InstanceTypes=chunk)
-                    for it in resp.get("InstanceTypes", []):
-                        name = it.get("InstanceType")
-                        vcpu = it.get("VCpuInfo", {}).get("DefaultVCpus") or 0
-                        mem_mib = it.get("MemoryInfo", {}).get("SizeInMiB") or 0
-                        type_specs[name] = {"vCPU": vcpu, "memory_mib": mem_mib}
-                except Exception:
-                    logger.exception("Failed to describe EC2 instance types for %s", chunk)
+            type_specs = InstanceTypeLookup(self.session, self.region_name).resolve(per_type_counts)
 
             by_instance_type: Dict[str, Dict[str, int]] = {}
             total_vcpu = 0
@@ -110,15 +186,32 @@ class ElastiCacheAnalyzer:
         result = {"summary": summary}
 
         if include_details:
+            # index replication-group membership by cluster id for O(1) joins
+            member_of: Dict[str, Dict] = {}
+            for g in groups:
+                for cid in g["member_clusters"]:
+                    member_of[cid] = g
+
             details = []
             for c in clusters:
+                group = member_of.get(c["cache_cluster_id"])
                 details.append({
-                    "cache_cluster_id": c.get("CacheClusterId"),
-                    "engine": c.get("Engine"),
-                    "num_cache_nodes": c.get("NumCacheNodes"),
-                    "status": c.get("CacheClusterStatus"),
-                    "cache_node_type": c.get("CacheNodeType"),
+                    **c,
+                    "replication_group_id": c["replication_group_id"] or (group or {}).get("replication_group_id"),
+                    "role": (group or {}).get("member_roles", {}).get(c["cache_cluster_id"]),
                 })
+            if self.collect_utilization:
+                metrics = CloudWatchMetrics(self.session, self.region_name)
+                for d in details:
+                    if d["engine"] == "memcached":
+                        metrics.add(d["cache_cluster_id"], "AWS/ElastiCache", "BytesUsedForCache", {"CacheClusterId": d["cache_cluster_id"]}, label="bytes_used_for_cache")
+                    else:
+                        metrics.add(d["cache_cluster_id"], "AWS/ElastiCache", "DatabaseMemoryUsagePercentage", {"CacheClusterId": d["cache_cluster_id"]}, label="memory_usage_percent")
+                usage = metrics.fetch() if len(metrics) else {}
+                for d in details:
+                    d["utilization"] = usage.get(d["cache_cluster_id"], {})
             result["clusters"] = details
+            result["replication_groups"] = [{k: v for k, v in g.items() if k != "member_roles"} for g in groups]
+            result["serverless_caches"] = serverless
 
         return result
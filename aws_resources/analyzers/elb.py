@@ -1,12 +1,22 @@
 """ELB analyzer
 
-Summarizes Classic/ALB/NLB load balancers via elb and elbv2 APIs.
+Summarizes Classic/ALB/NLB/GWLB load balancers via elb and elbv2 APIs.
+
+Both load balancer listings are paginated. Target groups are collected with one
+paginated sweep and joined to load balancers by ARN, so the summary reports the
+ALB/NLB/GWLB split and load balancers without targets in O(pages) calls
+(classic load balancers list their instances inline). With
+include_details=True tags are fetched in batches of 20 and registered-target
+counts are read per target group, concurrently, to find load balancers whose
+target groups are all empty.
 """
 from __future__ import annotations
 
 from typing import Dict, List, Optional
 import logging
 
+from .batching import DEFAULT_MAX_WORKERS, bounded_map, chunks
+
 try:
     import boto3
 except Exception:
@@ -14,11 +24,17 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# DescribeLoadBalancers page size limit for both elb and elbv2
+PAGE_SIZE = 400
+# DescribeTags accepts at most 20 load balancer names/ARNs per call
+DESCRIBE_TAGS_BATCH_SIZE = 20
+
 
 class ELBAnalyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None, max_workers: int = DEFAULT_MAX_WORKERS):
         self.profile = profile
         self.region_name = region_name
+        self.max_workers = max_workers
         if boto3 is None:
             raise RuntimeError("boto3 is required for ELBAnalyzer")
         if profile:
@@ -28,28 +44,117 @@ class ELBAnalyzer:
         self.client_v1 = self.session.client("elb", region_name=region_name)
         self.client_v2 = self.session.client("elbv2", region_name=region_name)
 
+    @staticmethod
+    def _paginate(client, op: str, key: str) -> List[Dict]:
+        items: List[Dict] = []
+        for page in client.get_paginator(op).paginate(PaginationConfig={"PageSize": PAGE_SIZE}):
+            items.extend(page.get(key, []) or [])
+        return items
+
+    def _tags(self, client, ids: List[str], id_param: str, id_key: str) -> Dict[str, Dict[str, str]]:
+        """Fetch tags in batches of 20 (batches run concurrently), keyed by name/ARN."""
+        def fetch(batch):
+            try:
+                return client.describe_tags(**{id_param: list(batch)}).get("TagDescriptions", [])
+            except Exception:
+                logger.debug("Failed to describe tags for %s", batch, exc_info=True)
+                return []
+
+        tags: Dict[str, Dict[str, str]] = {}
+        for descs in bounded_map(fetch, list(chunks(ids, DESCRIBE_TAGS_BATCH_SIZE)), self.max_workers):
+            for d in descs:
+                tags[d.get(id_key)] = {t.get("Key"): t.get("Value") for t in d.get("Tags") or []}
+        return tags
+
+    def _registered_targets(self, tg_arn: str) -> Optional[int]:
+        try:
+            return len(self.client_v2.describe_target_health(TargetGroupArn=tg_arn).get("TargetHealthDescriptions", []))
+        except Exception:
+            logger.debug("Failed to describe target health for %s", tg_arn, exc_info=True)
+            return None
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
         # Classic ELB
         try:
-            v1 = self.client_v1.describe_load_balancers().get("LoadBalancerDescriptions", [])
+            v1 = self._paginate(self.client_v1, "describe_load_balancers", "LoadBalancerDescriptions")
         except Exception:
+            logger.debug("Failed to list classic load balancers", exc_info=True)
             v1 = []
 
-        # ALB/NLB
+        # ALB/NLB/GWLB
         try:
-            v2 = self.client_v2.describe_load_balancers().get("LoadBalancers", [])
+            v2 = self._paginate(self.client_v2, "describe_load_balancers", "LoadBalancers")
         except Exception:
+            logger.debug("Failed to list v2 load balancers", exc_info=True)
             v2 = []
 
-        summary = {"classic": len(v1), "alb_nlb": len(v2), "total": len(v1) + len(v2)}
+        # one target-group sweep, indexed by load balancer ARN
+        try:
+            target_groups = self._paginate(self.client_v2, "describe_target_groups", "TargetGroups")
+        except Exception:
+            logger.debug("Failed to list target groups", exc_info=True)
+            target_groups = []
+        tgs_by_lb: Dict[str, List[Dict]] = {}
+        for tg in target_groups:
+            for lb_arn in tg.get("LoadBalancerArns") or []:
+                tgs_by_lb.setdefault(lb_arn, []).append(tg)
+
+        by_type: Dict[str, int] = {}
+        for l in v2:
+            t = l.get("Type") or "unknown"
+            by_type[t] = by_type.get(t, 0) + 1
+
+        summary = {
+            "classic": len(v1),
+            "alb_nlb": len(v2),
+            "total": len(v1) + len(v2),
+            "by_type": by_type,
+            "total_target_groups": len(target_groups),
+            "classic_without_instances": sum(1 for l in v1 if not l.get("Instances")),
+            "without_target_groups": sum(1 for l in v2 if not tgs_by_lb.get(l.get("LoadBalancerArn"))),
+        }
         result = {"summary": summary}
 
         if include_details:
+            attached = [tg.get("TargetGroupArn") for tg in target_groups if tg.get("LoadBalancerArns")]
+            target_counts = dict(zip(attached, bounded_map(self._registered_targets, attached, self.max_workers)))
+
+            names = [l.get("LoadBalancerName") for l in v1]
+            arns = [l.get("LoadBalancerArn") for l in v2]
+            v1_tags = self._tags(self.client_v1, names, "LoadBalancerNames", "LoadBalancerName") if names else {}
+            v2_tags = self._tags(self.client_v2, arns, "ResourceArns", "ResourceArn") if arns else {}
+
             details = {"classic": [], "alb_nlb": []}
+            zero_targets = 0
             for l in v1:
-                details["classic"].append({"name": l.get("LoadBalancerName"), "dns": l.get("DNSName")})
+                instances = len(l.get("Instances") or [])
+                if not instances:
+                    zero_targets += 1
+                details["classic"].append({
+                    "name": l.get("LoadBalancerName"),
+                    "dns": l.get("DNSName"),
+                    "instance_count": instances,
+                    "tags": v1_tags.get(l.get("LoadBalancerName"), {}),
+                })
             for l in v2:
-                details["alb_nlb"].append({"arn": l.get("LoadBalancerArn"), "dns": l.get("DNSName"), "type": l.get("Type")})
+                arn = l.get("LoadBalancerArn")
+                tgs = tgs_by_lb.get(arn, [])
+                counts = [target_counts.get(tg.get("TargetGroupArn")) for tg in tgs]
+                registered = None if any(c is None for c in counts) else sum(counts)
+                if registered == 0:
+                    zero_targets += 1
+                details["alb_nlb"].append({
+                    "arn": arn,
+                    "dns": l.get("DNSName"),
+                    "type": l.get("Type"),
+                    "target_groups": [
+                        {"arn": tg.get("TargetGroupArn"), "protocol": tg.get("Protocol"), "port": tg.get("Port"), "target_type": tg.get("TargetType")}
+                        for tg in tgs
+                    ],
+                    "registered_targets": registered,
+                    "tags": v2_tags.get(arn, {}),
+                })
+            summary["zero_registered_targets"] = zero_targets
             result["load_balancers"] = details
 
         return result
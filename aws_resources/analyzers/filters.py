@@ -0,0 +1,15 @@
+"""Server-side listing filters shared by analyzers
+
+DocumentDB, Neptune and RDS share one API endpoint, so a DescribeDBClusters or
+DescribeDBInstances call returns all of their resources unless it is scoped by
+engine. Analyzers that own a single engine pass `engine_filter()` as the
+listing's `Filters` instead of dropping the other engines client-side.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List
+
+
+def engine_filter(engines: Iterable[str]) -> List[Dict[str, object]]:
+    """Return DescribeDBInstances/DescribeDBClusters `Filters` selecting `engines`."""
+    return [{"Name": "engine", "Values": list(engines)}]
@@ -0,0 +1,84 @@
+"""EC2 instance-type lookup shared by analyzers
+
+Resolves EC2 instance type names to vCPU, memory and primary architecture using
+DescribeInstanceTypes in batches of 100. Results are memoized per lookup
+instance, so an analyzer resolving types in several places pays for each type
+once. A single unknown type makes DescribeInstanceTypes reject the whole batch
+with InvalidInstanceType, so such a batch is retried one type at a time and
+only the unknown types are lost.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional
+import logging
+import threading
+
+from .batching import chunks
+
+logger = logging.getLogger(__name__)
+
+# DescribeInstanceTypes accepts at most 100 instance types per call
+DESCRIBE_INSTANCE_TYPES_BATCH_SIZE = 100
+INVALID_INSTANCE_TYPE_ERROR = "InvalidInstanceType"
+
+
+def _error_code(exc: BaseException) -> Optional[str]:
+    return ((getattr(exc, "response", None) or {}).get("Error") or {}).get("Code")
+
+
+def _architecture(info: Dict) -> str:
+    supported = (info.get("ProcessorInfo") or {}).get("SupportedArchitectures") or []
+    if not supported:
+        return "unknown"
+    if "arm64" in supported or "aarch64" in supported:
+        return "arm"
+    return "x86"
+
+
+class InstanceTypeLookup:
+    """Memoizing resolver from EC2 instance type to {"vCPU", "memory_mib", "architecture"}."""
+
+    def __init__(self, session, region_name: Optional[str] = None):
+        self.session = session
+        self.region_name = region_name
+        self._client = None
+        self._specs: Dict[str, Dict[str, object]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = self.session.client("ec2", region_name=self.region_name)
+        return self._client
+
+    def resolve(self, instance_types: Iterable[Optional[str]]) -> Dict[str, Dict[str, object]]:
+        """Return specs for the given types, calling AWS only for unseen ones.
+
+        Unknown or unresolvable types are omitted from the result.
+        """
+        wanted = {t for t in instance_types if t}
+        with self._lock:
+            missing = sorted(t for t in wanted if t not in self._specs)
+            for chunk in chunks(missing, DESCRIBE_INSTANCE_TYPES_BATCH_SIZE):
+                self._describe(list(chunk))
+            return {t: self._specs[t] for t in wanted if t in self._specs}
+
+    def _describe(self, instance_types: List[str]) -> None:
+        try:
+            resp = self.client.describe_instance_types(InstanceTypes=instance_types)
+        except Exception as exc:
+            if _error_code(exc) == INVALID_INSTANCE_TYPE_ERROR and len(instance_types) > 1:
+                # find the valid types the rejected batch was hiding
+                for t in instance_types:
+                    self._describe([t])
+            elif _error_code(exc) == INVALID_INSTANCE_TYPE_ERROR:
+                logger.debug("Unknown EC2 instance type %s", instance_types[0])
+            else:
+                logger.exception("Failed to describe EC2 instance types for %s", instance_types)
+            return
+        for it in resp.get("InstanceTypes", []):
+            self._specs[it.get("InstanceType")] = {
+                "vCPU": (it.get("VCpuInfo") or {}).get("DefaultVCpus") or 0,
+                "memory_mib": (it.get("MemoryInfo") or {}).get("SizeInMiB") or 0,
+                "architecture": _architecture(it),
+            }
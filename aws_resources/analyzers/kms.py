@@ -1,12 +1,28 @@
 """KMS analyzer
 
 Summarizes KMS keys and optionally returns per-key metadata.
+
+Aliases are collected with one paginated ListAliases sweep and joined to keys
+through a dict index. AWS-managed keys are recognised by their reserved
+`alias/aws/` aliases, so the customer- vs AWS-managed split needs no
+DescribeKey calls. With include_details=True, DescribeKey runs concurrently for
+customer-managed keys (AWS-managed ones only when include_aws_managed=True).
+Key metadata is cached across runs (see `aws_resources.cache`), so only new
+keys, or entries older than `cache_ttl_seconds` (a day by default), are
+described again; the TTL bounds how long an Enabled -> Disabled change can go
+unnoticed. Keys whose cached state is transitional or reversible (pending
+deletion, disabled, ...) are re-described on every run. The cache
+has one file per account and region (taken from the key ARNs), so pruning the
+keys a listing no longer returns never touches other accounts or regions.
 """
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 import logging
 
+from ..cache import JsonFileCache
+from .batching import DEFAULT_MAX_WORKERS, bounded_map
+
 try:
     import boto3
 except Exception:
@@ -14,11 +30,53 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+AWS_MANAGED_ALIAS_PREFIX = "alias/aws/"
+
+# Key metadata is mostly immutable; the TTL bounds how stale KeyState can get.
+DEFAULT_CACHE_TTL_SECONDS = 24 * 3600
+
+# cached keys in these states are re-described every run: they are expected to
+# change (deletion, import, replication) or were switched off and may be back
+VOLATILE_KEY_STATES = frozenset({
+    "Creating",
+    "Disabled",
+    "PendingDeletion",
+    "PendingImport",
+    "PendingReplicaDeletion",
+    "Unavailable",
+    "Updating",
+})
+
+
+def cache_name(arns: Iterable[Optional[str]]) -> Optional[str]:
+    """Return the per-account/region cache name for key ARNs, or None if unknown.
+
+    ARNs look like arn:<partition>:kms:<region>:<account>:key/<id>; one ListKeys
+    listing always shares a single account and region.
+    """
+    for arn in arns:
+        parts = (arn or "").split(":")
+        if len(parts) >= 6 and parts[3] and parts[4]:
+            return f"kms-keys-{parts[4]}-{parts[3]}"
+    return None
+
 
 class KMSAnalyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(
+        self,
+        profile: Optional[str] = None,
+        region_name: Optional[str] = None,
+        include_aws_managed: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        cache_dir: Optional[str] = None,
+        cache_ttl_seconds: Optional[float] = DEFAULT_CACHE_TTL_SECONDS,
+    ):
         self.profile = profile
         self.region_name = region_name
+        self.include_aws_managed = include_aws_managed
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+        self.cache_ttl_seconds = cache_ttl_seconds
         if boto3 is None:
             raise RuntimeError("boto3 is required for KMSAnalyzer")
         if profile:
@@ -27,24 +85,103 @@ class KMSAnalyzer:
             self.session = boto3.Session()
         self.client = self.session.client("kms", region_name=region_name)
 
+    def _aliases_by_key(self) -> Dict[str, List[str]]:
+        """Sweep ListAliases once and index alias names by target key id."""
+        index: Dict[str, List[str]] = {}
+        for page in self.client.get_paginator("list_aliases").paginate():
+            for a in page.get("Aliases", []) or []:
+                target = a.get("TargetKeyId")
+                if target:
+                    index.setdefault(target, []).append(a.get("AliasName"))
+        return index
+
+    def _describe_key(self, kid: str) -> Optional[Dict[str, object]]:
+        try:
+            info = self.client.describe_key(KeyId=kid).get("KeyMetadata", {})
+        except Exception:
+            logger.debug("Failed to describe key %s", kid, exc_info=True)
+            return None
+        return {
+            "description": info.get("Description"),
+            "key_state": info.get("KeyState"),
+            "key_manager": info.get("KeyManager"),
+            "key_spec": info.get("KeySpec") or info.get("CustomerMasterKeySpec"),
+            "key_usage": info.get("KeyUsage"),
+        }
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
         paginator = self.client.get_paginator("list_keys")
-        keys: List[str] = []
+        keys: List[Dict[str, Optional[str]]] = []
         for page in paginator.paginate():
             for k in page.get("Keys", []) or []:
-                keys.append(k.get("KeyId") or k.get("KeyArn"))
+                keys.append({"id": k.get("KeyId") or k.get("KeyArn"), "arn": k.get("KeyArn")})
+
+        try:
+            aliases = self._aliases_by_key()
+        except Exception:
+            logger.debug("Failed to list KMS aliases", exc_info=True)
+            aliases = {}
+
+        def is_aws_managed(kid: str) -> bool:
+            return any(a.startswith(AWS_MANAGED_ALIAS_PREFIX) for a in aliases.get(kid, []))
 
-        result = {"summary": {"total_keys": len(keys)}}
+        aws_managed = sum(1 for k in keys if is_aws_managed(k["id"]))
+        result = {
+            "summary": {
+                "total_keys": len(keys),
+                "by_manager": {"customer": len(keys) - aws_managed, "aws": aws_managed},
+            }
+        }
 
         if include_details and keys:
+            # without ARNs the account/region is unknown, so nothing is cached
+            name = cache_name(k["arn"] for k in keys)
+            cache = JsonFileCache(name, directory=self.cache_dir, ttl_seconds=self.cache_ttl_seconds) if name else None
+
+            metadata: Dict[str, Optional[Dict]] = {}
+            to_describe: List[str] = []
+            for k in keys:
+                kid = k["id"]
+                if is_aws_managed(kid) and not self.include_aws_managed:
+                    continue
+                cached = cache.get(kid) if cache else None
+                if cached is not None and cached.get("key_state") not in VOLATILE_KEY_STATES:
+                    metadata[kid] = cached
+                else:
+                    to_describe.append(kid)
+
+            for kid, info in zip(to_describe, bounded_map(self._describe_key, to_describe, self.max_workers)):
+                metadata[kid] = info
+                if cache and info is not None:
+                    cache.set(kid, info)
+            if cache:
+                # the file holds this account/region only, so the listing is complete
+                cache.retain(k["id"] for k in keys)
+                cache.save()
+
             details = []
-            for kid in keys:
-                try:
-                    info = self.client.describe_key(KeyId=kid).get("KeyMetadata", {})
-                except Exception:
-                    logger.debug("Failed to describe key %s", kid, exc_info=True)
-                    info = {}
-                details.append({"key_id": kid, "description": info.get("Description"), "key_state": info.get("KeyState")})
+            by_state: Dict[str, int] = {}
+            for k in keys:
+                kid = k["id"]
+                managed = is_aws_managed(kid)
+                info = metadata.get(kid) or {}
+                state = info.get("key_state")
+                if state is None and managed:
+                    # AWS-managed keys cannot be disabled or scheduled for deletion
+                    state = "Enabled"
+                by_state[state or "unknown"] = by_state.get(state or "unknown", 0) + 1
+                details.append({
+                    "key_id": kid,
+                    "aliases": aliases.get(kid, []),
+                    "key_manager": info.get("key_manager") or ("AWS" if managed else None),
+                    "description": info.get("description"),
+                    "key_state": state,
+                    "key_spec": info.get("key_spec"),
+                    "key_usage": info.get("key_usage"),
+                })
+
+            result["summary"]["by_state"] = by_state
+            result["summary"]["described_keys"] = len(to_describe)
             result["keys"] = details
 
         return result
@@ -2,12 +2,27 @@
 `lambda_analyzer.py`. We keep this file named `lambda.py` per user request, but
 imports from this module must avoid the `from .lambda import ...` syntax which is
 invalid (lambda is a Python keyword). Use importlib to import when needed.
+
+With collect_utilization=True (the default) 30-day invocations, errors,
+duration p95 and estimated GB-seconds are read for every function through the
+shared batched CloudWatch metrics engine: four queries per function packed 500
+to a GetMetricData call, so the call count grows with batches, not functions.
+The summary aggregates them by runtime and memory size and lists the top
+functions by GB-seconds; per-function figures are added to the details.
+Figures CloudWatch returned nothing for are None and left out of the totals;
+`usage_failed_batches` counts GetMetricData requests that failed, and
+`usage_complete` is False when any did.
 """
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import Dict, List, Optional
 import logging
 
+from .aggregate import Aggregator
+from .metrics import CloudWatchMetrics
+from .records import LambdaFunctionRecord
+
 try:
     import boto3
 except Exception:  # pragma: no cover - tests inject a fake boto3
@@ -15,11 +30,16 @@ except Exception:  # pragma: no cover - tests inject a fake boto3
 
 logger = logging.getLogger(__name__)
 
+USAGE_WINDOW = timedelta(days=30)
+# number of functions listed in summary["top_by_gb_seconds"]
+TOP_FUNCTIONS = 10
+
 
 class LambdaAnalyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None, collect_utilization: bool = True):
         self.profile = profile
         self.region_name = region_name
+        self.collect_utilization = collect_utilization
         if boto3 is None:
             raise RuntimeError("boto3 is required for LambdaAnalyzer")
         if profile:
@@ -29,12 +49,10 @@ class LambdaAnalyzer:
         self.client = self.session.client("lambda", region_name=region_name)
 
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
-        functions: List[Dict] = []
+        functions: List[LambdaFunctionRecord] = []
         paginator = self.client.get_paginator("list_functions")
 
-        total_memory = 0
-        runtime_counts: Dict[str, int] = {}
-        memory_buckets: Dict[int, int] = {}
+        agg = Aggregator(keys=("runtime", "memory_mb"), measures=("memory_mb",))
 
         for page in paginator.paginate():
             for f in page.get("Functions", []):
@@ -44,27 +62,80 @@ class LambdaAnalyzer:
                 handler = f.get("Handler")
                 env = f.get("Environment", {}).get("Variables", {})
 
-                functions.append({
-                    "name": name,
-                    "memory_mb": mem,
-                    "runtime": runtime,
-                    "handler": handler,
-                })
+                functions.append(LambdaFunctionRecord(
+                    name=name,
+                    memory_mb=mem,
+                    runtime=runtime,
+                    handler=handler,
+                ))
 
-                total_memory += mem
-                runtime_counts[runtime] = runtime_counts.get(runtime, 0) + 1
-                memory_buckets[mem] = memory_buckets.get(mem, 0) + 1
+                agg.add(runtime, mem, mem)
 
         result: Dict[str, object] = {
             "summary": {
                 "total_functions": len(functions),
-                "total_memory_mb": total_memory,
-                "by_runtime": runtime_counts,
-                "by_memory_mb": memory_buckets,
+                "total_memory_mb": agg.total()["memory_mb"],
+                "by_runtime": {r: g["count"] for r, g in agg.rollup("runtime").items()},
+                "by_memory_mb": {m: g["count"] for m, g in agg.rollup("memory_mb").items()},
             },
         }
 
+        if self.collect_utilization and functions:
+            result["summary"].update(self._usage(functions))
+
         if include_details:
-            result["functions"] = functions
+            result["functions"] = [f.to_dict() for f in functions]
 
         return result
+
+    def _usage(self, functions: List[LambdaFunctionRecord]) -> Dict[str, object]:
+        """Attach 30-day usage to each function and return the summary aggregates."""
+        # one datapoint per query covers the whole window
+        period = int(USAGE_WINDOW.total_seconds())
+        metrics = CloudWatchMetrics(self.session, self.region_name, lookback=USAGE_WINDOW)
+        for f in functions:
+            dims = {"FunctionName": f.name}
+            metrics.add(f.name, "AWS/Lambda", "Invocations", dims, stat="Sum", period=period, label="invocations")
+            metrics.add(f.name, "AWS/Lambda", "Errors", dims, stat="Sum", period=period, label="errors")
+            metrics.add(f.name, "AWS/Lambda", "Duration", dims, stat="p95", period=period, label="duration_p95")
+            metrics.add(f.name, "AWS/Lambda", "Duration", dims, stat="Sum", period=period, label="duration_sum")
+        usage = metrics.fetch()
+
+        by_runtime: Dict[str, Dict[str, float]] = {}
+        by_memory: Dict[int, Dict[str, float]] = {}
+        totals = {"invocations": 0, "errors": 0, "gb_seconds": 0.0}
+        for f in functions:
+            u = usage.get(f.name, {})
+            # no series means no datapoints or a failed request; either way unknown, not zero
+            f.invocations = int(u["invocations"]["sum"]) if "invocations" in u else None
+            f.errors = int(u["errors"]["sum"]) if "errors" in u else None
+            # the window may straddle two period buckets; keep the worse p95
+            f.duration_p95_ms = u["duration_p95"]["maximum"] if "duration_p95" in u else None
+            # Duration is in milliseconds; GB-seconds ignore per-invocation rounding
+            f.gb_seconds = round(u["duration_sum"]["sum"] / 1000.0 * f.memory_mb / 1024.0, 2) if "duration_sum" in u else None
+
+            runtime_bucket = by_runtime.setdefault(f.runtime, dict.fromkeys(totals, 0))
+            memory_bucket = by_memory.setdefault(f.memory_mb, dict.fromkeys(totals, 0))
+            for bucket in (runtime_bucket, memory_bucket, totals):
+                if f.invocations is not None:
+                    bucket["invocations"] += f.invocations
+                if f.errors is not None:
+                    bucket["errors"] += f.errors
+                if f.gb_seconds is not None:
+                    bucket["gb_seconds"] = round(bucket["gb_seconds"] + f.gb_seconds, 2)
+
+        top = sorted((f for f in functions if f.gb_seconds), key=lambda f: f.gb_seconds, reverse=True)[:TOP_FUNCTIONS]
+        return {
+            "usage_window_days": USAGE_WINDOW.days,
+            "usage_complete": metrics.failed_batches == 0,
+            "usage_failed_batches": metrics.failed_batches,
+            "total_invocations": totals["invocations"],
+            "total_errors": totals["errors"],
+            "total_gb_seconds": totals["gb_seconds"],
+            "usage_by_runtime": by_runtime,
+            "usage_by_memory_mb": by_memory,
+            "top_by_gb_seconds": [
+                {"name": f.name, "runtime": f.runtime, "memory_mb": f.memory_mb, "invocations": f.invocations, "gb_seconds": f.gb_seconds}
+                for f in top
+            ],
+        }
@@ -0,0 +1,152 @@
+"""Batched CloudWatch metrics shared by analyzers
+
+Analyzers register one query per (resource, metric) with `CloudWatchMetrics.add`
+and read all of them back with a single `fetch()`. Queries are grouped by
+region and packed into GetMetricData requests of up to 500 queries; the
+requests run concurrently on a bounded pool and each one follows its own
+NextToken pages. A few thousand resources therefore cost a handful of calls
+instead of one GetMetricStatistics call per resource and metric.
+
+Each query's datapoints are reduced to a compact summary:
+{"latest", "average", "maximum", "sum", "datapoints"}. A request that fails,
+including on a later page, contributes nothing: its queries are omitted from
+`fetch()` rather than summarized from a truncated series. `failed_batches`
+counts those requests, so callers can tell missing data from idle resources.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+import logging
+import threading
+
+from .batching import DEFAULT_MAX_WORKERS, bounded_map, chunks
+
+logger = logging.getLogger(__name__)
+
+# GetMetricData accepts at most 500 metric queries per call
+METRIC_QUERIES_PER_CALL = 500
+DEFAULT_LOOKBACK = timedelta(days=14)
+DEFAULT_PERIOD = 3600
+
+Dimensions = Union[Mapping[str, str], Sequence[Mapping[str, str]]]
+
+
+def summarize(values: Sequence[float]) -> Dict[str, float]:
+    """Reduce newest-first datapoints to the compact per-query summary."""
+    total = float(sum(values))
+    return {
+        "latest": round(values[0], 4),
+        "average": round(total / len(values), 4),
+        "maximum": round(max(values), 4),
+        "sum": round(total, 4),
+        "datapoints": len(values),
+    }
+
+
+class CloudWatchMetrics:
+    """Collects metric queries and fetches them with batched GetMetricData calls."""
+
+    def __init__(
+        self,
+        session,
+        region_name: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        lookback: timedelta = DEFAULT_LOOKBACK,
+    ):
+        self.session = session
+        self.region_name = region_name
+        self.max_workers = max_workers
+        self.lookback = lookback
+        self._queries: Dict[Optional[str], List[Dict]] = {}
+        self._clients: Dict[Optional[str], object] = {}
+        self._lock = threading.Lock()
+        # GetMetricData requests that failed during the last fetch()
+        self.failed_batches = 0
+
+    def client(self, region: Optional[str] = None):
+        """Return the (memoized) CloudWatch client for `region`."""
+        region = region or self.region_name
+        with self._lock:
+            if region not in self._clients:
+                self._clients[region] = self.session.client("cloudwatch", region_name=region)
+            return self._clients[region]
+
+    def add(
+        self,
+        resource_id: str,
+        namespace: str,
+        metric: str,
+        dimensions: Dimensions,
+        stat: str = "Average",
+        period: int = DEFAULT_PERIOD,
+        label: Optional[str] = None,
+        region: Optional[str] = None,
+    ) -> None:
+        """Queue one metric query; its summary is returned under `[resource_id][label]`."""
+        if isinstance(dimensions, Mapping):
+            dimensions = [{"Name": k, "Value": v} for k, v in dimensions.items()]
+        self._queries.setdefault(region or self.region_name, []).append(
+            {
+                "resource_id": resource_id,
+                "label": label or metric,
+                "stat": {
+                    "Metric": {"Namespace": namespace, "MetricName": metric, "Dimensions": list(dimensions)},
+                    "Period": period,
+                    "Stat": stat,
+                },
+            }
+        )
+
+    def __len__(self) -> int:
+        return sum(len(q) for q in self._queries.values())
+
+    def _fetch_batch(self, task: Tuple[Optional[str], Sequence[Dict], datetime, datetime]) -> Optional[List[Tuple[Dict, List[float]]]]:
+        """Return (query, values) pairs for one request, or None if it failed."""
+        region, batch, start, end = task
+        values: Dict[str, List[float]] = {}
+        kwargs = {
+            "MetricDataQueries": [{"Id": f"q{idx}", "MetricStat": q["stat"], "ReturnData": True} for idx, q in enumerate(batch)],
+            "StartTime": start,
+            "EndTime": end,
+            "ScanBy": "TimestampDescending",
+        }
+        try:
+            cw = self.client(region)
+            while True:
+                resp = cw.get_metric_data(**kwargs)
+                # a query's datapoints may be split across pages
+                for r in resp.get("MetricDataResults", []) or []:
+                    values.setdefault(r.get("Id"), []).extend(r.get("Values") or [])
+                if not resp.get("NextToken"):
+                    break
+                kwargs["NextToken"] = resp["NextToken"]
+        except Exception:
+            logger.debug("Failed to fetch CloudWatch metrics in %s", region, exc_info=True)
+            # datapoints from earlier pages are an unknown prefix of each series;
+            # summarizing them would under-report sums, so drop the whole batch
+            return None
+        return [(q, values.get(f"q{idx}") or []) for idx, q in enumerate(batch)]
+
+    def fetch(self, end: Optional[datetime] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Run all queued queries and return resource_id -> label -> summary.
+
+        Queries without datapoints are left out of the result.
+        """
+        end = end or datetime.now(timezone.utc)
+        start = end - self.lookback
+        tasks = [
+            (region, batch, start, end)
+            for region, queries in self._queries.items()
+            for batch in chunks(queries, METRIC_QUERIES_PER_CALL)
+        ]
+        out: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self.failed_batches = 0
+        for results in bounded_map(self._fetch_batch, tasks, self.max_workers):
+            if results is None:
+                self.failed_batches += 1
+                continue
+            for q, values in results:
+                if values:
+                    out.setdefault(q["resource_id"], {})[q["label"]] = summarize(values)
+        return out
@@ -1,12 +1,19 @@
 """OpenSearch (Elasticsearch) analyzer
 
 Summarizes OpenSearch domains. Optional per-domain details.
+
+Domains are described in batches of up to 5 names (the DescribeDomains limit)
+with batches running concurrently. Node totals cover data, dedicated master and
+UltraWarm nodes.
 """
 from __future__ import annotations
 
 from typing import Dict, List, Optional
 import logging
 
+from .batching import DEFAULT_MAX_WORKERS, bounded_map, chunks
+from .instance_types import InstanceTypeLookup
+
 try:
     import boto3
 except Exception:
@@ -14,11 +21,29 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# DescribeDomains accepts at most 5 domain names per call
+DESCRIBE_DOMAINS_BATCH_SIZE = 5
+
+# UltraWarm node specs (vCPU / memory MiB) as published by AWS; these types are
+# not EC2 instance types, so DescribeInstanceTypes cannot resolve them.
+ULTRAWARM_SPECS: Dict[str, Dict[str, int]] = {
+    "ultrawarm1.medium": {"vCPU": 2, "memory_mib": 15616},
+    "ultrawarm1.large": {"vCPU": 16, "memory_mib": 124928},
+}
+
+
+def _normalize_type(inst_type: Optional[str]) -> Optional[str]:
+    # OpenSearch instance types often have a suffix like '.search' (e.g. 'm5.large.search')
+    if isinstance(inst_type, str) and inst_type.endswith(".search"):
+        return inst_type[: -len(".search")]
+    return inst_type
+
 
 class OpenSearchAnalyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None, max_workers: int = DEFAULT_MAX_WORKERS):
         self.profile = profile
         self.region_name = region_name
+        self.max_workers = max_workers
         if boto3 is None:
             raise RuntimeError("boto3 is required for OpenSearchAnalyzer")
         if profile:
@@ -31,47 +56,49 @@ class OpenSearchAnalyzer:
         except Exception:
             self.client = self.session.client("es", region_name=region_name)
 
+    def _describe_batch(self, batch: List[str]) -> List[Dict]:
+        try:
+            return self.client.describe_domains(DomainNames=list(batch)).get("DomainStatusList", [])
+        except Exception:
+            logger.debug("Failed to describe domains %s", batch, exc_info=True)
+            return []
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
         # list domain names
         try:
             resp = self.client.list_domain_names()
             names = [d.get("DomainName") for d in resp.get("DomainNames", [])]
         except Exception:
-            # fallback for es client
-            try:
-                resp = self.client.list_domain_names()
-                names = [d.get("DomainName") for d in resp.get("DomainNames", [])]
-            except Exception:
-                names = []
-
-        # collect per-domain details and cluster config where available
-        domains_info = []
-        if names:
-            for n in names:
-                try:
-                    d = self.client.describe_domains(DomainNames=[n]).get("DomainStatusList", [])[0]
-                    domains_info.append(d)
-                except Exception:
-                    logger.debug("Failed to describe domain %s", n, exc_info=True)
-
-        # Extract instance-type counts from domain cluster configs
+            logger.debug("Failed to list OpenSearch domains", exc_info=True)
+            names = []
+
+        # describe domains in API-sized batches, batches running concurrently
+        domains_info: List[Dict] = []
+        for described in bounded_map(self._describe_batch, list(chunks(names, DESCRIBE_DOMAINS_BATCH_SIZE)), self.max_workers):
+            domains_info.extend(described)
+
+        # Extract node counts per instance type from domain cluster configs,
+        # covering data, dedicated master and UltraWarm nodes
         per_type_counts: Dict[str, int] = {}
+        by_role: Dict[str, int] = {"data": 0, "master": 0, "warm": 0}
         total_nodes = 0
         domain_details: List[Dict] = []
         for d in domains_info:
             # cluster config key varies between 'ClusterConfig' and older 'ElasticsearchClusterConfig'
             cfg = d.get("ClusterConfig") or d.get("ElasticsearchClusterConfig") or {}
-            inst_type = cfg.get("InstanceType") or cfg.get("InstanceType")
-            inst_count = cfg.get("InstanceCount") or cfg.get("InstanceCount") or 0
-            # OpenSearch instance types often have a suffix like '.search' (e.g. 'm5.large.search')
-            if isinstance(inst_type, str) and inst_type.endswith(".search"):
-                norm_type = inst_type[: -len(".search")]
-            else:
-                norm_type = inst_type
-
-            if norm_type:
-                per_type_counts[norm_type] = per_type_counts.get(norm_type, 0) + (inst_count or 0)
-                total_nodes += (inst_count or 0)
+            inst_type = cfg.get("InstanceType")
+            inst_count = cfg.get("InstanceCount") or 0
+            master_type = cfg.get("DedicatedMasterType") if cfg.get("DedicatedMasterEnabled") else None
+            master_count = (cfg.get("DedicatedMasterCount") or 0) if master_type else 0
+            warm_type = cfg.get("WarmType") if cfg.get("WarmEnabled") else None
+            warm_count = (cfg.get("WarmCount") or 0) if warm_type else 0
+
+            for role, t, count in (("data", inst_type, inst_count), ("master", master_type, master_count), ("warm", warm_type, warm_count)):
+                norm_type = _normalize_type(t)
+                if norm_type:
+                    per_type_counts[norm_type] = per_type_counts.get(norm_type, 0) + count
+                    by_role[role] += count
+                    total_nodes += count
 
             domain_details.append({
                 "domain_name": d.get("DomainName"),
@@ -79,7 +106,10 @@ class OpenSearchAnalyzer:
                 "cluster_config": {
                     "instance_type": inst_type,
                     "instance_count": inst_count,
-                    "warm_type": cfg.get("WarmType") or cfg.get("WarmEnabled"),
+                    "dedicated_master_type": master_type,
+                    "dedicated_master_count": master_count,
+                    "warm_type": warm_type,
+                    "warm_count": warm_count,
                 },
             })
 
@@ -87,20 +117,10 @@ class OpenSearchAnalyzer:
 
         if per_type_counts:
             # try to enrich instance types via EC2 DescribeInstanceTypes
-            ec2_client = self.session.client("ec2", region_name=self.region_name)
-            type_specs: Dict[str, Dict[str, int]] = {}
-            itypes = list(per_type_counts.keys())
-            for i in range(0, len(itypes), 100):
-                chunk = itypes[i : i + 100]
-                try:
-                    resp = ec2_client.describe_instance_types(InstanceTypes=chunk)
-                    for it in resp.get("InstanceTypes", []):
-                        name = it.get("InstanceType")
-                        vcpu = it.get("VCpuInfo", {}).get("DefaultVCpus") or 0
-                        mem_mib = it.get("MemoryInfo", {}).get("SizeInMiB") or 0
-                        type_specs[name] = {"vCPU": vcpu, "memory_mib": mem_mib}
-                except Exception:
-                    logger.exception("Failed to describe EC2 instance types for %s", chunk)
+            # UltraWarm node types have no EC2 equivalent; use the published specs
+            type_specs: Dict[str, Dict[str, int]] = {t: dict(ULTRAWARM_SPECS[t]) for t in per_type_counts if t in ULTRAWARM_SPECS}
+            lookup = InstanceTypeLookup(self.session, self.region_name)
+            type_specs.update(lookup.resolve(t for t in per_type_counts if t not in ULTRAWARM_SPECS))
 
             # build by_instance_type summary
             by_instance_type: Dict[str, Dict[str, int]] = {}
@@ -122,12 +142,13 @@ class OpenSearchAnalyzer:
 
             summary.update({
                 "total_nodes": total_nodes,
+                "nodes_by_role": by_role,
                 "total_vCPU": total_vcpu,
                 "total_memory_mib": total_memory,
                 "by_instance_type": by_instance_type,
             })
         else:
-            summary.update({"total_nodes": total_nodes})
+            summary.update({"total_nodes": total_nodes, "nodes_by_role": by_role})
 
         result = {"summary": summary}
 
@@ -0,0 +1,49 @@
+"""Field projection for raw API payloads
+
+Analyzers declare, per resource type, which fields they need as a mapping of
+output name -> source. A source is a dotted path into the raw item
+("Endpoint.Address") or a callable taking the raw item. `project_pages` applies
+the projection while iterating a paginator, so each raw page can be released as
+soon as its items are projected instead of being held until the analysis ends.
+
+Datetimes are converted to ISO 8601 strings on the way, which keeps projected
+records safe for `json.dumps`.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Union
+
+Source = Union[str, Callable[[Mapping], Any]]
+Fields = Mapping[str, Source]
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    return value
+
+
+def _lookup(item: Mapping, path: str) -> Any:
+    value: Any = item
+    for key in path.split("."):
+        if not isinstance(value, Mapping):
+            return None
+        value = value.get(key)
+    return value
+
+
+def project(item: Mapping, fields: Fields) -> Dict[str, Any]:
+    """Return a new dict holding only the declared fields of `item`."""
+    return {name: _plain(source(item) if callable(source) else _lookup(item, source)) for name, source in fields.items()}
+
+
+def project_pages(pages: Iterable[Mapping], key: str, fields: Fields) -> Iterator[Dict[str, Any]]:
+    """Yield the projected items under `key` of every page, one page at a time."""
+    for page in pages:
+        for item in page.get(key, []) or []:
+            yield project(item, fields)
@@ -1,16 +1,38 @@
 """RDS analyzer
 
-Collects RDS DB instances and provides basic enrichment (instance class, engine,
-allocated storage) and a best-effort mapping from DB instance class to vCPU/memory
-using a small static mapping for common classes. If a class is unknown the
-vCPU/memory fields will be omitted (or zeroed) and the output will note limited
-support.
+Collects RDS DB instances and DB clusters with one paginated sweep each and
+joins them by cluster id. Instance classes resolve to vCPU/memory through the
+bundled class catalog in `rds_classes`, so the summary normally costs exactly
+the two listings. Classes missing from the catalog (new families) are resolved
+from the matching EC2 instance types with one batched DescribeInstanceTypes
+lookup; only classes that still do not resolve are reported as unmapped.
+Aurora instances share their cluster volume, so their nominal AllocatedStorage
+is left out of the storage total; members of a Multi-AZ DB cluster likewise
+leave their storage to the cluster, which reports it once. Serverless v2
+capacity is reported as the cluster's ACU range. If the cluster listing fails,
+the instances are still reported without the cluster join.
+
+DocumentDB and Neptune share the RDS API endpoint. Their instances and clusters
+are skipped while paging (NON_RDS_ENGINES), and the DocumentDB analyzer selects
+only its own with a server-side `docdb` filter, so nothing is double counted.
+Every other engine, including legacy `aurora` and engines added later, is
+reported.
+
+With include_details=True each instance also gets its connection count and
+each Aurora cluster its volume bytes (VolumeBytesUsed) from the shared batched
+CloudWatch metrics engine.
 """
 from __future__ import annotations
 
 from typing import Dict, List, Optional
 import logging
 
+from .aggregate import Aggregator
+from .instance_types import InstanceTypeLookup
+from .metrics import CloudWatchMetrics
+from .rds_classes import ec2_instance_type, resolve_db_class
+from .records import RDSInstanceRecord
+
 try:
     import boto3
 except Exception:  # pragma: no cover - tests will inject a fake boto3
@@ -18,36 +40,21 @@ except Exception:  # pragma: no cover - tests will inject a fake boto3
 
 logger = logging.getLogger(__name__)
 
-# Small static mapping for common RDS instance classes to vCPU/memory (MiB).
-# This is best-effort; not exhaustive. We also map DB instance class -> EC2
-# instance type (e.g. db.t3.micro -> t3.micro) and will call EC2
-# DescribeInstanceTypes to obtain authoritative vCPU/memory when possible.
-STATIC_RDS_CLASS_MAP: Dict[str, Dict[str, int]] = {
-    # family t3 (examples)
-    "db.t3.micro": {"vCPU": 2, "memory_mib": 1024},
-    "db.t3.small": {"vCPU": 2, "memory_mib": 2048},
-    "db.t3.medium": {"vCPU": 2, "memory_mib": 4096},
-    # common general purpose
-    "db.m5.large": {"vCPU": 2, "memory_mib": 8192},
-    "db.m5.xlarge": {"vCPU": 4, "memory_mib": 16384},
-}
-
-# Best-effort DB class -> EC2 instance type mapping. Many RDS classes map to
-# the same-named EC2 instance type without the 'db.' prefix, but some mappings
-# are more complex and can be added here.
-DBCLASS_TO_EC2: Dict[str, str] = {
-    "db.t3.micro": "t3.micro",
-    "db.t3.small": "t3.small",
-    "db.t3.medium": "t3.medium",
-    "db.m5.large": "m5.large",
-    "db.m5.xlarge": "m5.xlarge",
-}
+# engines served by the RDS endpoint that belong to other analyzers. The RDS
+# `engine` filter can only select engines, so they are dropped client-side
+# rather than by an allowlist that would silently hide new or legacy engines.
+NON_RDS_ENGINES = ("docdb", "neptune")
+
+
+def _is_aurora(engine: Optional[str]) -> bool:
+    return bool(engine) and engine.startswith("aurora")
 
 
 class RDSAnalyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None, collect_utilization: bool = True):
         self.profile = profile
         self.region_name = region_name
+        self.collect_utilization = collect_utilization
         if boto3 is None:
             raise RuntimeError("boto3 is required for RDSAnalyzer")
         if profile:
@@ -56,133 +63,159 @@ class RDSAnalyzer:
             self.session = boto3.Session()
         self.client = self.session.client("rds", region_name=region_name)
 
+    def _clusters(self) -> List[Dict]:
+        clusters: List[Dict] = []
+        try:
+            for page in self.client.get_paginator("describe_db_clusters").paginate():
+                for c in page.get("DBClusters", []) or []:
+                    if c.get("Engine") in NON_RDS_ENGINES:
+                        continue
+                    v2 = c.get("ServerlessV2ScalingConfiguration") or {}
+                    v1 = c.get("ScalingConfigurationInfo") or {}
+                    acu = None
+                    if v2:
+                        acu = {"min": v2.get("MinCapacity"), "max": v2.get("MaxCapacity")}
+                    elif c.get("EngineMode") == "serverless" and v1:
+                        acu = {"min": v1.get("MinCapacity"), "max": v1.get("MaxCapacity")}
+                    clusters.append({
+                        "id": c.get("DBClusterIdentifier"),
+                        "engine": c.get("Engine"),
+                        "engine_mode": c.get("EngineMode"),
+                        "status": c.get("Status"),
+                        "multi_az": c.get("MultiAZ"),
+                        # Aurora reports a placeholder; Multi-AZ DB clusters report real storage
+                        "allocated_storage_gib": 0 if _is_aurora(c.get("Engine")) else c.get("AllocatedStorage") or 0,
+                        "storage_type": c.get("StorageType"),
+                        "acu_range": acu,
+                        "members": [m.get("DBInstanceIdentifier") for m in c.get("DBClusterMembers") or []],
+                    })
+        except Exception:
+            # report no clusters rather than a partial listing
+            logger.debug("Failed to list DB clusters", exc_info=True)
+            return []
+        return clusters
+
+    def _resolve_unmapped(self, specs: Dict[str, Optional[Dict[str, object]]]) -> List[str]:
+        """Fill catalog misses from EC2 DescribeInstanceTypes; return the classes left unmapped."""
+        by_type = {ec2_instance_type(c): c for c, spec in specs.items() if spec is None and ec2_instance_type(c)}
+        if by_type:
+            try:
+                resolved = InstanceTypeLookup(self.session, self.region_name).resolve(by_type)
+            except Exception:
+                logger.debug("Failed to resolve DB classes %s via EC2", sorted(by_type.values()), exc_info=True)
+                resolved = {}
+            for itype, info in resolved.items():
+                specs[by_type[itype]] = {"vCPU": info["vCPU"], "memory_mib": info["memory_mib"], "serverless": False}
+        return [c for c, spec in specs.items() if spec is None]
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
-        """Collect DB instances and return structured info and summary aggregates.
+        """Collect DB instances and clusters and return structured info and summary aggregates.
 
         Output shape (example):
         {
             "instances": [
                 {"id": "db-1", "class": "db.t3.medium", "engine": "postgres", "allocated_storage_gib": 20, "vCPU": 2, "memory_mib": 4096}
             ],
+            "clusters": [
+                {"id": "aurora-1", "engine": "aurora-postgresql", "acu_range": {"min": 0.5, "max": 8}, "members": ["aurora-1-a"]}
+            ],
             "summary": {"total_instances": 1, "total_allocated_storage_gib": 20, "total_vCPU": 2, "total_memory_mib": 4096}
         }
         """
-        paginator = self.client.get_paginator("describe_db_instances")
+        clusters = self._clusters()
+        cluster_by_id = {c["id"]: c for c in clusters}
 
-        instances: List[Dict] = []
-        total_allocated_storage = 0
-        total_vcpu = 0
-        total_memory = 0
-        per_engine: Dict[str, int] = {}
-        per_class: Dict[str, int] = {}
+        instances: List[RDSInstanceRecord] = []
+        agg = Aggregator(keys=("engine", "class", "serverless"), measures=("allocated_storage_gib", "vCPU", "memory_mib"))
+        specs: Dict[str, Optional[Dict[str, object]]] = {}
 
-        for page in paginator.paginate():
+        for page in self.client.get_paginator("describe_db_instances").paginate():
             for db in page.get("DBInstances", []):
-                identifier = db.get("DBInstanceIdentifier")
                 clazz = db.get("DBInstanceClass")
                 engine = db.get("Engine")
-                status = db.get("DBInstanceStatus")
-                multi_az = db.get("MultiAZ")
-                allocated = db.get("AllocatedStorage") or 0
-                endpoint = (db.get("Endpoint") or {}).get("Address")
-
-                spec = STATIC_RDS_CLASS_MAP.get(clazz, {})
-                v = spec.get("vCPU") or 0
-                m = spec.get("memory_mib") or 0
-
-                instances.append({
-                    "id": identifier,
+                if engine in NON_RDS_ENGINES:
+                    continue
+                if clazz not in specs:
+                    specs[clazz] = resolve_db_class(clazz)
+                # Aurora instances report a nominal AllocatedStorage and Multi-AZ DB cluster
+                # members repeat the cluster's; either way the volume is counted on the cluster
+                cluster_id = db.get("DBClusterIdentifier")
+                in_cluster = _is_aurora(engine) or cluster_id in cluster_by_id
+                allocated = 0 if in_cluster else db.get("AllocatedStorage") or 0
+                instances.append(RDSInstanceRecord(**{
+                    "id": db.get("DBInstanceIdentifier"),
                     "class": clazz,
                     "engine": engine,
-                    "status": status,
-                    "multi_az": multi_az,
+                    "status": db.get("DBInstanceStatus"),
+                    "multi_az": db.get("MultiAZ"),
                     "allocated_storage_gib": allocated,
-                    "endpoint": endpoint,
-                    "vCPU": v,
-                    "memory_mib": m,
-                    "mapping_supported": bool(spec),
-                })
-
-                total_allocated_storage += allocated
-                total_vcpu += v
-                total_memory += m
-
-                if engine:
-                    per_engine[engine] = per_engine.get(engine, 0) + 1
-                if clazz:
-                    per_class[clazz] = per_class.get(clazz, 0) + 1
-
-        # Try to enrich vCPU/memory using EC2 DescribeInstanceTypes when we can
-        # map DB classes to EC2 instance types.
-        db_classes = list(per_class.keys())
-        ec2_types_needed = set()
-        db_to_ec2: Dict[str, str] = {}
-        for c in db_classes:
-            ec2_t = DBCLASS_TO_EC2.get(c)
-            if not ec2_t:
-                # fallback: strip leading 'db.' if present
-                if c.startswith("db."):
-                    ec2_t = c[3:]
-            if ec2_t:
-                db_to_ec2[c] = ec2_t
-                ec2_types_needed.add(ec2_t)
-
-        type_specs: Dict[str, Dict[str, int]] = {}
-        if ec2_types_needed:
-            # call EC2 DescribeInstanceTypes to get authoritative specs
-            ec2_client = self.session.client("ec2", region_name=self.region_name)
-            itypes_list = list(ec2_types_needed)
-            for i in range(0, len(itypes_list), 100):
-                chunk = itypes_list[i : i + 100]
-                try:
-                    resp = ec2_client.describe_instance_types(InstanceTypes=chunk)
-                    for it in resp.get("InstanceTypes", []):
-                        name = it.get("InstanceType")
-                        vcpu = it.get("VCpuInfo", {}).get("DefaultVCpus") or 0
-                        mem_mib = it.get("MemoryInfo", {}).get("SizeInMiB") or 0
-                        type_specs[name] = {"vCPU": vcpu, "memory_mib": mem_mib}
-                except Exception:
-                    logger.exception("Failed to describe EC2 instance types for %s", chunk)
-
-        # Now rebuild instances list to set vCPU/memory using EC2 type mapping when
-        # available; otherwise fall back to STATIC_RDS_CLASS_MAP.
-        enriched_instances: List[Dict] = []
-        total_allocated_storage = 0
-        total_vcpu = 0
-        total_memory = 0
+                    "endpoint": (db.get("Endpoint") or {}).get("Address"),
+                    "cluster_id": cluster_id,
+                }))
+
+        unknown_classes = self._resolve_unmapped(specs)
+
         for inst in instances:
-            clazz = inst.get("class")
-            v = 0
-            m = 0
-            mapped_ec2 = db_to_ec2.get(clazz)
-            if mapped_ec2 and mapped_ec2 in type_specs:
-                spec = type_specs[mapped_ec2]
-                v = spec.get("vCPU", 0)
-                m = spec.get("memory_mib", 0)
-            else:
-                spec = STATIC_RDS_CLASS_MAP.get(clazz, {})
-                v = spec.get("vCPU", 0)
-                m = spec.get("memory_mib", 0)
-
-            enriched = {**inst, "vCPU": v, "memory_mib": m, "ec2_instance_type": mapped_ec2}
-            enriched_instances.append(enriched)
-
-            total_allocated_storage += inst.get("allocated_storage_gib", 0)
-            total_vcpu += v
-            total_memory += m
-
-        result: Dict[str, object] = {
-            "summary": {
-                "total_instances": len(enriched_instances),
-                "total_allocated_storage_gib": total_allocated_storage,
-                "total_vCPU": total_vcpu,
-                "total_memory_mib": total_memory,
-                "by_engine": per_engine,
-                "by_class": per_class,
-            },
+            spec = specs[inst.get("class")]
+            mapped = spec is not None
+            if not mapped:
+                spec = {"vCPU": 0, "memory_mib": 0, "serverless": False}
+            inst.vCPU = spec["vCPU"]
+            inst.memory_mib = spec["memory_mib"]
+            inst.ec2_instance_type = ec2_instance_type(inst.get("class"))
+            inst.mapping_supported = mapped
+            if spec["serverless"]:
+                cluster = cluster_by_id.get(inst.cluster_id) if inst.cluster_id else None
+                inst.acu_range = cluster["acu_range"] if cluster else None
+            agg.add(inst.engine, inst.get("class"), spec["serverless"], inst.allocated_storage_gib, spec["vCPU"], spec["memory_mib"])
+
+        total = agg.total()
+        total_allocated_storage = total["allocated_storage_gib"]
+
+        clusters_by_engine: Dict[str, int] = {}
+        acu_min = 0.0
+        acu_max = 0.0
+        for c in clusters:
+            if c["engine"]:
+                clusters_by_engine[c["engine"]] = clusters_by_engine.get(c["engine"], 0) + 1
+            total_allocated_storage += c["allocated_storage_gib"]
+            if c["acu_range"]:
+                acu_min += c["acu_range"]["min"] or 0
+                acu_max += c["acu_range"]["max"] or 0
+
+        summary: Dict[str, object] = {
+            "total_instances": len(instances),
+            "total_allocated_storage_gib": total_allocated_storage,
+            "total_vCPU": total["vCPU"],
+            "total_memory_mib": total["memory_mib"],
+            "by_engine": {e: g["count"] for e, g in agg.rollup("engine").items() if e},
+            "by_class": {c: g["count"] for c, g in agg.rollup("class").items() if c},
+            "total_clusters": len(clusters),
+            "clusters_by_engine": clusters_by_engine,
+            "serverless_instances": agg.rollup("serverless").get(True, {"count": 0})["count"],
+            "serverless_clusters": sum(1 for c in clusters if c["acu_range"]),
+            "total_acu_range": {"min": acu_min, "max": acu_max},
         }
+        if unknown_classes:
+            summary["unmapped_classes"] = sorted(c for c in unknown_classes if c)
+        result: Dict[str, object] = {"summary": summary}
 
         if include_details:
-            result["instances"] = enriched_instances
+            if self.collect_utilization:
+                metrics = CloudWatchMetrics(self.session, self.region_name)
+                for inst in instances:
+                    metrics.add(inst.id, "AWS/RDS", "DatabaseConnections", {"DBInstanceIdentifier": inst.id}, label="database_connections")
+                for c in clusters:
+                    if _is_aurora(c["engine"]):
+                        metrics.add(f"cluster/{c['id']}", "AWS/RDS", "VolumeBytesUsed", {"DBClusterIdentifier": c["id"]}, label="volume_bytes_used")
+                usage = metrics.fetch() if len(metrics) else {}
+                for inst in instances:
+                    inst.utilization = usage.get(inst.id, {})
+                for c in clusters:
+                    volume = usage.get(f"cluster/{c['id']}", {}).get("volume_bytes_used")
+                    if volume:
+                        c["volume_bytes_used"] = int(volume["latest"])
+            result["instances"] = [inst.to_dict() for inst in instances]
+            result["clusters"] = clusters
 
         return result
@@ -0,0 +1,144 @@
+"""Bundled RDS DB instance class catalog
+
+Resolves DB instance class names (e.g. db.r6g.2xlarge, db.x2g.large,
+db.r5.4xlarge.tpc2.mem4x, db.serverless) to vCPU and memory without any API
+call. Within a family, RDS sizes follow the EC2 ladder (medium = 1 vCPU,
+large = 2, xlarge = 4, Nxlarge = 4N) and memory is a fixed multiple of the vCPU
+count, so the catalog stores one memory-per-vCPU ratio per family plus explicit
+entries for burstable and legacy sizes that break that rule.
+
+Classes the catalog does not know (new families) resolve to None; the RDS
+analyzer then looks the matching EC2 instance types up in one batch.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+import re
+
+SERVERLESS_CLASS = "db.serverless"
+
+# classes whose size does not follow the family ratio: class -> (vCPU, memory MiB)
+EXPLICIT_CLASSES: Dict[str, Tuple[int, int]] = {
+    "db.t2.micro": (1, 1024),
+    "db.t2.small": (1, 2048),
+    "db.t2.medium": (2, 4096),
+    "db.t2.large": (2, 8192),
+    "db.t2.xlarge": (4, 16384),
+    "db.t2.2xlarge": (8, 32768),
+    "db.t3.micro": (2, 1024),
+    "db.t3.small": (2, 2048),
+    "db.t3.medium": (2, 4096),
+    "db.t3.large": (2, 8192),
+    "db.t3.xlarge": (4, 16384),
+    "db.t3.2xlarge": (8, 32768),
+    "db.t4g.micro": (2, 1024),
+    "db.t4g.small": (2, 2048),
+    "db.t4g.medium": (2, 4096),
+    "db.t4g.large": (2, 8192),
+    "db.t4g.xlarge": (4, 16384),
+    "db.t4g.2xlarge": (8, 32768),
+    "db.m1.small": (1, 1740),
+    "db.m1.medium": (1, 3840),
+    "db.m1.large": (2, 7680),
+    "db.m1.xlarge": (4, 15360),
+    "db.m2.xlarge": (2, 17510),
+    "db.m2.2xlarge": (4, 35020),
+    "db.m2.4xlarge": (8, 70041),
+    "db.m3.medium": (1, 3840),
+}
+
+# family -> memory MiB per vCPU for sizes on the regular ladder
+FAMILY_MIB_PER_VCPU: Dict[str, int] = {
+    # general purpose
+    "m3": 3840,
+    "m4": 4096,
+    "m5": 4096,
+    "m5d": 4096,
+    "m6g": 4096,
+    "m6gd": 4096,
+    "m6i": 4096,
+    "m6id": 4096,
+    "m6in": 4096,
+    "m6idn": 4096,
+    "m7g": 4096,
+    "m7i": 4096,
+    "m8g": 4096,
+    # compute optimized (Multi-AZ DB clusters)
+    "c6gd": 2048,
+    # memory optimized
+    "r3": 7808,
+    "r4": 7808,
+    "r5": 8192,
+    "r5b": 8192,
+    "r5d": 8192,
+    "r6g": 8192,
+    "r6gd": 8192,
+    "r6i": 8192,
+    "r6id": 8192,
+    "r6in": 8192,
+    "r6idn": 8192,
+    "r7g": 8192,
+    "r7i": 8192,
+    "r8g": 8192,
+    "z1d": 8192,
+    "x1": 15616,
+    "x2g": 16384,
+    "x2idn": 16384,
+    "x1e": 31232,
+    "x2iedn": 32768,
+    "x2iezn": 32768,
+}
+
+# db.<family>.<size>[.tpc<threads per core>.mem<multiplier>x]
+_CLASS_RE = re.compile(r"^db\.(?P<family>[a-z0-9-]+)\.(?P<size>medium|\d*x?large)(?:\.tpc(?P<tpc>\d)\.mem(?P<mem>\d+)x)?$")
+
+
+def _ladder_vcpu(size: str) -> Optional[int]:
+    if size == "medium":
+        return 1
+    if size == "large":
+        return 2
+    if size == "xlarge":
+        return 4
+    if size.endswith("xlarge") and size[: -len("xlarge")].isdigit():
+        return 4 * int(size[: -len("xlarge")])
+    return None
+
+
+def resolve_db_class(db_class: Optional[str]) -> Optional[Dict[str, object]]:
+    """Return {"vCPU", "memory_mib", "serverless"} for a DB instance class.
+
+    Aurora Serverless v2 instances (db.serverless) resolve to zero vCPU/memory
+    with serverless=True; their capacity is the cluster's ACU range. Returns
+    None for names that are not DB instance classes.
+    """
+    if not db_class:
+        return None
+    if db_class == SERVERLESS_CLASS:
+        return {"vCPU": 0, "memory_mib": 0, "serverless": True}
+    if db_class in EXPLICIT_CLASSES:
+        vcpu, mem = EXPLICIT_CLASSES[db_class]
+        return {"vCPU": vcpu, "memory_mib": mem, "serverless": False}
+    match = _CLASS_RE.match(db_class)
+    if not match or match.group("family") not in FAMILY_MIB_PER_VCPU:
+        return None
+    vcpu = _ladder_vcpu(match.group("size"))
+    if vcpu is None:
+        return None
+    mem = vcpu * FAMILY_MIB_PER_VCPU[match.group("family")]
+    if match.group("tpc"):
+        # Oracle optimized-CPU classes: threads per core scales vCPU, memN multiplies memory
+        mem *= int(match.group("mem"))
+        vcpu = vcpu * int(match.group("tpc")) // 2
+    return {"vCPU": vcpu, "memory_mib": mem, "serverless": False}
+
+
+def ec2_instance_type(db_class: Optional[str]) -> Optional[str]:
+    """Return the EC2 instance type behind a plain DB instance class (db.r8gd.xlarge -> r8gd.xlarge).
+
+    Optimized-CPU (tpcN.memNx) and serverless classes have no EC2 equivalent.
+    """
+    if not db_class or not db_class.startswith("db.") or db_class == SERVERLESS_CLASS:
+        return None
+    parts = db_class[len("db."):].split(".")
+    return ".".join(parts) if len(parts) == 2 else None
@@ -0,0 +1,98 @@
+"""Compact per-resource records shared by analyzers
+
+The EC2, RDS and Lambda analyzers keep their per-resource entries (instances,
+DB instances, functions) as `Record` subclasses instead of dicts; these are the
+analyzers that used to copy each dict while enriching it and that reach
+100k-resource scale. Other analyzers build each detail dict once and keep plain
+dicts. A record stores its fields in `__slots__`, so there is no per-instance
+dict and no repeated key strings; categorical fields listed in `_interned`
+(instance type, state, engine, runtime, ...) are interned when passed to the
+constructor, so thousands of records share one string object per distinct
+value. Unique per-resource strings (ids, names, handlers) are not interned.
+Records carry no region: an analyzer covers one region per run.
+
+Records are filled once and enriched in place (`rec.vCPU = 2`) rather than
+copied into new dicts. `to_dict()` produces the plain dict for the analyzer's
+result at serialization time; optional fields that were never set are left out,
+matching the previous dict shapes.
+"""
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict, Tuple
+
+
+def intern(value: Any) -> Any:
+    """Intern strings; pass everything else through unchanged."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Record:
+    """Base for slotted resource records.
+
+    Subclasses declare `__slots__` (the field order of `to_dict()`) and
+    optionally `_interned`, the subset of fields whose values are interned.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+    _interned: Tuple[str, ...] = ()
+
+    def __init__(self, **values: Any):
+        interned = self._interned
+        for name, value in values.items():
+            setattr(self, name, intern(value) if name in interned else value)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return getattr(self, name, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for name in self.__slots__:
+            try:
+                out[name] = getattr(self, name)
+            except AttributeError:
+                continue
+        return out
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"{type(self).__name__}({fields})"
+
+
+class EC2InstanceRecord(Record):
+    __slots__ = ("instance_id", "type", "state", "lifecycle", "architecture", "vCPU", "memory_mib", "utilization")
+    _interned = ("type", "state", "lifecycle", "architecture")
+
+
+class RDSInstanceRecord(Record):
+    __slots__ = (
+        "id",
+        "class",
+        "engine",
+        "status",
+        "multi_az",
+        "allocated_storage_gib",
+        "endpoint",
+        "vCPU",
+        "memory_mib",
+        "ec2_instance_type",
+        "mapping_supported",
+        "cluster_id",
+        "acu_range",
+        "utilization",
+    )
+    _interned = ("class", "engine", "status")
+
+
+class LambdaFunctionRecord(Record):
+    __slots__ = (
+        "name",
+        "memory_mb",
+        "runtime",
+        "handler",
+        "invocations",
+        "errors",
+        "duration_p95_ms",
+        "gb_seconds",
+    )
+    _interned = ("runtime",)
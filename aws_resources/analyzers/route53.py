@@ -1,12 +1,23 @@
 """Route53 analyzer
 
 Summarizes hosted zones and optionally returns basic zone info.
+
+Hosted zones are paginated and record volume is taken from the
+ResourceRecordSetCount already present in the listing, so record counts need no
+extra calls. The summary also reports the top-N largest zones and the health
+check count. With deep_scan=True, ListResourceRecordSets runs per zone and
+streams records into per-type counters without retaining them. Route 53 allows
+five requests per second per account, so at most MAX_DEEP_SCAN_WORKERS zones
+are listed at once and throttled listings are retried; zones that still fail
+are reported in `failed_zones` and left out of the per-type totals.
 """
 from __future__ import annotations
 
 from typing import Dict, List, Optional
 import logging
 
+from .batching import bounded_map, call_with_retries
+
 try:
     import boto3
 except Exception:
@@ -14,11 +25,24 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# Route 53 API calls are limited to 5 requests per second per account
+MAX_DEEP_SCAN_WORKERS = 4
+
 
 class Route53Analyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(
+        self,
+        profile: Optional[str] = None,
+        region_name: Optional[str] = None,
+        deep_scan: bool = False,
+        top_n: int = 10,
+        max_workers: int = MAX_DEEP_SCAN_WORKERS,
+    ):
         # Route53 is global; region_name unused
         self.profile = profile
+        self.deep_scan = deep_scan
+        self.top_n = top_n
+        self.max_workers = min(max_workers, MAX_DEEP_SCAN_WORKERS)
         if boto3 is None:
             raise RuntimeError("boto3 is required for Route53Analyzer")
         if profile:
@@ -27,23 +51,83 @@ class Route53Analyzer:
             self.session = boto3.Session()
         self.client = self.session.client("route53")
 
+    def _count_records(self, zone_id: str) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for page in self.client.get_paginator("list_resource_record_sets").paginate(HostedZoneId=zone_id):
+            for r in page.get("ResourceRecordSets", []) or []:
+                t = r.get("Type") or "unknown"
+                counts[t] = counts.get(t, 0) + 1
+        return counts
+
+    def _records_by_type(self, zone_id: str) -> Optional[Dict[str, int]]:
+        # a retry restarts the zone's listing, so its counts are never doubled
+        try:
+            return call_with_retries(lambda: self._count_records(zone_id))
+        except Exception:
+            logger.debug("Failed to list record sets for %s", zone_id, exc_info=True)
+            return None
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
-        resp = self.client.list_hosted_zones()
-        zones = resp.get("HostedZones", [])
+        zones: List[Dict] = []
+        for page in self.client.get_paginator("list_hosted_zones").paginate():
+            zones.extend(page.get("HostedZones", []) or [])
+
         total = len(zones)
         private_count = sum(1 for z in zones if z.get("Config", {}).get("PrivateZone") is True)
         public_count = total - private_count
-        result = {
-            "summary": {
-                "total_hosted_zones": total,
-                "by_type": {"public": public_count, "private": private_count},
-            }
+
+        records_by_zone_type = {"public": 0, "private": 0}
+        for z in zones:
+            kind = "private" if z.get("Config", {}).get("PrivateZone") is True else "public"
+            records_by_zone_type[kind] += z.get("ResourceRecordSetCount") or 0
+
+        largest = sorted(zones, key=lambda z: z.get("ResourceRecordSetCount") or 0, reverse=True)[: self.top_n]
+
+        try:
+            health_checks = self.client.get_health_check_count().get("HealthCheckCount")
+        except Exception:
+            logger.debug("Failed to count health checks", exc_info=True)
+            health_checks = None
+
+        summary: Dict[str, object] = {
+            "total_hosted_zones": total,
+            "by_type": {"public": public_count, "private": private_count},
+            "total_record_sets": records_by_zone_type["public"] + records_by_zone_type["private"],
+            "record_sets_by_zone_type": records_by_zone_type,
+            "largest_zones": [
+                {"id": z.get("Id"), "name": z.get("Name"), "record_set_count": z.get("ResourceRecordSetCount") or 0}
+                for z in largest
+            ],
+            "total_health_checks": health_checks,
         }
+        result = {"summary": summary}
+
+        per_zone_types: List[Optional[Dict[str, int]]] = []
+        if self.deep_scan and zones:
+            per_zone_types = bounded_map(self._records_by_type, [z.get("Id") for z in zones], self.max_workers)
+            by_record_type: Dict[str, int] = {}
+            failed_zones: List[str] = []
+            for z, counts in zip(zones, per_zone_types):
+                if counts is None:
+                    failed_zones.append(z.get("Id"))
+                    continue
+                for t, n in counts.items():
+                    by_record_type[t] = by_record_type.get(t, 0) + n
+            summary["record_sets_by_type"] = by_record_type
+            summary["failed_zones"] = failed_zones
 
         if include_details:
             out = []
-            for z in zones:
-                out.append({"id": z.get("Id"), "name": z.get("Name"), "private": z.get("Config", {}).get("PrivateZone")})
+            for idx, z in enumerate(zones):
+                entry = {
+                    "id": z.get("Id"),
+                    "name": z.get("Name"),
+                    "private": z.get("Config", {}).get("PrivateZone"),
+                    "record_set_count": z.get("ResourceRecordSetCount"),
+                }
+                if per_zone_types:
+                    entry["record_sets_by_type"] = per_zone_types[idx]
+                out.append(entry)
             result["hosted_zones"] = out
 
         return result
@@ -3,14 +3,45 @@
 Provides a lightweight inventory of S3 buckets. By default returns a summary
 with total bucket count. When include_details=True the analyzer returns a
 list of buckets with basic metadata (name, creation_date, region). We do not
-attempt to list objects or compute bucket sizes here because that can be
-expensive; instead we note that size/object counts are not collected and point
-to CloudWatch / S3 Inventory for authoritative metrics.
+list objects to compute bucket sizes because that can be expensive; instead
+sizes (per storage type) and object counts come from the daily CloudWatch
+storage metrics. Per bucket region, one ListMetrics sweep discovers which
+bucket/storage-type series exist and the shared `CloudWatchMetrics` engine
+reads them in GetMetricData batches of 500 queries, so thousands of buckets
+cost tens of calls rather than thousands.
+
+Bucket regions come from the `BucketRegion` field of paginated ListBuckets
+responses when the API provides it. Otherwise they are read from a persistent
+cache (a bucket's region never changes; one file per account, keyed by the
+listing's canonical owner id) and only unseen buckets are resolved with
+GetBucketLocation, concurrently on a bounded pool.
+
+For prefix-level detail, point `inventory_dir` (or the
+`AWS_RESOURCES_S3_INVENTORY_DIR` environment variable) at a local copy of S3
+Inventory reports; the aggregates from `S3InventoryCollector` are merged into
+the bucket details and fill size/object counts where CloudWatch has none; their
+storage classes are mapped onto the CloudWatch storage types so the summary
+breakdown still adds up to the total size.
+
+As a last resort, `deep_scan=True` lists the objects of buckets that have
+neither metrics nor inventory. Top-level prefixes are discovered with a
+delimited ListObjectsV2 call and then listed concurrently; only running
+totals are kept. Each bucket has an object and time budget; when it runs out
+the scan stops and the totals are extrapolated from the completed prefixes.
 """
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
 import logging
+import os
+import threading
+import time
+
+from ..cache import JsonFileCache
+from ..collectors.s3_inventory import S3InventoryCollector
+from .batching import DEFAULT_MAX_WORKERS, bounded_map
+from .metrics import CloudWatchMetrics
 
 try:
     import boto3
@@ -19,11 +50,57 @@ except Exception:  # pragma: no cover - tests inject a fake boto3
 
 logger = logging.getLogger(__name__)
 
+# S3 storage metrics are published once a day; look back far enough to find the latest
+METRICS_LOOKBACK = timedelta(days=3)
+# S3 Inventory storage classes -> CloudWatch StorageType names, so inventory
+# bytes fold into the same per-storage-type breakdown. Classes without a
+# one-to-one StorageType (INTELLIGENT_TIERING reports its tier in a separate
+# column) keep their inventory name.
+INVENTORY_STORAGE_TYPES = {
+    "STANDARD": "StandardStorage",
+    "REDUCED_REDUNDANCY": "ReducedRedundancyStorage",
+    "STANDARD_IA": "StandardIAStorage",
+    "ONEZONE_IA": "OneZoneIAStorage",
+    "GLACIER_IR": "GlacierInstantRetrievalStorage",
+    "GLACIER": "GlacierStorage",
+    "DEEP_ARCHIVE": "DeepArchiveStorage",
+    "EXPRESS_ONEZONE": "ExpressOneZone",
+}
+# deep scans only count bytes, so their share of the breakdown has no class
+UNCLASSIFIED_STORAGE_TYPE = "Unclassified"
+# per-bucket budget for deep scans
+DEFAULT_SCAN_MAX_OBJECTS = 1_000_000
+DEFAULT_SCAN_MAX_SECONDS = 60.0
+# ListBuckets only reports BucketRegion when the request carries MaxBuckets,
+# and accounts with a bucket quota above 10k must paginate
+LIST_BUCKETS_PAGE_SIZE = 10000
+# legacy GetBucketLocation constraints that are not region names
+LEGACY_LOCATION_CONSTRAINTS = {"EU": "eu-west-1"}
+
 
 class S3Analyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(
+        self,
+        profile: Optional[str] = None,
+        region_name: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        cache_dir: Optional[str] = None,
+        collect_metrics: bool = True,
+        inventory_dir: Optional[str] = None,
+        deep_scan: bool = False,
+        scan_max_objects: int = DEFAULT_SCAN_MAX_OBJECTS,
+        scan_max_seconds: float = DEFAULT_SCAN_MAX_SECONDS,
+    ):
         self.profile = profile
         self.region_name = region_name
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+        self.collect_metrics = collect_metrics
+        self.inventory_dir = inventory_dir or os.environ.get("AWS_RESOURCES_S3_INVENTORY_DIR")
+        self.deep_scan = deep_scan
+        self.scan_max_objects = scan_max_objects
+        self.scan_max_seconds = scan_max_seconds
+        self._regional_clients: Dict[str, object] = {}
         if boto3 is None:
             raise RuntimeError("boto3 is required for S3Analyzer")
         if profile:
@@ -32,36 +109,278 @@ class S3Analyzer:
             self.session = boto3.Session()
         self.client = self.session.client("s3", region_name=region_name)
 
+    def _list_buckets(self) -> Tuple[List[Dict], Optional[str]]:
+        """Return the buckets and the account's canonical owner id (if reported)."""
+        try:
+            paginator = self.client.get_paginator("list_buckets")
+        except Exception:
+            # older botocore releases cannot paginate ListBuckets
+            resp = self.client.list_buckets()
+            return resp.get("Buckets", []), (resp.get("Owner") or {}).get("ID")
+        buckets: List[Dict] = []
+        owner_id = None
+        for page in paginator.paginate(PaginationConfig={"PageSize": LIST_BUCKETS_PAGE_SIZE}):
+            buckets.extend(page.get("Buckets", []) or [])
+            owner_id = owner_id or (page.get("Owner") or {}).get("ID")
+        return buckets, owner_id
+
+    def _bucket_location(self, name: str) -> Optional[str]:
+        try:
+            loc = self.client.get_bucket_location(Bucket=name)
+        except Exception:
+            logger.debug("Failed to get location for bucket %s", name, exc_info=True)
+            return None
+        # LocationConstraint is None for us-east-1 and "EU" for old eu-west-1 buckets
+        constraint = loc.get("LocationConstraint") or "us-east-1"
+        return LEGACY_LOCATION_CONSTRAINTS.get(constraint, constraint)
+
+    def _resolve_regions(self, buckets: List[Dict], owner_id: Optional[str] = None) -> Dict[str, Optional[str]]:
+        """Map bucket name -> region using the listing, the cache, then the API."""
+        # one cache file per account, so pruning never drops other accounts' buckets
+        name = f"s3-bucket-regions-{owner_id}" if owner_id else "s3-bucket-regions"
+        cache = JsonFileCache(name, directory=self.cache_dir)
+        regions: Dict[str, Optional[str]] = {}
+        unresolved: List[str] = []
+        for b in buckets:
+            name = b.get("Name")
+            created = str(b.get("CreationDate"))
+            cached = cache.get(name)
+            if b.get("BucketRegion"):
+                regions[name] = b["BucketRegion"]
+            elif cached and cached.get("creation_date") == created:
+                # a bucket deleted and re-created elsewhere gets a new creation date
+                region = cached.get("region")
+                # caches written before the "EU" mapping may still hold the legacy value
+                regions[name] = LEGACY_LOCATION_CONSTRAINTS.get(region, region)
+            else:
+                unresolved.append(name)
+
+        for name, region in zip(unresolved, bounded_map(self._bucket_location, unresolved, self.max_workers)):
+            regions[name] = region
+
+        for b in buckets:
+            name = b.get("Name")
+            if regions.get(name):
+                cache.set(name, {"region": regions[name], "creation_date": str(b.get("CreationDate"))})
+        if owner_id:
+            # the listing is complete for this account's file
+            cache.retain(b.get("Name") for b in buckets)
+        cache.save()
+        return regions
+
+    def _discover_series(self, metrics: CloudWatchMetrics, region: str, names: List[str]) -> None:
+        """Queue the (bucket, storage type) series that exist in one region."""
+        wanted = set(names)
+        for page in metrics.client(region).get_paginator("list_metrics").paginate(Namespace="AWS/S3"):
+            for m in page.get("Metrics", []) or []:
+                metric = m.get("MetricName")
+                if metric not in ("BucketSizeBytes", "NumberOfObjects"):
+                    continue
+                dims = {d.get("Name"): d.get("Value") for d in m.get("Dimensions") or []}
+                if dims.get("BucketName") not in wanted:
+                    continue
+                label = f"size:{dims.get('StorageType')}" if metric == "BucketSizeBytes" else "objects"
+                metrics.add(dims["BucketName"], "AWS/S3", metric, m.get("Dimensions"), stat="Average", period=86400, label=label, region=region)
+
+    def _bucket_metrics(self, regions: Dict[str, Optional[str]]) -> Dict[str, Dict[str, object]]:
+        """Return bucket name -> {"size_by_storage_type": {...}, "object_count": n}."""
+        by_region: Dict[str, List[str]] = {}
+        for name, region in regions.items():
+            if region:
+                by_region.setdefault(region, []).append(name)
+
+        metrics = CloudWatchMetrics(self.session, max_workers=self.max_workers, lookback=METRICS_LOOKBACK)
+
+        def discover(region: str) -> None:
+            try:
+                self._discover_series(metrics, region, by_region[region])
+            except Exception:
+                logger.debug("Failed to list S3 metrics in %s", region, exc_info=True)
+
+        bounded_map(discover, sorted(by_region), self.max_workers)
+
+        out: Dict[str, Dict[str, object]] = {}
+        for name, series in metrics.fetch().items():
+            # storage metrics are daily; "latest" is the most recent datapoint
+            out[name] = {
+                "size_by_storage_type": {label[len("size:"):]: int(s["latest"]) for label, s in series.items() if label.startswith("size:")},
+                "object_count": int(series["objects"]["latest"]) if "objects" in series else None,
+            }
+        return out
+
+    def _inventory(self) -> Dict[str, Dict[str, object]]:
+        if not self.inventory_dir:
+            return {}
+        try:
+            return S3InventoryCollector(self.inventory_dir).collect()
+        except Exception:
+            logger.warning("Failed to read S3 Inventory reports from %s", self.inventory_dir, exc_info=True)
+            return {}
+
+    def _regional_client(self, region: Optional[str]):
+        if not region:
+            return self.client
+        if region not in self._regional_clients:
+            self._regional_clients[region] = self.session.client("s3", region_name=region)
+        return self._regional_clients[region]
+
+    def _scan_bucket(self, name: str, region: Optional[str]) -> Dict[str, object]:
+        """List a bucket's objects within the scan budget and return size totals."""
+        client = self._regional_client(region)
+        paginator = client.get_paginator("list_objects_v2")
+        deadline = time.monotonic() + self.scan_max_seconds
+        lock = threading.Lock()
+        scanned = {"objects": 0}
+        stop = threading.Event()
+
+        def consume(page: Dict) -> Tuple[int, int]:
+            contents = page.get("Contents", []) or []
+            size = sum(int(o.get("Size") or 0) for o in contents)
+            with lock:
+                scanned["objects"] += len(contents)
+                if scanned["objects"] >= self.scan_max_objects or time.monotonic() >= deadline:
+                    stop.set()
+            return len(contents), size
+
+        # top-level objects are counted here; CommonPrefixes become the shards
+        root_objects = root_bytes = 0
+        root_complete = True
+        prefixes: List[str] = []
+        for page in paginator.paginate(Bucket=name, Delimiter="/"):
+            n, size = consume(page)
+            root_objects += n
+            root_bytes += size
+            prefixes.extend(p.get("Prefix") for p in page.get("CommonPrefixes", []) or [])
+            if stop.is_set() and page.get("IsTruncated"):
+                root_complete = False
+                break
+
+        def scan_prefix(prefix: str) -> Dict[str, object]:
+            objects = size_bytes = 0
+            if stop.is_set():
+                return {"objects": 0, "bytes": 0, "complete": False}
+            try:
+                for page in paginator.paginate(Bucket=name, Prefix=prefix):
+                    n, size = consume(page)
+                    objects += n
+                    size_bytes += size
+                    if stop.is_set() and page.get("IsTruncated"):
+                        return {"objects": objects, "bytes": size_bytes, "complete": False}
+            except Exception:
+                logger.debug("Failed to list prefix %s in bucket %s", prefix, name, exc_info=True)
+                return {"objects": objects, "bytes": size_bytes, "complete": False}
+            return {"objects": objects, "bytes": size_bytes, "complete": True}
+
+        shards = bounded_map(scan_prefix, prefixes, self.max_workers)
+
+        object_count = root_objects + sum(s["objects"] for s in shards)
+        size_bytes = root_bytes + sum(s["bytes"] for s in shards)
+        done = [s for s in shards if s["complete"]]
+        complete = root_complete and len(done) == len(shards)
+        result: Dict[str, object] = {
+            "complete": complete,
+            "scanned_object_count": object_count,
+            "scanned_size_bytes": size_bytes,
+            "prefixes_total": len(prefixes),
+            "prefixes_completed": len(done),
+        }
+        if complete:
+            result["object_count"] = object_count
+            result["size_bytes"] = size_bytes
+        elif done and root_complete:
+            # unfinished prefixes are assumed to look like the average completed one
+            avg_objects = sum(s["objects"] for s in done) / len(done)
+            avg_bytes = sum(s["bytes"] for s in done) / len(done)
+            pending = [s for s in shards if not s["complete"]]
+            result["object_count"] = int(root_objects + sum(s["objects"] for s in done) + sum(max(s["objects"], avg_objects) for s in pending))
+            result["size_bytes"] = int(root_bytes + sum(s["bytes"] for s in done) + sum(max(s["bytes"], avg_bytes) for s in pending))
+            result["estimated"] = True
+        else:
+            # nothing to extrapolate from; report what was seen as a lower bound
+            result["object_count"] = object_count
+            result["size_bytes"] = size_bytes
+            result["lower_bound"] = True
+        return result
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
-        resp = self.client.list_buckets()
-        buckets = resp.get("Buckets", [])
+        buckets, owner_id = self._list_buckets()
 
         summary: Dict[str, object] = {"total_buckets": len(buckets)}
         result: Dict[str, object] = {"summary": summary}
 
         if include_details:
+            regions = self._resolve_regions(buckets, owner_id)
+            metrics = self._bucket_metrics(regions) if self.collect_metrics else {}
+            inventory = self._inventory()
+            by_region: Dict[str, int] = {}
+            by_storage_type: Dict[str, int] = {}
+            total_size = 0
+            total_objects = 0
+            deep_scanned = 0
+            inventory_failed_files = 0
             out: List[Dict] = []
             for b in buckets:
                 name = b.get("Name")
-                created = b.get("CreationDate")
-                region = None
-                try:
-                    loc = self.client.get_bucket_location(Bucket=name)
-                    # LocationConstraint is None for us-east-1 in older APIs
-                    region = loc.get("LocationConstraint") or "us-east-1"
-                except Exception:
-                    logger.debug("Failed to get location for bucket %s", name, exc_info=True)
-
-                out.append({
+                region = regions.get(name)
+                by_region[region or "unknown"] = by_region.get(region or "unknown", 0) + 1
+                m = metrics.get(name)
+                entry = {
                     "name": name,
-                    "creation_date": str(created),
+                    "creation_date": str(b.get("CreationDate")),
                     "region": region,
-                    # Not collected here to avoid expensive listing; leave None
                     "size_bytes": None,
                     "object_count": None,
-                    "note": "Size/object count not collected; use CloudWatch metrics or S3 Inventory for metrics.",
-                })
+                }
+                if m:
+                    sizes = m["size_by_storage_type"]
+                    entry["size_bytes"] = sum(sizes.values())
+                    entry["size_bytes_by_storage_type"] = sizes
+                    entry["object_count"] = m["object_count"]
+                    total_size += entry["size_bytes"]
+                    total_objects += m["object_count"] or 0
+                    for st, n in sizes.items():
+                        by_storage_type[st] = by_storage_type.get(st, 0) + n
+                inv = inventory.get(name)
+                if inv:
+                    entry["inventory"] = inv
+                    inventory_failed_files += inv.get("failed_files") or 0
+                    if not m:
+                        entry["size_bytes"] = inv["size_bytes"]
+                        entry["object_count"] = inv["object_count"]
+                        total_size += inv["size_bytes"]
+                        total_objects += inv["object_count"]
+                        for sc, totals in inv["by_storage_class"].items():
+                            st = INVENTORY_STORAGE_TYPES.get(sc, sc)
+                            by_storage_type[st] = by_storage_type.get(st, 0) + totals["size_bytes"]
+                scan = None
+                if not m and not inv and self.deep_scan:
+                    try:
+                        scan = self._scan_bucket(name, region)
+                    except Exception:
+                        logger.debug("Deep scan failed for bucket %s", name, exc_info=True)
+                    if scan:
+                        entry["deep_scan"] = scan
+                        entry["size_bytes"] = scan["size_bytes"]
+                        entry["object_count"] = scan["object_count"]
+                        total_size += scan["size_bytes"]
+                        total_objects += scan["object_count"]
+                        by_storage_type[UNCLASSIFIED_STORAGE_TYPE] = by_storage_type.get(UNCLASSIFIED_STORAGE_TYPE, 0) + scan["size_bytes"]
+                        deep_scanned += 1
+                if not m and not inv and not scan:
+                    entry["note"] = "No CloudWatch storage metrics found; use S3 Inventory for authoritative metrics."
+                out.append(entry)
 
+            summary["by_region"] = by_region
+            if self.inventory_dir:
+                summary["inventory_buckets"] = sum(1 for b in buckets if b.get("Name") in inventory)
+                # unreadable data files leave those buckets' inventory totals partial
+                summary["inventory_failed_files"] = inventory_failed_files
+            if self.deep_scan:
+                summary["deep_scanned_buckets"] = deep_scanned
+            if self.collect_metrics or self.inventory_dir or self.deep_scan:
+                summary["total_size_bytes"] = total_size
+                summary["total_object_count"] = total_objects
+                summary["size_bytes_by_storage_type"] = by_storage_type
             result["buckets"] = out
 
         return result
@@ -2,11 +2,20 @@
 
 Summarizes SES identities (email/domain) and optionally returns verification
 state for each identity when include_details=True.
+
+Identities are paginated per type. Verification and DKIM attributes are fetched
+in chunks of 100 identities (the API limit). Both APIs allow one request per
+second, so chunks run serially at that pace and throttled calls are retried. A
+chunk that still fails only loses the statuses of its own identities; the
+summary reports how many chunks failed.
 """
 from __future__ import annotations
 
 from typing import Dict, List, Optional
 import logging
+import time
+
+from .batching import call_with_retries, chunks
 
 try:
     import boto3
@@ -15,11 +24,17 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# GetIdentityVerificationAttributes / GetIdentityDkimAttributes accept at most 100 identities
+ATTRIBUTES_BATCH_SIZE = 100
+# ... and allow 1 request per second each, so chunks are paced this far apart
+ATTRIBUTES_REQUEST_INTERVAL = 1.0
+
 
 class SESAnalyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None, request_interval: float = ATTRIBUTES_REQUEST_INTERVAL):
         self.profile = profile
         self.region_name = region_name
+        self.request_interval = request_interval
         if boto3 is None:
             raise RuntimeError("boto3 is required for SESAnalyzer")
         if profile:
@@ -28,14 +43,38 @@ class SESAnalyzer:
             self.session = boto3.Session()
         self.client = self.session.client("ses", region_name=region_name)
 
+    def _batch_attributes(self, batch: List[str]) -> Dict[str, object]:
+        """Fetch one chunk's attributes; "failed" is set if either call gave up."""
+        out: Dict[str, object] = {"verification": {}, "dkim": {}}
+        failed = False
+        try:
+            out["verification"] = call_with_retries(
+                lambda: self.client.get_identity_verification_attributes(Identities=batch)
+            ).get("VerificationAttributes", {})
+        except Exception:
+            logger.debug("Failed to get verification attributes for %d identities", len(batch), exc_info=True)
+            failed = True
+        try:
+            out["dkim"] = call_with_retries(
+                lambda: self.client.get_identity_dkim_attributes(Identities=batch)
+            ).get("DkimAttributes", {})
+        except Exception:
+            logger.debug("Failed to get DKIM attributes for %d identities", len(batch), exc_info=True)
+            failed = True
+        out["failed"] = failed
+        return out
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
         # List identities by type (EmailAddress and Domain) because the API
         # validates IdentityType and doesn't accept a generic 'All' value.
         identities: List[str] = []
+        by_identity_type: Dict[str, int] = {}
         for t in ("EmailAddress", "Domain"):
             try:
-                resp = self.client.list_identities(IdentityType=t)
-                identities.extend(resp.get("Identities", []))
+                for page in self.client.get_paginator("list_identities").paginate(IdentityType=t):
+                    found = page.get("Identities", []) or []
+                    identities.extend(found)
+                    by_identity_type[t] = by_identity_type.get(t, 0) + len(found)
             except Exception:
                 logger.debug("list_identities failed for type %s", t, exc_info=True)
 
@@ -43,19 +82,40 @@ class SESAnalyzer:
         seen = set()
         identities = [x for x in identities if not (x in seen or seen.add(x))]
         total = len(identities)
-        result = {"summary": {"total_identities": total}}
+        result = {"summary": {"total_identities": total, "by_identity_type": by_identity_type}}
 
         if include_details and identities:
-            attrs = {}
-            try:
-                attrs = self.client.get_identity_verification_attributes(Identities=identities).get("VerificationAttributes", {})
-            except Exception:
-                logger.debug("Failed to get verification attributes", exc_info=True)
+            verification: Dict[str, Dict] = {}
+            dkim: Dict[str, Dict] = {}
+            failed_chunks = 0
+            for n, chunk in enumerate(chunks(identities, ATTRIBUTES_BATCH_SIZE)):
+                if n and self.request_interval:
+                    time.sleep(self.request_interval)
+                attrs = self._batch_attributes(list(chunk))
+                verification.update(attrs["verification"])
+                dkim.update(attrs["dkim"])
+                failed_chunks += attrs["failed"]
 
             out = []
+            by_status: Dict[str, int] = {}
+            dkim_enabled = 0
             for i in identities:
-                av = attrs.get(i, {})
-                out.append({"identity": i, "verification_status": av.get("VerificationStatus"), "verification_token": av.get("VerificationToken")})
+                av = verification.get(i, {})
+                dv = dkim.get(i, {})
+                status = av.get("VerificationStatus")
+                by_status[status or "unknown"] = by_status.get(status or "unknown", 0) + 1
+                if dv.get("DkimEnabled"):
+                    dkim_enabled += 1
+                out.append({
+                    "identity": i,
+                    "verification_status": status,
+                    "verification_token": av.get("VerificationToken"),
+                    "dkim_enabled": dv.get("DkimEnabled"),
+                    "dkim_verification_status": dv.get("DkimVerificationStatus"),
+                })
+            result["summary"]["by_verification_status"] = by_status
+            result["summary"]["dkim_enabled"] = dkim_enabled
+            result["summary"]["failed_attribute_chunks"] = failed_chunks
             result["identities"] = out
 
         return result
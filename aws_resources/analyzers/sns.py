@@ -1,12 +1,22 @@
 """SNS analyzer
 
-Summarizes SNS topics and optionally returns per-topic attributes.
+Summarizes SNS topics and optionally returns per-topic subscription counts.
+
+With include_details=True the analyzer pages through ListSubscriptions once for
+the region and groups subscriptions by TopicArn, so per-topic counts and
+protocol breakdowns cost O(pages) calls. Full topic attributes
+(GetTopicAttributes, one call per topic) are only fetched, concurrently, when
+the analyzer is created with fetch_attributes=True (CLI: --sns-attributes).
+If the subscription sweep fails, subscription figures are None and the summary
+carries `subscriptions_error` instead of reporting every topic as unsubscribed.
 """
 from __future__ import annotations
 
 from typing import Dict, List, Optional
 import logging
 
+from .batching import DEFAULT_MAX_WORKERS, bounded_map
+
 try:
     import boto3
 except Exception:
@@ -16,9 +26,17 @@ logger = logging.getLogger(__name__)
 
 
 class SNSAnalyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(
+        self,
+        profile: Optional[str] = None,
+        region_name: Optional[str] = None,
+        fetch_attributes: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
         self.profile = profile
         self.region_name = region_name
+        self.fetch_attributes = fetch_attributes
+        self.max_workers = max_workers
         if boto3 is None:
             raise RuntimeError("boto3 is required for SNSAnalyzer")
         if profile:
@@ -27,6 +45,26 @@ class SNSAnalyzer:
             self.session = boto3.Session()
         self.client = self.session.client("sns", region_name=region_name)
 
+    def _subscriptions_by_topic(self) -> Dict[str, Dict[str, object]]:
+        """Sweep ListSubscriptions once and group counts by TopicArn."""
+        by_topic: Dict[str, Dict[str, object]] = {}
+        for page in self.client.get_paginator("list_subscriptions").paginate():
+            for s in page.get("Subscriptions", []) or []:
+                entry = by_topic.setdefault(s.get("TopicArn"), {"count": 0, "pending_confirmation": 0, "by_protocol": {}})
+                entry["count"] += 1
+                if s.get("SubscriptionArn") == "PendingConfirmation":
+                    entry["pending_confirmation"] += 1
+                proto = s.get("Protocol") or "unknown"
+                entry["by_protocol"][proto] = entry["by_protocol"].get(proto, 0) + 1
+        return by_topic
+
+    def _topic_attributes(self, arn: str) -> Dict[str, str]:
+        try:
+            return self.client.get_topic_attributes(TopicArn=arn).get("Attributes", {})
+        except Exception:
+            logger.debug("Failed to get attributes for %s", arn, exc_info=True)
+            return {}
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
         paginator = self.client.get_paginator("list_topics")
         topics: List[str] = []
@@ -37,14 +75,48 @@ class SNSAnalyzer:
         result = {"summary": {"total_topics": len(topics)}}
 
         if include_details:
+            try:
+                subs: Optional[Dict[str, Dict[str, object]]] = self._subscriptions_by_topic()
+            except Exception:
+                logger.debug("Failed to list subscriptions", exc_info=True)
+                subs = None
+
+            attrs_list = bounded_map(self._topic_attributes, topics, self.max_workers) if self.fetch_attributes else None
+
             details = []
-            for arn in topics:
-                try:
-                    attrs = self.client.get_topic_attributes(TopicArn=arn).get("Attributes", {})
-                except Exception:
-                    logger.debug("Failed to get attributes for %s", arn, exc_info=True)
-                    attrs = {}
-                details.append({"topic_arn": arn, "attributes": attrs})
+            total_subs = 0
+            by_protocol: Dict[str, int] = {}
+            for idx, arn in enumerate(topics):
+                if subs is None:
+                    # unknown, not zero
+                    entry = {"count": None, "pending_confirmation": None, "by_protocol": None}
+                else:
+                    entry = subs.get(arn) or {"count": 0, "pending_confirmation": 0, "by_protocol": {}}
+                    total_subs += entry["count"]
+                    for proto, n in entry["by_protocol"].items():
+                        by_protocol[proto] = by_protocol.get(proto, 0) + n
+                d = {
+                    "topic_arn": arn,
+                    "subscription_count": entry["count"],
+                    "pending_confirmation": entry["pending_confirmation"],
+                    "by_protocol": entry["by_protocol"],
+                }
+                if attrs_list is not None:
+                    d["attributes"] = attrs_list[idx]
+                details.append(d)
+
+            if subs is None:
+                result["summary"].update({
+                    "total_subscriptions": None,
+                    "subscriptions_by_protocol": None,
+                    "subscriptions_error": True,
+                })
+            else:
+                result["summary"].update({
+                    "total_subscriptions": total_subs,
+                    "subscriptions_by_protocol": by_protocol,
+                    "topics_without_subscriptions": sum(1 for d in details if not d["subscription_count"]),
+                })
             result["topics"] = details
 
         return result
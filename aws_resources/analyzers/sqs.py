@@ -1,12 +1,21 @@
 """SQS analyzer
 
 Summarizes SQS queues and optionally returns per-queue attributes.
+
+Queue URLs are paginated (ListQueues returns at most 1000 per page). FIFO vs
+standard counts come from the queue URL suffix and need no extra calls. With
+include_details=True queue attributes are fetched concurrently on a bounded
+pool; `attribute_names` can restrict GetQueueAttributes to a subset (see
+SUMMARY_ATTRIBUTES) to shrink payloads. Backlog and dead-letter aggregates are
+computed from whichever of those attributes were requested.
 """
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 import logging
 
+from .batching import DEFAULT_MAX_WORKERS, bounded_map
+
 try:
     import boto3
 except Exception:
@@ -14,11 +23,35 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# Attribute subset sufficient for the summary aggregates.
+SUMMARY_ATTRIBUTES: List[str] = [
+    "ApproximateNumberOfMessages",
+    "ApproximateNumberOfMessagesNotVisible",
+    "ApproximateNumberOfMessagesDelayed",
+    "MessageRetentionPeriod",
+    "RedrivePolicy",
+]
+
+
+def _to_int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
 
 class SQSAnalyzer:
-    def __init__(self, profile: Optional[str] = None, region_name: Optional[str] = None):
+    def __init__(
+        self,
+        profile: Optional[str] = None,
+        region_name: Optional[str] = None,
+        attribute_names: Optional[Sequence[str]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
         self.profile = profile
         self.region_name = region_name
+        self.attribute_names = list(attribute_names) if attribute_names else ["All"]
+        self.max_workers = max_workers
         if boto3 is None:
             raise RuntimeError("boto3 is required for SQSAnalyzer")
         if profile:
@@ -27,21 +60,45 @@ class SQSAnalyzer:
             self.session = boto3.Session()
         self.client = self.session.client("sqs", region_name=region_name)
 
+    def _queue_attributes(self, url: str) -> Dict[str, str]:
+        try:
+            return self.client.get_queue_attributes(QueueUrl=url, AttributeNames=self.attribute_names).get("Attributes", {})
+        except Exception:
+            logger.debug("Failed to get attributes for %s", url, exc_info=True)
+            return {}
+
     def analyze(self, include_details: bool = False) -> Dict[str, object]:
-        resp = self.client.list_queues()
-        urls = resp.get("QueueUrls", [])
+        urls: List[str] = []
+        paginator = self.client.get_paginator("list_queues")
+        for page in paginator.paginate(PaginationConfig={"PageSize": 1000}):
+            urls.extend(page.get("QueueUrls", []) or [])
+
         total = len(urls)
-        result = {"summary": {"total_queues": total}}
+        fifo = sum(1 for u in urls if u.endswith(".fifo"))
+        result = {"summary": {"total_queues": total, "by_type": {"fifo": fifo, "standard": total - fifo}}}
 
         if include_details and urls:
+            attrs_list = bounded_map(self._queue_attributes, urls, self.max_workers)
+
             details = []
-            for u in urls:
-                try:
-                    attrs = self.client.get_queue_attributes(QueueUrl=u, AttributeNames=["All"]).get("Attributes", {})
-                except Exception:
-                    logger.debug("Failed to get attributes for %s", u, exc_info=True)
-                    attrs = {}
+            visible = 0
+            in_flight = 0
+            delayed = 0
+            with_dlq = 0
+            for u, attrs in zip(urls, attrs_list):
+                visible += _to_int(attrs.get("ApproximateNumberOfMessages"))
+                in_flight += _to_int(attrs.get("ApproximateNumberOfMessagesNotVisible"))
+                delayed += _to_int(attrs.get("ApproximateNumberOfMessagesDelayed"))
+                if attrs.get("RedrivePolicy"):
+                    with_dlq += 1
                 details.append({"queue_url": u, "attributes": attrs})
+
+            result["summary"].update({
+                "total_backlog_messages": visible,
+                "total_in_flight_messages": in_flight,
+                "total_delayed_messages": delayed,
+                "queues_with_dlq": with_dlq,
+            })
             result["queues"] = details
 
         return result
@@ -0,0 +1,98 @@
+"""Persistent metadata cache
+
+A tiny JSON-file key/value store used by analyzers to remember metadata that
+rarely or never changes between runs (e.g. KMS key metadata, S3 bucket
+regions), so repeated reports only call AWS for resources they have not seen.
+
+The cache directory is taken from the `AWS_RESOURCES_CACHE_DIR` environment
+variable, falling back to `$XDG_CACHE_HOME/aws-resources` or
+`~/.cache/aws-resources`. Cache I/O failures are logged and otherwise ignored:
+a broken cache only costs extra API calls.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Optional
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir() -> str:
+    env = os.environ.get("AWS_RESOURCES_CACHE_DIR")
+    if env:
+        return env
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "aws-resources")
+
+
+class JsonFileCache:
+    """Key/value cache persisted as `<directory>/<name>.json`.
+
+    Entries older than `ttl_seconds` (when set) are treated as missing. Values
+    must be JSON-serializable. Call `save()` to persist changes.
+    """
+
+    def __init__(self, name: str, directory: Optional[str] = None, ttl_seconds: Optional[float] = None):
+        self.path = os.path.join(directory or default_cache_dir(), f"{name}.json")
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._entries = data
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logger.debug("Ignoring unreadable cache file %s", self.path, exc_info=True)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if not entry:
+            return None
+        if self.ttl_seconds is not None and time.time() - entry.get("stored_at", 0) > self.ttl_seconds:
+            return None
+        return entry.get("value")
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = {"stored_at": time.time(), "value": value}
+            self._dirty = True
+
+    def retain(self, keys: Iterable[str]) -> None:
+        """Drop every entry whose key is not in `keys` (e.g. deleted resources)."""
+        keep = set(keys)
+        with self._lock:
+            stale = [k for k in self._entries if k not in keep]
+            for k in stale:
+                del self._entries[k]
+            if stale:
+                self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(self._entries)
+            self._dirty = False
+        try:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            # write atomically so concurrent runs never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp, self.path)
+        except Exception:
+            logger.debug("Failed to write cache file %s", self.path, exc_info=True)
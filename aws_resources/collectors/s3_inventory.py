@@ -0,0 +1,276 @@
+"""S3 Inventory collector
+
+Reads S3 Inventory reports from a local directory (for example a copy made
+with `aws s3 sync s3://<inventory-destination>/ ./inventory/`) and aggregates
+object counts and bytes per source bucket, by storage class, by object age and
+by key prefix. No AWS API is called, so this works fully offline and gives
+prefix-level detail that CloudWatch storage metrics cannot provide.
+
+Every `manifest.json` below the directory is considered; when several reports
+exist for the same source bucket only the newest one (by `creationTimestamp`)
+is used. Data files are gzipped CSV or, when `pyarrow` is installed, Parquet.
+Rows are streamed and only the aggregates are kept in memory, and data files
+are processed in parallel on a process pool (one file per task).
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import unquote_plus
+import csv
+import gzip
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+# (label, upper bound in days); the last bucket is open-ended
+AGE_BUCKETS: Tuple[Tuple[str, Optional[int]], ...] = (
+    ("0-30d", 30),
+    ("30-90d", 90),
+    ("90-180d", 180),
+    ("180-365d", 365),
+    ("365d+", None),
+)
+
+# Parquet record batches are read this many rows at a time
+PARQUET_BATCH_ROWS = 65536
+
+
+def _column_key(name: str) -> str:
+    # CSV schemas use "LastModifiedDate", Parquet schemas "last_modified_date"
+    return name.strip().lower().replace("_", "")
+
+
+def _empty_stats() -> Dict[str, Any]:
+    return {"object_count": 0, "size_bytes": 0, "by_storage_class": {}, "by_age": {}, "by_prefix": {}}
+
+
+def _add(group: Dict[str, Dict[str, int]], key: str, size: int) -> None:
+    entry = group.get(key)
+    if entry is None:
+        entry = group[key] = {"object_count": 0, "size_bytes": 0}
+    entry["object_count"] += 1
+    entry["size_bytes"] += size
+
+
+def _merge(into: Dict[str, Any], other: Dict[str, Any]) -> None:
+    into["object_count"] += other["object_count"]
+    into["size_bytes"] += other["size_bytes"]
+    for field in ("by_storage_class", "by_age", "by_prefix"):
+        target = into[field]
+        for key, entry in other[field].items():
+            t = target.setdefault(key, {"object_count": 0, "size_bytes": 0})
+            t["object_count"] += entry["object_count"]
+            t["size_bytes"] += entry["size_bytes"]
+
+
+def _prefix(key: str, depth: int) -> str:
+    """Return the first `depth` "directories" of `key` ("" for top-level objects)."""
+    parts = key.split("/", depth)
+    dirs = parts[:-1] if len(parts) <= depth else parts[:depth]
+    return "/".join(dirs) + "/" if dirs else ""
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _age_label(modified: Optional[float], reference: float) -> str:
+    if modified is None:
+        return "unknown"
+    age_days = (reference - modified) / 86400
+    for label, limit in AGE_BUCKETS:
+        if limit is None or age_days < limit:
+            return label
+    return "unknown"  # pragma: no cover - last bucket is open-ended
+
+
+def _csv_rows(path: str, columns: List[str]) -> Iterator[Tuple[str, Any, Any, Any, Any]]:
+    index = {_column_key(c): i for i, c in enumerate(columns)}
+    if "key" not in index:
+        raise ValueError("inventory schema has no Key column")
+    # pad short rows so optional columns missing from a row read as None
+    positions = [index.get(c, -1) for c in ("key", "size", "lastmodifieddate", "storageclass", "isdeletemarker")]
+    width = len(columns)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        for row in csv.reader(f):
+            if not row:
+                continue
+            if len(row) < width:
+                row = row + [None] * (width - len(row))
+            key, size, modified, storage_class, delete_marker = (row[i] if i >= 0 else None for i in positions)
+            # keys in CSV inventories are URL-encoded
+            yield unquote_plus(key), size, modified, storage_class, delete_marker
+
+
+def _parquet_rows(path: str) -> Iterator[Tuple[str, Any, Any, Any, Any]]:
+    import pyarrow.parquet as pq  # optional dependency, only needed for Parquet reports
+
+    pf = pq.ParquetFile(path)
+    names = {_column_key(n): n for n in pf.schema_arrow.names}
+    wanted = ["key", "size", "lastmodifieddate", "storageclass", "isdeletemarker"]
+    if "key" not in names:
+        raise ValueError("inventory schema has no key column")
+    columns = [names[w] for w in wanted if w in names]
+    for batch in pf.iter_batches(batch_size=PARQUET_BATCH_ROWS, columns=columns):
+        data = batch.to_pydict()
+        n = batch.num_rows
+        cols = [data.get(names[w]) if w in names else None for w in wanted]
+        for i in range(n):
+            yield tuple(c[i] if c is not None else None for c in cols)  # type: ignore[misc]
+
+
+def _aggregate_file(task: Tuple[str, str, List[str], float, int]) -> Dict[str, Any]:
+    """Aggregate one data file. Runs in a worker process, so it must stay picklable."""
+    path, file_format, columns, reference, prefix_depth = task
+    stats = _empty_stats()
+    rows = _parquet_rows(path) if file_format == "parquet" else _csv_rows(path, columns)
+    for key, size, modified, storage_class, delete_marker in rows:
+        if delete_marker is True or str(delete_marker).lower() == "true":
+            continue
+        try:
+            size_bytes = int(size or 0)
+        except (TypeError, ValueError):
+            size_bytes = 0
+        stats["object_count"] += 1
+        stats["size_bytes"] += size_bytes
+        _add(stats["by_storage_class"], storage_class or "STANDARD", size_bytes)
+        _add(stats["by_age"], _age_label(_timestamp(modified), reference), size_bytes)
+        _add(stats["by_prefix"], _prefix(key, prefix_depth), size_bytes)
+    return stats
+
+
+def _resolve_data_file(root: str, manifest_dir: str, key: str) -> Optional[str]:
+    """Find the local copy of a data file listed in a manifest.
+
+    Manifest entries are keys in the destination bucket. Local copies usually
+    keep a suffix of that key (e.g. `<source-bucket>/<config>/data/<file>`), so
+    each suffix is tried against the manifest's ancestor directories up to `root`.
+    """
+    parts = [p for p in key.split("/") if p]
+    root = os.path.abspath(root)
+    directory = os.path.abspath(manifest_dir)
+    while True:
+        for i in range(len(parts)):
+            candidate = os.path.join(directory, *parts[i:])
+            if os.path.isfile(candidate):
+                return candidate
+        if directory == root or os.path.dirname(directory) == directory:
+            return None
+        directory = os.path.dirname(directory)
+
+
+class S3InventoryCollector:
+    """Aggregate local S3 Inventory reports per source bucket.
+
+    Methods:
+        collect() -> Dict[str, Dict]  # source bucket name -> aggregated stats
+    """
+
+    def __init__(self, directory: str, prefix_depth: int = 1, max_workers: Optional[int] = None):
+        if prefix_depth < 1:
+            raise ValueError("prefix_depth must be >= 1")
+        self.directory = directory
+        self.prefix_depth = prefix_depth
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def _manifests(self) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """Return source bucket -> (manifest path, manifest) for the newest report."""
+        latest: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        for dirpath, _dirnames, filenames in os.walk(self.directory):
+            if MANIFEST_NAME not in filenames:
+                continue
+            path = os.path.join(dirpath, MANIFEST_NAME)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+                bucket = manifest["sourceBucket"]
+            except Exception:
+                logger.debug("Skipping unreadable inventory manifest %s", path, exc_info=True)
+                continue
+            current = latest.get(bucket)
+            if current is None or int(manifest.get("creationTimestamp") or 0) > int(current[1].get("creationTimestamp") or 0):
+                latest[bucket] = (path, manifest)
+        return latest
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        results: Dict[str, Dict[str, Any]] = {}
+        tasks: List[Tuple[str, str, List[str], float, int]] = []
+        owners: List[str] = []
+        for bucket, (path, manifest) in sorted(self._manifests().items()):
+            file_format = str(manifest.get("fileFormat") or "CSV").lower()
+            created_ms = int(manifest.get("creationTimestamp") or 0)
+            reference = created_ms / 1000 if created_ms else datetime.now(timezone.utc).timestamp()
+            entry = _empty_stats()
+            entry.update(
+                {
+                    "manifest": path,
+                    "inventory_date": datetime.fromtimestamp(reference, timezone.utc).isoformat(),
+                    "file_format": manifest.get("fileFormat") or "CSV",
+                    "prefix_depth": self.prefix_depth,
+                    "data_files": 0,
+                    "missing_files": 0,
+                    "failed_files": 0,
+                }
+            )
+            results[bucket] = entry
+            if file_format not in ("csv", "parquet"):
+                logger.warning("Unsupported S3 Inventory format %s for bucket %s", manifest.get("fileFormat"), bucket)
+                entry["note"] = f"Unsupported inventory format {manifest.get('fileFormat')}"
+                continue
+            columns = [c for c in str(manifest.get("fileSchema") or "").split(",") if c.strip()]
+            for f in manifest.get("files") or []:
+                data_path = _resolve_data_file(self.directory, os.path.dirname(path), f.get("key", ""))
+                if data_path is None:
+                    entry["missing_files"] += 1
+                    continue
+                entry["data_files"] += 1
+                tasks.append((data_path, file_format, columns, reference, self.prefix_depth))
+                owners.append(bucket)
+
+        for bucket, stats in zip(owners, self._run(tasks)):
+            if stats is None:
+                # unreadable file: the bucket's totals are partial
+                results[bucket]["failed_files"] += 1
+            else:
+                _merge(results[bucket], stats)
+        return results
+
+    def _run(self, tasks: List[Tuple[str, str, List[str], float, int]]) -> List[Optional[Dict[str, Any]]]:
+        if not tasks:
+            return []
+        if self.max_workers <= 1 or len(tasks) == 1:
+            return [self._safe_aggregate(t) for t in tasks]
+        out: List[Optional[Dict[str, Any]]] = []
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as pool:
+            futures = [pool.submit(_aggregate_file, t) for t in tasks]
+            for task, fut in zip(tasks, futures):
+                try:
+                    out.append(fut.result())
+                except Exception:
+                    logger.warning("Failed to read inventory file %s", task[0], exc_info=True)
+                    out.append(None)
+        return out
+
+    @staticmethod
+    def _safe_aggregate(task: Tuple[str, str, List[str], float, int]) -> Optional[Dict[str, Any]]:
+        try:
+            return _aggregate_file(task)
+        except Exception:
+            logger.warning("Failed to read inventory file %s", task[0], exc_info=True)
+            return None
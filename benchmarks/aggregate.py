@@ -0,0 +1,81 @@
+"""Group-by aggregation at 10k/100k/1M rows
+
+Times the EC2 summary computed two ways over synthetic instances:
+
+- hand-rolled: the nested dict counters EC2Analyzer used to keep
+- aggregator:  Aggregator, including one add() call per row
+
+and checks that both produce identical summaries. Each timing is the best of
+--repeat runs.
+
+    python benchmarks/aggregate.py [--rows 10000 100000 1000000] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aws_resources.analyzers.aggregate import Aggregator  # noqa: E402
+
+SPECS = [("x86", 2, 1024), ("x86", 4, 16384), ("arm", 2, 4096), ("arm", 8, 32768), ("unknown", 0, 0)]
+
+
+def rows(n: int):
+    rnd = random.Random(n)
+    return [(*rnd.choice(SPECS)[:1], "spot" if rnd.random() < 0.3 else "on_demand", *rnd.choice(SPECS)[1:]) for _ in range(n)]
+
+
+def hand_rolled(data):
+    arch_summary = {}
+    lifecycle = {"spot": [0, 0, 0], "on_demand": [0, 0, 0]}
+    for arch, lc, v, m in data:
+        if arch not in arch_summary:
+            arch_summary[arch] = {"count": 0, "vCPU": 0, "memory_mib": 0}
+        arch_summary[arch]["count"] += 1
+        arch_summary[arch]["vCPU"] += v
+        arch_summary[arch]["memory_mib"] += m
+        bucket = lifecycle[lc]
+        bucket[0] += 1
+        bucket[1] += v
+        bucket[2] += m
+    return arch_summary, {lc: {"count": b[0], "vCPU": b[1], "memory_mib": b[2]} for lc, b in lifecycle.items() if b[0]}
+
+
+def engine(data):
+    agg = Aggregator(keys=("architecture", "lifecycle"), measures=("vCPU", "memory_mib"))
+    for arch, lc, v, m in data:
+        agg.add(arch, lc, v, m)
+    by_lifecycle = agg.rollup("lifecycle")
+    return agg.rollup("architecture"), {lc: by_lifecycle[lc] for lc in ("spot", "on_demand") if lc in by_lifecycle}
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - start) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(f"{'rows':>9} {'hand-rolled':>12} {'aggregator':>11} {'speedup':>8}  (ms)")
+    for n in args.rows:
+        data = rows(n)
+        expected, _ = timed(hand_rolled, data)
+        got, _ = timed(engine, data)
+        assert got == expected
+        t_hand = min(timed(hand_rolled, data)[1] for _ in range(args.repeat))
+        t_agg = min(timed(engine, data)[1] for _ in range(args.repeat))
+        print(f"{n:>9} {t_hand:12.1f} {t_agg:11.1f} {t_hand / t_agg:7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Peak RSS of DocumentDB instance ingestion, raw vs projected
+
+Feeds a synthetic 50k-instance account (500 pages of 100 DBInstance payloads
+shaped like real DescribeDBInstances output) through
+
+- raw:       every payload kept, as the analyzers did before projection
+- projected: DocumentDBAnalyzer, which projects each page as it arrives
+
+Each mode runs in its own interpreter so the reported peak RSS is not shared.
+
+    python benchmarks/projection_memory.py [--instances 50000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+PAGE_SIZE = 100
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _instance(i: int) -> dict:
+    created = datetime(2023, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=i)
+    return {
+        "DBInstanceIdentifier": f"docdb-{i:06d}",
+        "DBInstanceClass": "db.r6g.large",
+        "Engine": "docdb",
+        "EngineVersion": "5.0.0",
+        "DBInstanceStatus": "available",
+        "Endpoint": {"Address": f"docdb-{i:06d}.cluster-abcdefghijkl.eu-west-1.docdb.amazonaws.com", "Port": 27017, "HostedZoneId": "Z1234567890ABC"},
+        "InstanceCreateTime": created,
+        "PreferredBackupWindow": "00:00-00:30",
+        "BackupRetentionPeriod": 7,
+        "VpcSecurityGroups": [{"VpcSecurityGroupId": f"sg-{i:017x}", "Status": "active"}],
+        "AvailabilityZone": "eu-west-1a",
+        "DBSubnetGroup": {
+            "DBSubnetGroupName": "default",
+            "DBSubnetGroupDescription": "default subnet group",
+            "VpcId": "vpc-0123456789abcdef0",
+            "SubnetGroupStatus": "Complete",
+            "Subnets": [
+                {"SubnetIdentifier": f"subnet-{n:017x}", "SubnetAvailabilityZone": {"Name": f"eu-west-1{z}"}, "SubnetStatus": "Active"}
+                for n, z in enumerate("abc")
+            ],
+        },
+        "PreferredMaintenanceWindow": "sun:02:00-sun:02:30",
+        "PendingModifiedValues": {},
+        "LatestRestorableTime": created,
+        "AutoMinorVersionUpgrade": True,
+        "PubliclyAccessible": False,
+        "StatusInfos": [],
+        "DBClusterIdentifier": f"cluster-{i // 3:06d}",
+        "StorageEncrypted": True,
+        "KmsKeyId": "arn:aws:kms:eu-west-1:123456789012:key/0123abcd-01ab-23cd-45ef-0123456789ab",
+        "DbiResourceId": f"db-{i:026X}",
+        "CACertificateIdentifier": "rds-ca-rsa2048-g1",
+        "PromotionTier": 1,
+        "DBInstanceArn": f"arn:aws:rds:eu-west-1:123456789012:db:docdb-{i:06d}",
+        "EnabledCloudwatchLogsExports": ["audit", "profiler"],
+        "CertificateDetails": {"CAIdentifier": "rds-ca-rsa2048-g1", "ValidTill": created + timedelta(days=365)},
+    }
+
+
+def _pages(instances: int):
+    for start in range(0, instances, PAGE_SIZE):
+        yield {"DBInstances": [_instance(i) for i in range(start, min(start + PAGE_SIZE, instances))]}
+
+
+def _peak_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run(mode: str, instances: int) -> None:
+    sys.modules["boto3"] = MagicMock()
+    sys.path.insert(0, ROOT)
+    from aws_resources.analyzers.documentdb import DocumentDBAnalyzer
+
+    baseline = _peak_rss_mib()
+    if mode == "raw":
+        kept = [i for page in _pages(instances) for i in page["DBInstances"]]
+        count = len(kept)
+    else:
+        a = DocumentDBAnalyzer()
+        a.client.get_paginator.side_effect = lambda op: MagicMock(
+            paginate=lambda **kw: _pages(instances) if op == "describe_db_instances" else [{"DBClusters": []}]
+        )
+        a.session.client.return_value.describe_instance_types.return_value = {"InstanceTypes": []}
+        count = len(a.analyze(include_details=True)["instances"])
+    print(f"{mode:>9}: {count} instances, peak RSS {_peak_rss_mib():.1f} MiB (+{_peak_rss_mib() - baseline:.1f} MiB over import)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instances", type=int, default=50000)
+    parser.add_argument("--mode", choices=["raw", "projected"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        _run(args.mode, args.instances)
+        return 0
+    for mode in ("raw", "projected"):
+        subprocess.run([sys.executable, __file__, "--mode", mode, "--instances", str(args.instances)], check=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
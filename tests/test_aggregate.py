@@ -0,0 +1,100 @@
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+class TestAggregator(unittest.TestCase):
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_groups_rollups_and_total_keep_first_seen_order(self):
+        from aws_resources.analyzers.aggregate import Aggregator
+
+        rows = [(("arm", "spot"), (2, 4096)), (("x86", "on_demand"), (4, 16384)), (("arm", "on_demand"), (8, 32768)), (("x86", "on_demand"), (2, 1024))]
+        agg = Aggregator(keys=("architecture", "lifecycle"), measures=("vCPU", "memory_mib"))
+        for key, values in rows:
+            agg.add(*key, *values)
+        groups, by_arch, by_lifecycle_arch, total = agg.groups(), agg.rollup("architecture"), agg.rollup("lifecycle", "architecture"), agg.total()
+
+        self.assertEqual(list(groups), [("arm", "spot"), ("x86", "on_demand"), ("arm", "on_demand")])
+        self.assertEqual(by_arch, {"arm": {"count": 2, "vCPU": 10, "memory_mib": 36864}, "x86": {"count": 2, "vCPU": 6, "memory_mib": 17408}})
+        self.assertEqual(list(by_arch["arm"]), ["count", "vCPU", "memory_mib"])
+        self.assertEqual(by_lifecycle_arch[("on_demand", "x86")]["count"], 2)
+        self.assertEqual(total, {"count": 4, "vCPU": 16, "memory_mib": 54272})
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_repeated_rows_match_row_by_row_counters(self):
+        from aws_resources.analyzers.aggregate import Aggregator
+
+        specs = [("x86", "spot", 2, 1024), ("arm", "on_demand", 4, 8192), ("x86", "on_demand", 2, 1024)]
+        rows = [specs[i % 3] for i in range(3000)] + [("arm", "spot", 1, i) for i in range(5)]
+        agg = Aggregator(keys=("architecture", "lifecycle"), measures=("vCPU", "memory_mib"))
+        expected = {}
+        for row in rows:
+            agg.add(*row)
+            acc = expected.setdefault(row[0], {"count": 0, "vCPU": 0, "memory_mib": 0})
+            acc["count"] += 1
+            acc["vCPU"] += row[2]
+            acc["memory_mib"] += row[3]
+
+        self.assertEqual(agg.rollup("architecture"), expected)
+        self.assertEqual(list(agg.rollup("architecture")), ["x86", "arm"])
+        self.assertEqual(list(agg.groups()), [("x86", "spot"), ("arm", "on_demand"), ("x86", "on_demand"), ("arm", "spot")])
+        # rows added after a read are still counted
+        agg.add("x86", "spot", 2, 1024)
+        self.assertEqual(agg.total()["count"], 3006)
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_float_measures_and_empty(self):
+        from aws_resources.analyzers.aggregate import Aggregator
+
+        agg = Aggregator(keys=("k",), measures=("x",))
+        self.assertEqual(agg.total(), {"count": 0, "x": 0})
+        self.assertEqual(agg.rollup("k"), {})
+        expected = 0
+        for _ in range(10):
+            agg.add("a", 0.1)
+            expected += 0.1
+        # repeated floats are weighted (10 * 0.1), so only the last digits may differ
+        self.assertAlmostEqual(agg.rollup("k")["a"]["x"], expected)
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_none_measures_are_skipped(self):
+        from aws_resources.analyzers.aggregate import Aggregator
+
+        agg = Aggregator(keys=("engine",), measures=("vCPU", "memory_mib"))
+        agg.add("postgres", 2, 4096)
+        agg.add("postgres", None, 8192)
+        agg.add("mysql", None, None)
+        self.assertEqual(agg.rollup("engine"), {
+            "postgres": {"count": 2, "vCPU": 2, "memory_mib": 12288},
+            "mysql": {"count": 1, "vCPU": 0, "memory_mib": 0},
+        })
+        self.assertEqual(agg.total(), {"count": 3, "vCPU": 2, "memory_mib": 12288})
+        self.assertEqual(len(agg), 3)
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_unhashable_rows_fall_back_to_row_by_row(self):
+        from aws_resources.analyzers.aggregate import Aggregator
+
+        class Size:
+            """Numeric measure without a hash."""
+
+            __hash__ = None
+
+            def __init__(self, value):
+                self.value = value
+
+            def __radd__(self, other):
+                return other + self.value
+
+            def __mul__(self, count):
+                return Size(self.value * count)
+
+        agg = Aggregator(keys=("k",), measures=("x",))
+        agg.add("a", 1)
+        agg.add("a", Size(2))
+        agg.add("b", Size(3))
+        self.assertEqual(agg.rollup("k"), {"a": {"count": 2, "x": 3}, "b": {"count": 1, "x": 3}})
+
+
+if __name__ == "__main__":
+    unittest.main()
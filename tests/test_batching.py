@@ -0,0 +1,79 @@
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+class TestBatching(unittest.TestCase):
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_chunks(self):
+        from aws_resources.analyzers.batching import chunks
+
+        self.assertEqual([list(c) for c in chunks([1, 2, 3, 4, 5], 2)], [[1, 2], [3, 4], [5]])
+        self.assertEqual(list(chunks([], 3)), [])
+        with self.assertRaises(ValueError):
+            list(chunks([1], 0))
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_bounded_map_preserves_order_and_bounds_workers(self):
+        from aws_resources.analyzers.batching import bounded_map
+
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def work(x):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.01)
+            with lock:
+                state["active"] -= 1
+            return x * 2
+
+        out = bounded_map(work, range(20), max_workers=3)
+        self.assertEqual(out, [x * 2 for x in range(20)])
+        self.assertLessEqual(state["peak"], 3)
+        self.assertEqual(bounded_map(work, [], max_workers=3), [])
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_call_with_retries_retries_only_throttling(self):
+        from aws_resources.analyzers.batching import call_with_retries
+
+        class ClientError(Exception):
+            def __init__(self, code):
+                super().__init__(code)
+                self.response = {"Error": {"Code": code}}
+
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ClientError("Throttling")
+            return "ok"
+
+        self.assertEqual(call_with_retries(flaky, base_delay=0), "ok")
+        self.assertEqual(len(calls), 3)
+
+        def denied():
+            calls.append(1)
+            raise ClientError("AccessDenied")
+
+        calls.clear()
+        with self.assertRaises(ClientError):
+            call_with_retries(denied, base_delay=0)
+        self.assertEqual(len(calls), 1)
+
+        def throttled():
+            calls.append(1)
+            raise ClientError("Throttling")
+
+        calls.clear()
+        with self.assertRaises(ClientError):
+            call_with_retries(throttled, attempts=2, base_delay=0)
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
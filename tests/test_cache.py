@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from aws_resources.cache import JsonFileCache, default_cache_dir
+
+
+class TestJsonFileCache(unittest.TestCase):
+    def test_roundtrip_retain_and_ttl(self):
+        with tempfile.TemporaryDirectory() as d:
+            c = JsonFileCache("things", directory=d)
+            c.set("a", {"x": 1})
+            c.set("b", 2)
+            c.retain(["a"])
+            c.save()
+
+            c2 = JsonFileCache("things", directory=d)
+            self.assertEqual(c2.get("a"), {"x": 1})
+            self.assertIsNone(c2.get("b"))
+
+            with patch("aws_resources.cache.time.time", return_value=10**12):
+                self.assertIsNone(JsonFileCache("things", directory=d, ttl_seconds=60).get("a"))
+
+    def test_unreadable_file_is_ignored(self):
+        with tempfile.TemporaryDirectory() as d:
+            with open(os.path.join(d, "broken.json"), "w") as f:
+                f.write("{not json")
+            self.assertIsNone(JsonFileCache("broken", directory=d).get("a"))
+
+    def test_default_dir_env_override(self):
+        with patch.dict(os.environ, {"AWS_RESOURCES_CACHE_DIR": "/tmp/x"}):
+            self.assertEqual(default_cache_dir(), "/tmp/x")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,7 +9,21 @@ class TestDirectConnectAnalyzer(unittest.TestCase):
         import boto3
 
         mock_client = MagicMock()
-        mock_client.describe_connections.return_value = {"connections": [{"connectionId": "dxcon-1", "location": "EqDC2", "bandwidth": "1Gbps", "connectionState": "available"}]}
+        mock_client.describe_connections.return_value = {"connections": [
+            {"connectionId": "dxcon-1", "location": "EqDC2", "bandwidth": "1Gbps", "connectionState": "available"},
+            {"connectionId": "dxcon-2", "location": "EqDC2", "bandwidth": "500Mbps", "connectionState": "available"},
+        ]}
+        mock_client.describe_virtual_interfaces.return_value = {"virtualInterfaces": [
+            {"virtualInterfaceId": "dxvif-1", "connectionId": "dxcon-1", "vlan": 102, "virtualInterfaceType": "private", "directConnectGatewayId": "gw-1"},
+            {"virtualInterfaceId": "dxvif-2", "connectionId": "dxcon-1", "vlan": 101, "virtualInterfaceType": "transit", "directConnectGatewayId": "gw-1"},
+            # VIFs on a LAG carry the LAG id instead of a connection id
+            {"virtualInterfaceId": "dxvif-3", "connectionId": "dxlag-1", "vlan": 200, "virtualInterfaceType": "private"},
+        ]}
+        # gateways span two pages
+        mock_client.get_paginator.return_value.paginate.return_value = [
+            {"directConnectGateways": [{"directConnectGatewayId": "gw-1", "directConnectGatewayName": "hub"}], "nextToken": "t"},
+            {"directConnectGateways": [{"directConnectGatewayId": "gw-2"}]},
+        ]
 
         boto3.Session.return_value.client.return_value = mock_client
 
@@ -17,11 +31,25 @@ class TestDirectConnectAnalyzer(unittest.TestCase):
 
         a = DirectConnectAnalyzer()
         out = a.analyze()
-        self.assertEqual(out["summary"]["total_connections"], 1)
+        self.assertEqual(out["summary"]["total_connections"], 2)
+        self.assertEqual(out["summary"]["total_bandwidth_mbps"], 1500)
+        self.assertEqual(out["summary"]["total_virtual_interfaces"], 3)
+        self.assertEqual(out["summary"]["virtual_interfaces_by_type"], {"private": 2, "transit": 1})
+        self.assertEqual(out["summary"]["unattached_virtual_interfaces"], 1)
+        self.assertEqual(out["summary"]["total_direct_connect_gateways"], 2)
+        mock_client.get_paginator.assert_called_with("describe_direct_connect_gateways")
 
         out2 = a.analyze(include_details=True)
         self.assertIn("connections", out2)
         self.assertEqual(out2["connections"][0]["connectionId"], "dxcon-1")
+        self.assertEqual(out2["connections"][0]["virtual_interface_count"], 2)
+        self.assertEqual(out2["connections"][0]["vlans"], [101, 102])
+        self.assertEqual(out2["connections"][0]["direct_connect_gateways"], [{"id": "gw-1", "name": "hub"}])
+        self.assertEqual(out2["connections"][1]["virtual_interface_count"], 0)
+        attached = sum(c["virtual_interface_count"] for c in out2["connections"])
+        self.assertEqual(attached + out2["summary"]["unattached_virtual_interfaces"], out2["summary"]["total_virtual_interfaces"])
+        # one VIF call per analyze run regardless of connection count
+        self.assertEqual(mock_client.describe_virtual_interfaces.call_count, 2)
 
 
 if __name__ == "__main__":
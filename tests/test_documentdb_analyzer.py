@@ -9,21 +9,26 @@ class TestDocumentDBAnalyzer(unittest.TestCase):
         import boto3
 
         mock_docdb = MagicMock()
-        # clusters: one cluster 'c1'
-        mock_docdb.get_paginator.return_value.paginate.return_value = [
-            {"DBClusters": [{"DBClusterIdentifier": "c1", "Engine": "docdb", "Status": "available"}]}
-        ]
-
-        # describe_db_instances paginator: two instances in cluster c1
-        def paginate_instances():
-            return [{"DBInstances": [
-                {"DBInstanceIdentifier": "i-1", "DBInstanceClass": "db.r5.large", "DBClusterIdentifier": "c1", "Endpoint": {"Address": "i-1.example.com"}, "DBInstanceStatus": "available"},
-                {"DBInstanceIdentifier": "i-2", "DBInstanceClass": "db.r5.large", "DBClusterIdentifier": "c1", "Endpoint": {"Address": "i-2.example.com"}, "DBInstanceStatus": "available"},
-            ]}]
-
-        # make paginate behave differently by caller: we'll intercept in tests by swapping client
-        # configure describe_db_instances to return the two instances
-        mock_docdb.get_paginator.side_effect = lambda op: MagicMock(paginate=lambda: paginate_instances()) if op == "describe_db_instances" else MagicMock(paginate=lambda: [{"DBClusters": [{"DBClusterIdentifier": "c1", "Engine": "docdb", "Status": "available"}]}])
+        paginate_kwargs = []
+
+        # the endpoint honours the engine filter for clusters; one stray postgres
+        # instance checks the client-side guard
+        pages = {
+            "describe_db_clusters": [{"DBClusters": [{"DBClusterIdentifier": "c1", "Engine": "docdb", "Status": "available"}]}],
+            "describe_db_instances": [{"DBInstances": [
+                {"DBInstanceIdentifier": "i-1", "DBInstanceClass": "db.r5.large", "Engine": "docdb", "DBClusterIdentifier": "c1", "Endpoint": {"Address": "i-1.example.com"}, "DBInstanceStatus": "available"},
+                {"DBInstanceIdentifier": "i-2", "DBInstanceClass": "db.r5.large", "Engine": "docdb", "DBClusterIdentifier": "c1", "Endpoint": {"Address": "i-2.example.com"}, "DBInstanceStatus": "available"},
+                {"DBInstanceIdentifier": "pg-1", "DBInstanceClass": "db.m5.large", "Engine": "postgres", "DBInstanceStatus": "available"},
+            ]}],
+        }
+
+        def get_paginator(op):
+            def paginate(**kwargs):
+                paginate_kwargs.append((op, kwargs))
+                return pages[op]
+            return MagicMock(paginate=paginate)
+
+        mock_docdb.get_paginator.side_effect = get_paginator
 
         # mock ec2 describe_instance_types
         mock_ec2 = MagicMock()
@@ -55,6 +60,11 @@ class TestDocumentDBAnalyzer(unittest.TestCase):
         self.assertEqual(len(out2["clusters"]), 1)
         self.assertIn("by_instance_type", out2["summary"])
         self.assertEqual(out2["summary"]["total_vCPU"], 4)
+        self.assertEqual(out2["summary"]["by_instance_class"], {"db.r5.large": 2})
+        self.assertEqual([i["instance_id"] for i in out2["instances"]], ["i-1", "i-2"])
+        docdb_filter = {"Filters": [{"Name": "engine", "Values": ["docdb"]}]}
+        self.assertIn(("describe_db_clusters", docdb_filter), paginate_kwargs)
+        self.assertIn(("describe_db_instances", docdb_filter), paginate_kwargs)
 
 
 if __name__ == "__main__":
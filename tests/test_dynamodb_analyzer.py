@@ -60,6 +60,48 @@ class TestDynamoDBAnalyzer(unittest.TestCase):
         self.assertEqual(out2["summary"]["provisioned_read_capacity_units_total"], 5)
         self.assertEqual(out2["summary"]["provisioned_write_capacity_units_total"], 2)
 
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_dynamodb_sampled_summary(self):
+        from aws_resources.analyzers.dynamodb import DynamoDBAnalyzer
+
+        names = [f"table-{i}" for i in range(10)]
+        mock_client = MagicMock()
+        mock_client.get_paginator.return_value.paginate.return_value = [{"TableNames": names}]
+
+        def describe_table(TableName=None):
+            # even-numbered tables are on-demand, odd ones provisioned at 10/4
+            if int(TableName.split("-")[1]) % 2 == 0:
+                return {"Table": {"TableName": TableName, "BillingModeSummary": {"BillingMode": "PAY_PER_REQUEST"}}}
+            return {"Table": {"TableName": TableName, "ProvisionedThroughput": {"ReadCapacityUnits": 10, "WriteCapacityUnits": 4}}}
+
+        mock_client.describe_table.side_effect = describe_table
+
+        a = DynamoDBAnalyzer(sample_size=4, random_seed=1)
+        a.client = mock_client
+        out = a.analyze()
+
+        self.assertEqual(mock_client.describe_table.call_count, 4)
+        self.assertEqual(out["summary"]["total_tables"], 10)
+        self.assertNotIn("unknown", out["summary"]["by_billing_mode"])
+        self.assertEqual(sum(out["summary"]["by_billing_mode"].values()), 10)
+        sampling = out["summary"]["sampling"]
+        self.assertEqual(sampling["sample_size"], 4)
+        self.assertFalse(sampling["exact"])
+        for est in sampling["by_billing_mode"].values():
+            self.assertLessEqual(est["ci95_low"], est["estimate"])
+            self.assertGreaterEqual(est["ci95_high"], est["estimate"])
+            self.assertLessEqual(est["ci95_high"], 10)
+
+        # a sample covering every table yields exact figures
+        mock_client.describe_table.reset_mock()
+        a_all = DynamoDBAnalyzer(sample_size=50)
+        a_all.client = mock_client
+        out_all = a_all.analyze()
+        self.assertEqual(mock_client.describe_table.call_count, 10)
+        self.assertEqual(out_all["summary"]["by_billing_mode"], {"PAY_PER_REQUEST": 5, "PROVISIONED": 5})
+        self.assertEqual(out_all["summary"]["provisioned_read_capacity_units_total"], 50)
+        self.assertTrue(out_all["summary"]["sampling"]["exact"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,6 @@
 import sys
 import unittest
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
 
@@ -8,12 +9,28 @@ class TestECRAnalyzer(unittest.TestCase):
     def test_ecr_summary_and_details(self):
         import boto3
 
-        mock_client = MagicMock()
-        mock_client.get_paginator.return_value.paginate.return_value = [
-            {"repositories": [{"repositoryName": "repo1", "repositoryUri": "uri1"}, {"repositoryName": "repo2", "repositoryUri": "uri2"}]}
-        ]
+        now = datetime.now(timezone.utc)
+        images = {
+            # repo1's images span two DescribeImages pages
+            "repo1": [
+                {"imageDetails": [
+                    {"imageTags": ["latest"], "imageSizeInBytes": 100, "imagePushedAt": now - timedelta(days=1)},
+                    {"imageSizeInBytes": 50, "imagePushedAt": now - timedelta(days=100)},
+                ]},
+                {"imageDetails": [{"imageTags": ["v1"], "imageSizeInBytes": 25, "imagePushedAt": now - timedelta(days=400)}]},
+            ],
+            "repo2": [{"imageDetails": []}],
+        }
+
+        def get_paginator(op):
+            if op == "describe_repositories":
+                return MagicMock(paginate=lambda: [
+                    {"repositories": [{"repositoryName": "repo1", "repositoryUri": "uri1"}, {"repositoryName": "repo2", "repositoryUri": "uri2"}]}
+                ])
+            return MagicMock(paginate=lambda repositoryName=None: images[repositoryName])
 
-        mock_client.list_images.return_value = {"imageIds": [{}, {}, {}]}
+        mock_client = MagicMock()
+        mock_client.get_paginator.side_effect = get_paginator
 
         boto3.Session.return_value.client.return_value = mock_client
 
@@ -26,7 +43,16 @@ class TestECRAnalyzer(unittest.TestCase):
         out2 = a.analyze(include_details=True)
         self.assertIn("repositories", out2)
         self.assertEqual(len(out2["repositories"]), 2)
-        self.assertEqual(out2["repositories"][0]["image_count"], 3)
+        repo1 = out2["repositories"][0]
+        self.assertEqual(repo1["image_count"], 3)
+        self.assertEqual(repo1["total_size_bytes"], 175)
+        self.assertEqual(repo1["untagged_size_bytes"], 50)
+        self.assertEqual(repo1["by_age"]["0-30d"], {"count": 1, "size_bytes": 100})
+        self.assertEqual(repo1["by_age"]["90-365d"], {"count": 1, "size_bytes": 50})
+        self.assertEqual(repo1["by_age"]["365d+"], {"count": 1, "size_bytes": 25})
+        self.assertEqual(out2["repositories"][1]["image_count"], 0)
+        self.assertEqual(out2["summary"]["total_size_bytes"], 175)
+        self.assertEqual(out2["summary"]["total_images"], 3)
 
 
 if __name__ == "__main__":
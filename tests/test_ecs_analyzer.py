@@ -8,14 +8,24 @@ class TestECSAnalyzer(unittest.TestCase):
     def test_ecs_summary_and_details(self):
         import boto3
 
+        arn = "arn:aws:ecs:us-east-1:123:cluster/clusterA"
+        pages = {
+            "list_clusters": [{"clusterArns": [arn]}],
+            # services and tasks span two pages each
+            "list_services": [{"serviceArns": ["s1"]}, {"serviceArns": ["s2"]}],
+            "list_tasks": [{"taskArns": ["t1", "t2"]}, {"taskArns": ["t3"]}],
+        }
+
         mock_client = MagicMock()
-        mock_client.get_paginator.return_value.paginate.return_value = [
-            {"clusterArns": ["arn:aws:ecs:us-east-1:123:cluster/clusterA"]}
-        ]
+        mock_client.get_paginator.side_effect = lambda op: MagicMock(paginate=lambda **kw: pages[op])
 
-        mock_client.describe_clusters.return_value = {"clusters": [{"clusterName": "clusterA", "status": "ACTIVE"}]}
-        mock_client.list_services.return_value = {"serviceArns": ["s1", "s2"]}
-        mock_client.list_tasks.return_value = {"taskArns": ["t1"]}
+        mock_client.describe_clusters.return_value = {"clusters": [{"clusterArn": arn, "clusterName": "clusterA", "status": "ACTIVE"}]}
+        task_map = {
+            "t1": {"taskArn": "t1", "launchType": "FARGATE", "cpu": "512", "memory": "1024"},
+            "t2": {"taskArn": "t2", "launchType": "FARGATE", "cpu": "1024", "memory": "2048"},
+            "t3": {"taskArn": "t3", "launchType": "EC2", "cpu": "256", "memory": "512"},
+        }
+        mock_client.describe_tasks.side_effect = lambda cluster=None, tasks=None: {"tasks": [task_map[t] for t in tasks]}
 
         boto3.Session.return_value.client.return_value = mock_client
 
@@ -27,8 +37,33 @@ class TestECSAnalyzer(unittest.TestCase):
 
         out2 = a.analyze(include_details=True)
         self.assertIn("clusters", out2)
+        self.assertEqual(out2["clusters"][0]["status"], "ACTIVE")
         self.assertEqual(out2["clusters"][0]["service_count"], 2)
-        self.assertEqual(out2["clusters"][0]["task_count"], 1)
+        self.assertEqual(out2["clusters"][0]["task_count"], 3)
+        fargate = out2["clusters"][0]["by_launch_type"]["FARGATE"]
+        self.assertEqual(fargate["task_count"], 2)
+        self.assertEqual(fargate["cpu_units"], 1536)
+        self.assertEqual(fargate["vCPU"], 1.5)
+        self.assertEqual(fargate["memory_mib"], 3072)
+        self.assertEqual(out2["summary"]["total_tasks"], 3)
+        self.assertEqual(out2["summary"]["by_launch_type"]["EC2"]["memory_mib"], 512)
+        # one batched DescribeClusters call and one DescribeTasks call per task page
+        self.assertEqual(mock_client.describe_clusters.call_count, 1)
+        self.assertEqual(mock_client.describe_tasks.call_count, 2)
+        self.assertEqual(out2["summary"]["failed_clusters"], 0)
+
+        # a transient ListTasks error keeps what DescribeClusters reported
+        def throttled(**kw):
+            raise RuntimeError("Throttling")
+
+        mock_client.get_paginator.side_effect = lambda op: MagicMock(paginate=throttled if op == "list_tasks" else lambda **kw: pages[op])
+        out3 = ECSAnalyzer().analyze(include_details=True)
+        cluster = out3["clusters"][0]
+        self.assertEqual((cluster["cluster_name"], cluster["status"]), ("clusterA", "ACTIVE"))
+        self.assertIsNone(cluster["service_count"])
+        self.assertIsNone(cluster["task_count"])
+        self.assertTrue(cluster["error"])
+        self.assertEqual(out3["summary"]["failed_clusters"], 1)
 
 
 if __name__ == "__main__":
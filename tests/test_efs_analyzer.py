@@ -8,8 +8,18 @@ class TestEFSAnalyzer(unittest.TestCase):
     def test_efs_summary_and_details(self):
         import boto3
 
+        pages = {
+            # file systems span two pages
+            "describe_file_systems": lambda: [
+                {"FileSystems": [{"FileSystemId": "fs-1", "CreationTime": "2023-01-01", "SizeInBytes": {"Value": 1024, "ValueInStandard": 1000, "ValueInIA": 24}, "ThroughputMode": "bursting"}]},
+                {"FileSystems": [{"FileSystemId": "fs-2", "CreationTime": "2023-02-01", "SizeInBytes": {"Value": 300, "ValueInStandard": 100, "ValueInArchive": 200}, "ThroughputMode": "elastic"}]},
+            ],
+            "describe_mount_targets": lambda FileSystemId=None: [
+                {"MountTargets": [{"MountTargetId": f"{FileSystemId}-mt", "SubnetId": "subnet-1", "LifeCycleState": "available"}]}
+            ],
+        }
         mock_client = MagicMock()
-        mock_client.describe_file_systems.return_value = {"FileSystems": [{"FileSystemId": "fs-1", "CreationTime": "2023-01-01", "SizeInBytes": {"Value": 1024}, "ThroughputMode": "bursting"}]}
+        mock_client.get_paginator.side_effect = lambda op: MagicMock(paginate=pages[op])
 
         boto3.Session.return_value.client.return_value = mock_client
 
@@ -17,16 +27,20 @@ class TestEFSAnalyzer(unittest.TestCase):
 
         a = EFSAnalyzer()
         out = a.analyze()
-        self.assertEqual(out["summary"]["total_file_systems"], 1)
+        self.assertEqual(out["summary"]["total_file_systems"], 2)
         # summarized by throughput mode
         self.assertIn("by_throughput_mode", out["summary"])
         self.assertIn("bursting", out["summary"]["by_throughput_mode"])
         self.assertEqual(out["summary"]["by_throughput_mode"]["bursting"]["count"], 1)
         self.assertEqual(out["summary"]["by_throughput_mode"]["bursting"]["total_size_bytes"], 1024)
+        self.assertEqual(out["summary"]["by_storage_class_bytes"], {"standard": 1100, "infrequent_access": 24, "archive": 200})
 
         out2 = a.analyze(include_details=True)
         self.assertIn("file_systems", out2)
         self.assertEqual(out2["file_systems"][0]["file_system_id"], "fs-1")
+        self.assertEqual(out2["file_systems"][1]["mount_targets"][0]["mount_target_id"], "fs-2-mt")
+        self.assertEqual(out2["file_systems"][1]["size_bytes_by_storage_class"]["archive"], 200)
+        self.assertEqual(out2["summary"]["total_mount_targets"], 2)
 
 
 if __name__ == "__main__":
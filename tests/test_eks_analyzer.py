@@ -8,12 +8,26 @@ class TestEKSAnalyzer(unittest.TestCase):
     def test_eks_summary_and_details(self):
         import boto3
 
+        pages = {
+            "list_clusters": lambda: [{"clusters": ["cluster-a", "cluster-b"]}],
+            "list_nodegroups": lambda clusterName=None: [{"nodegroups": ["ng-1"] if clusterName == "cluster-a" else []}],
+            "list_fargate_profiles": lambda clusterName=None: [{"fargateProfileNames": ["fp-1"] if clusterName == "cluster-b" else []}],
+        }
         mock_client = MagicMock()
-        mock_client.get_paginator.return_value.paginate.return_value = [
-            {"clusters": ["cluster-a", "cluster-b"]}
-        ]
+        mock_client.get_paginator.side_effect = lambda op: MagicMock(paginate=pages[op])
 
         mock_client.describe_cluster.side_effect = lambda name: {"cluster": {"name": name, "status": "ACTIVE", "version": "1.27"}}
+        mock_client.describe_nodegroup.return_value = {
+            "nodegroup": {
+                "status": "ACTIVE",
+                "capacityType": "ON_DEMAND",
+                "instanceTypes": ["m5.large"],
+                "scalingConfig": {"minSize": 1, "maxSize": 5, "desiredSize": 3},
+            }
+        }
+        mock_client.describe_instance_types.return_value = {
+            "InstanceTypes": [{"InstanceType": "m5.large", "VCpuInfo": {"DefaultVCpus": 2}, "MemoryInfo": {"SizeInMiB": 8192}}]
+        }
 
         boto3.Session.return_value.client.return_value = mock_client
 
@@ -26,6 +40,15 @@ class TestEKSAnalyzer(unittest.TestCase):
         out2 = a.analyze(include_details=True)
         self.assertIn("clusters", out2)
         self.assertEqual(out2["clusters"][0]["version"], "1.27")
+        cap = out2["clusters"][0]["capacity"]
+        self.assertEqual(cap["nodegroup_count"], 1)
+        self.assertEqual((cap["desired_nodes"], cap["min_nodes"], cap["max_nodes"]), (3, 1, 5))
+        self.assertEqual(cap["desired_vCPU"], 6)
+        self.assertEqual(cap["desired_memory_mib"], 3 * 8192)
+        self.assertEqual(out2["clusters"][1]["fargate_profiles"], ["fp-1"])
+        self.assertEqual(out2["summary"]["compute"]["fargate_profile_count"], 1)
+        self.assertEqual(out2["summary"]["compute"]["desired_vCPU"], 6)
+        mock_client.describe_nodegroup.assert_called_once_with(clusterName="cluster-a", nodegroupName="ng-1")
 
 
 if __name__ == "__main__":
@@ -10,14 +10,43 @@ class TestElastiCacheAnalyzer(unittest.TestCase):
 
         # mock elasticache paginator: two clusters with explicit CacheNodeType
         mock_ec = MagicMock()
-        mock_ec.get_paginator.return_value.paginate.return_value = [
-            {
-                "CacheClusters": [
-                    {"CacheClusterId": "cc1", "Engine": "redis", "NumCacheNodes": 2, "CacheClusterStatus": "available", "CacheNodeType": "cache.m5.large"},
-                    {"CacheClusterId": "cc2", "Engine": "memcached", "NumCacheNodes": 1, "CacheClusterStatus": "available", "CacheNodeType": "cache.r5.large"},
-                ]
-            }
-        ]
+        pages = {
+            "describe_cache_clusters": [
+                {
+                    "CacheClusters": [
+                        {"CacheClusterId": "cc1", "Engine": "redis", "NumCacheNodes": 2, "CacheClusterStatus": "available", "CacheNodeType": "cache.m5.large", "ReplicationGroupId": "rg1"},
+                        {"CacheClusterId": "cc2", "Engine": "memcached", "NumCacheNodes": 1, "CacheClusterStatus": "available", "CacheNodeType": "cache.r5.large"},
+                    ]
+                }
+            ],
+            "describe_replication_groups": [
+                {
+                    "ReplicationGroups": [
+                        {
+                            "ReplicationGroupId": "rg1",
+                            "Status": "available",
+                            "MemberClusters": ["cc1"],
+                            "NodeGroups": [{"NodeGroupId": "0001", "NodeGroupMembers": [
+                                {"CacheClusterId": "cc1", "CurrentRole": "primary"},
+                                {"CacheClusterId": "cc1-002", "CurrentRole": "replica"},
+                            ]}],
+                        }
+                    ]
+                }
+            ],
+            "describe_serverless_caches": [
+                {"ServerlessCaches": [{"ServerlessCacheName": "sc1", "Engine": "valkey", "Status": "available"}]}
+            ],
+        }
+        paginate_kwargs = []
+
+        def get_paginator(op):
+            def paginate(**kwargs):
+                paginate_kwargs.append((op, kwargs))
+                return pages[op]
+            return MagicMock(paginate=paginate)
+
+        mock_ec.get_paginator.side_effect = get_paginator
 
         # mock ec2 describe_instance_types
         mock_ec2 = MagicMock()
@@ -28,11 +57,21 @@ class TestElastiCacheAnalyzer(unittest.TestCase):
             ]
         }
 
+        # one GetMetricData call answers both clusters' memory queries
+        mock_cw = MagicMock()
+
+        def get_metric_data(MetricDataQueries=None, **kw):
+            return {"MetricDataResults": [{"Id": q["Id"], "Values": [40.0, 20.0]} for q in MetricDataQueries]}
+
+        mock_cw.get_metric_data.side_effect = get_metric_data
+
         def client_factory(name, region_name=None):
             if name == "elasticache":
                 return mock_ec
             if name == "ec2":
                 return mock_ec2
+            if name == "cloudwatch":
+                return mock_cw
             return MagicMock()
 
         boto3.Session.return_value.client.side_effect = client_factory
@@ -48,9 +87,23 @@ class TestElastiCacheAnalyzer(unittest.TestCase):
         # memory: 2 * 8192 + 1 * 16384
         self.assertEqual(out["summary"]["total_memory_mib"], 8192 * 2 + 16384 * 1)
 
+        # summary mode does not request per-node payloads
+        self.assertIn(("describe_cache_clusters", {"ShowCacheNodeInfo": False}), paginate_kwargs)
+        self.assertEqual(out["summary"]["total_replication_groups"], 1)
+        self.assertEqual(out["summary"]["total_shards"], 1)
+        self.assertEqual(out["summary"]["serverless_by_engine"], {"valkey": 1})
+
         out2 = a.analyze(include_details=True)
+        self.assertIn(("describe_cache_clusters", {"ShowCacheNodeInfo": True}), paginate_kwargs)
         self.assertIn("clusters", out2)
         self.assertEqual(out2["clusters"][0]["cache_cluster_id"], "cc1")
+        self.assertEqual(out2["clusters"][0]["replication_group_id"], "rg1")
+        self.assertEqual(out2["clusters"][0]["role"], "primary")
+        self.assertEqual(out2["replication_groups"][0]["replicas_per_shard"], [1])
+        self.assertEqual(out2["serverless_caches"][0]["name"], "sc1")
+        self.assertEqual(mock_cw.get_metric_data.call_count, 1)
+        self.assertEqual(out2["clusters"][0]["utilization"]["memory_usage_percent"]["average"], 30.0)
+        self.assertEqual(out2["clusters"][1]["utilization"]["bytes_used_for_cache"]["latest"], 40.0)
 
 
 if __name__ == "__main__":
@@ -8,25 +8,63 @@ class TestELBAnalyzer(unittest.TestCase):
     def test_elb_summary_and_details(self):
         import boto3
 
-        mock_client = MagicMock()
+        # elb v1: one classic LB per page, the second without instances
+        mock_v1 = MagicMock()
+        mock_v1.get_paginator.return_value.paginate.return_value = [
+            {"LoadBalancerDescriptions": [{"LoadBalancerName": "lb1", "DNSName": "lb1.example.com", "Instances": [{"InstanceId": "i-1"}]}]},
+            {"LoadBalancerDescriptions": [{"LoadBalancerName": "lb1b", "DNSName": "lb1b.example.com", "Instances": []}]},
+        ]
+        mock_v1.describe_tags.return_value = {"TagDescriptions": [{"LoadBalancerName": "lb1", "Tags": [{"Key": "env", "Value": "prod"}]}]}
 
-        # elb v1
-        mock_client.describe_load_balancers.return_value = {"LoadBalancerDescriptions": [{"LoadBalancerName": "lb1", "DNSName": "lb1.example.com"}]}
-        # elbv2
-        mock_client.describe_load_balancers.return_value = {"LoadBalancers": [{"LoadBalancerArn": "arn:lb2", "DNSName": "lb2.example.com", "Type": "application"}]}
+        # elbv2: an ALB with an empty target group, an NLB with one target, a GWLB with none
+        v2_pages = {
+            "describe_load_balancers": [
+                {"LoadBalancers": [
+                    {"LoadBalancerArn": "arn:lb2", "DNSName": "lb2.example.com", "Type": "application"},
+                    {"LoadBalancerArn": "arn:lb3", "DNSName": "lb3.example.com", "Type": "network"},
+                    {"LoadBalancerArn": "arn:lb4", "DNSName": "lb4.example.com", "Type": "gateway"},
+                ]}
+            ],
+            "describe_target_groups": [
+                {"TargetGroups": [
+                    {"TargetGroupArn": "arn:tg-a", "LoadBalancerArns": ["arn:lb2"], "Protocol": "HTTP", "Port": 80},
+                    {"TargetGroupArn": "arn:tg-b", "LoadBalancerArns": ["arn:lb3"], "Protocol": "TCP", "Port": 443},
+                    {"TargetGroupArn": "arn:tg-orphan", "LoadBalancerArns": []},
+                ]}
+            ],
+        }
+        mock_v2 = MagicMock()
+        mock_v2.get_paginator.side_effect = lambda op: MagicMock(paginate=lambda **kw: v2_pages[op])
+        mock_v2.describe_target_health.side_effect = lambda TargetGroupArn=None: {
+            "TargetHealthDescriptions": [{"Target": {"Id": "i-2"}}] if TargetGroupArn == "arn:tg-b" else []
+        }
+        mock_v2.describe_tags.return_value = {"TagDescriptions": []}
 
-        # boto3 Session will give same mock client for both elb and elbv2 in test
-        boto3.Session.return_value.client.return_value = mock_client
+        boto3.Session.return_value.client.side_effect = lambda name, region_name=None: mock_v1 if name == "elb" else mock_v2
 
         from aws_resources.analyzers.elb import ELBAnalyzer
 
         a = ELBAnalyzer()
         out = a.analyze()
-        # since we replaced return twice above, ensure it returns a dict structure; we can't assert counts strongly here in this mock setup
-        self.assertIn("summary", out)
+        self.assertEqual(out["summary"]["classic"], 2)
+        self.assertEqual(out["summary"]["alb_nlb"], 3)
+        self.assertEqual(out["summary"]["by_type"], {"application": 1, "network": 1, "gateway": 1})
+        self.assertEqual(out["summary"]["without_target_groups"], 1)
+        self.assertEqual(out["summary"]["classic_without_instances"], 1)
+        mock_v2.describe_target_health.assert_not_called()
 
         out2 = a.analyze(include_details=True)
         self.assertIn("load_balancers", out2)
+        self.assertEqual(out2["load_balancers"]["classic"][0]["tags"], {"env": "prod"})
+        lb2 = out2["load_balancers"]["alb_nlb"][0]
+        self.assertEqual(lb2["registered_targets"], 0)
+        self.assertEqual(lb2["target_groups"][0]["port"], 80)
+        self.assertEqual(out2["load_balancers"]["alb_nlb"][1]["registered_targets"], 1)
+        # lb1b (classic), lb2 (empty group) and lb4 (no groups)
+        self.assertEqual(out2["summary"]["zero_registered_targets"], 3)
+        # orphan target groups are not inspected
+        self.assertEqual(mock_v2.describe_target_health.call_count, 2)
+        mock_v2.describe_tags.assert_called_once_with(ResourceArns=["arn:lb2", "arn:lb3", "arn:lb4"])
 
 
 if __name__ == "__main__":
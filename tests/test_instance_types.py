@@ -0,0 +1,70 @@
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+class TestInstanceTypeLookup(unittest.TestCase):
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_resolve_batches_and_memoizes(self):
+        from aws_resources.analyzers.instance_types import InstanceTypeLookup
+
+        mock_ec2 = MagicMock()
+        mock_ec2.describe_instance_types.side_effect = lambda InstanceTypes=None: {
+            "InstanceTypes": [
+                {
+                    "InstanceType": t,
+                    "VCpuInfo": {"DefaultVCpus": 2},
+                    "MemoryInfo": {"SizeInMiB": 4096},
+                    "ProcessorInfo": {"SupportedArchitectures": ["arm64"] if "g." in t else ["x86_64"]},
+                }
+                for t in InstanceTypes
+            ]
+        }
+        session = MagicMock()
+        session.client.return_value = mock_ec2
+
+        lookup = InstanceTypeLookup(session)
+        types = [f"m5.{i}xlarge" for i in range(150)] + ["m6g.large", None]
+        specs = lookup.resolve(types)
+        self.assertEqual(len(specs), 151)
+        self.assertEqual(specs["m6g.large"]["architecture"], "arm")
+        self.assertEqual(specs["m5.0xlarge"], {"vCPU": 2, "memory_mib": 4096, "architecture": "x86"})
+        # 151 types -> two batched calls; a repeat lookup is served from memory
+        self.assertEqual(mock_ec2.describe_instance_types.call_count, 2)
+        lookup.resolve(["m6g.large"])
+        self.assertEqual(mock_ec2.describe_instance_types.call_count, 2)
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_invalid_type_only_loses_itself(self):
+        from aws_resources.analyzers.instance_types import InstanceTypeLookup
+
+        class ClientError(Exception):
+            def __init__(self, code):
+                super().__init__(code)
+                self.response = {"Error": {"Code": code}}
+
+        def describe(InstanceTypes=None):
+            if "q9.large" in InstanceTypes:
+                # real AWS rejects the whole call for one unknown type
+                raise ClientError("InvalidInstanceType")
+            return {"InstanceTypes": [{"InstanceType": t, "VCpuInfo": {"DefaultVCpus": 4}, "MemoryInfo": {"SizeInMiB": 8192}} for t in InstanceTypes]}
+
+        mock_ec2 = MagicMock()
+        mock_ec2.describe_instance_types.side_effect = describe
+        session = MagicMock()
+        session.client.return_value = mock_ec2
+
+        specs = InstanceTypeLookup(session).resolve(["m5.xlarge", "q9.large", "r6g.xlarge"])
+        self.assertEqual(sorted(specs), ["m5.xlarge", "r6g.xlarge"])
+        # the rejected batch, then one call per type
+        self.assertEqual(mock_ec2.describe_instance_types.call_count, 4)
+
+        # other errors are not retried type by type
+        mock_ec2.describe_instance_types.reset_mock()
+        mock_ec2.describe_instance_types.side_effect = ClientError("UnauthorizedOperation")
+        self.assertEqual(InstanceTypeLookup(session).resolve(["m5.large", "c5.large"]), {})
+        self.assertEqual(mock_ec2.describe_instance_types.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,6 @@
 import sys
+import tempfile
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -8,21 +10,84 @@ class TestKMSAnalyzer(unittest.TestCase):
     def test_kms_summary_and_details(self):
         import boto3
 
+        pages = {
+            "list_keys": [{"Keys": [
+                {"KeyId": f"key-{i}", "KeyArn": f"arn:aws:kms:us-east-1:111122223333:key/key-{i}"} for i in (1, 2, 3)
+            ]}],
+            "list_aliases": [
+                {"Aliases": [{"AliasName": "alias/app", "TargetKeyId": "key-1"}]},
+                {"Aliases": [{"AliasName": "alias/aws/s3", "TargetKeyId": "key-3"}, {"AliasName": "alias/unused"}]},
+            ],
+        }
         mock_client = MagicMock()
-        mock_client.get_paginator.return_value.paginate.return_value = [{"Keys": [{"KeyId": "key-1"}, {"KeyId": "key-2"}]}]
-        mock_client.describe_key.side_effect = lambda KeyId=None: {"KeyMetadata": {"Description": f"desc-{KeyId}", "KeyState": "Enabled"}}
+        mock_client.get_paginator.side_effect = lambda op: MagicMock(paginate=lambda: pages[op])
+        states = {"key-1": "Enabled", "key-2": "PendingDeletion", "key-3": "Enabled"}
+        mock_client.describe_key.side_effect = lambda KeyId=None: {
+            "KeyMetadata": {"Description": f"desc-{KeyId}", "KeyState": states[KeyId], "KeyManager": "CUSTOMER"}
+        }
 
         boto3.Session.return_value.client.return_value = mock_client
 
         from aws_resources.analyzers.kms import KMSAnalyzer
 
-        a = KMSAnalyzer()
-        out = a.analyze()
-        self.assertEqual(out["summary"]["total_keys"], 2)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            a = KMSAnalyzer(cache_dir=cache_dir)
+            out = a.analyze()
+            self.assertEqual(out["summary"]["total_keys"], 3)
+            self.assertEqual(out["summary"]["by_manager"], {"customer": 2, "aws": 1})
+            mock_client.describe_key.assert_not_called()
 
-        out2 = a.analyze(include_details=True)
-        self.assertIn("keys", out2)
-        self.assertEqual(out2["keys"][0]["key_state"], "Enabled")
+            out2 = a.analyze(include_details=True)
+            self.assertIn("keys", out2)
+            self.assertEqual(out2["keys"][0]["key_state"], "Enabled")
+            self.assertEqual(out2["keys"][0]["aliases"], ["alias/app"])
+            self.assertEqual(out2["keys"][2]["key_manager"], "AWS")
+            self.assertEqual(out2["summary"]["by_state"], {"Enabled": 2, "PendingDeletion": 1})
+            # the AWS-managed key is not described
+            self.assertEqual(mock_client.describe_key.call_count, 2)
+
+            # a later run within the TTL serves the enabled key from the cache;
+            # only the key pending deletion is described again
+            out3 = KMSAnalyzer(cache_dir=cache_dir).analyze(include_details=True)
+            self.assertEqual(mock_client.describe_key.call_count, 3)
+            self.assertEqual(mock_client.describe_key.call_args.kwargs["KeyId"], "key-2")
+            self.assertEqual(out3["summary"]["described_keys"], 1)
+            self.assertEqual(out3["keys"][0]["description"], "desc-key-1")
+
+            # once the TTL has passed, an enabled key that was disabled meanwhile is picked up
+            states["key-1"] = "Disabled"
+            with patch("aws_resources.cache.time.time", return_value=time.time() + 2 * 86400):
+                out4 = KMSAnalyzer(cache_dir=cache_dir).analyze(include_details=True)
+            self.assertEqual(mock_client.describe_key.call_count, 5)
+            self.assertEqual(out4["keys"][0]["key_state"], "Disabled")
+
+            # the two keys in volatile states plus the AWS-managed key
+            KMSAnalyzer(cache_dir=cache_dir, include_aws_managed=True).analyze(include_details=True)
+            self.assertEqual(mock_client.describe_key.call_count, 8)
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_kms_cache_is_scoped_per_account_and_region(self):
+        import boto3
+
+        def client_for(region):
+            keys = [{"KeyId": f"{region}-key", "KeyArn": f"arn:aws:kms:{region}:111122223333:key/{region}-key"}]
+            pages = {"list_keys": [{"Keys": keys}], "list_aliases": [{"Aliases": []}]}
+            client = MagicMock()
+            client.get_paginator.side_effect = lambda op: MagicMock(paginate=lambda: pages[op])
+            client.describe_key.side_effect = lambda KeyId=None: {"KeyMetadata": {"KeyState": "Enabled"}}
+            return client
+
+        clients = {r: client_for(r) for r in ("us-east-1", "eu-west-1")}
+        boto3.Session.return_value.client.side_effect = lambda svc, region_name=None: clients[region_name]
+
+        from aws_resources.analyzers.kms import KMSAnalyzer
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for region in ("us-east-1", "eu-west-1", "us-east-1", "eu-west-1"):
+                KMSAnalyzer(region_name=region, cache_dir=cache_dir).analyze(include_details=True)
+            # every region was described once; the other region's run kept its entries
+            self.assertEqual(clients["us-east-1"].describe_key.call_count, 1)
+            self.assertEqual(clients["eu-west-1"].describe_key.call_count, 1)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import importlib
 import sys
 import unittest
 from unittest.mock import MagicMock, patch
@@ -22,14 +23,90 @@ class TestLambdaAnalyzer(unittest.TestCase):
 
         boto3.Session.return_value.client.return_value = mock_client
 
-        from aws_resources.analyzers.lambda import LambdaAnalyzer
+        LambdaAnalyzer = importlib.import_module("aws_resources.analyzers.lambda").LambdaAnalyzer
 
-        a = LambdaAnalyzer()
+        a = LambdaAnalyzer(collect_utilization=False)
         out = a.analyze()
 
         self.assertEqual(out["summary"]["total_functions"], 2)
         self.assertEqual(out["summary"]["total_memory_mb"], 128 + 256)
         self.assertEqual(out["summary"]["by_runtime"]["python3.11"], 1)
+        self.assertNotIn("total_invocations", out["summary"])
+        mock_client.get_metric_data.assert_not_called()
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_lambda_usage_from_batched_metrics(self):
+        import boto3
+
+        functions = [{"FunctionName": f"fn{i}", "MemorySize": 1024 if i % 2 else 512, "Runtime": "python3.11" if i % 2 else "nodejs18.x"} for i in range(300)]
+        mock_lambda = MagicMock()
+        mock_lambda.get_paginator.return_value.paginate.return_value = [{"Functions": functions}]
+
+        # every function ran 100 times for 2s each (p95 2500ms) with one error
+        values = {("Invocations", "Sum"): 100.0, ("Errors", "Sum"): 1.0, ("Duration", "p95"): 2500.0, ("Duration", "Sum"): 200000.0}
+        mock_cw = MagicMock()
+
+        def get_metric_data(MetricDataQueries=None, **kw):
+            self.assertLessEqual(len(MetricDataQueries), 500)
+            results = []
+            for q in MetricDataQueries:
+                stat = q["MetricStat"]
+                if stat["Metric"]["Dimensions"][0]["Value"] == "fn0":
+                    continue  # no datapoints for an idle function
+                results.append({"Id": q["Id"], "Values": [values[(stat["Metric"]["MetricName"], stat["Stat"])]]})
+            return {"MetricDataResults": results}
+
+        mock_cw.get_metric_data.side_effect = get_metric_data
+        boto3.Session.return_value.client.side_effect = lambda name, region_name=None: mock_cw if name == "cloudwatch" else mock_lambda
+
+        LambdaAnalyzer = importlib.import_module("aws_resources.analyzers.lambda").LambdaAnalyzer
+
+        out = LambdaAnalyzer().analyze(include_details=True)
+        summary = out["summary"]
+
+        # 300 functions x 4 queries -> 3 GetMetricData calls
+        self.assertEqual(mock_cw.get_metric_data.call_count, 3)
+        self.assertEqual(summary["usage_window_days"], 30)
+        self.assertEqual(summary["total_invocations"], 299 * 100)
+        self.assertEqual(summary["total_errors"], 299)
+        # 200s x 1 GiB for the 150 odd functions, 200s x 0.5 GiB for 149 even ones
+        self.assertEqual(summary["usage_by_memory_mb"][1024]["gb_seconds"], 150 * 200.0)
+        self.assertEqual(summary["usage_by_memory_mb"][512]["gb_seconds"], 149 * 100.0)
+        self.assertEqual(summary["usage_by_runtime"]["python3.11"]["invocations"], 150 * 100)
+        self.assertEqual(summary["total_gb_seconds"], 150 * 200.0 + 149 * 100.0)
+        self.assertEqual(len(summary["top_by_gb_seconds"]), 10)
+        self.assertEqual(summary["top_by_gb_seconds"][0]["memory_mb"], 1024)
+        self.assertEqual(summary["by_runtime"]["python3.11"], 150)
+
+        fn0, fn1 = out["functions"][0], out["functions"][1]
+        self.assertEqual((fn0["invocations"], fn0["gb_seconds"], fn0["duration_p95_ms"]), (None, None, None))
+        self.assertEqual((fn1["invocations"], fn1["errors"], fn1["duration_p95_ms"], fn1["gb_seconds"]), (100, 1, 2500.0, 200.0))
+        self.assertTrue(summary["usage_complete"])
+        self.assertEqual(summary["usage_failed_batches"], 0)
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_lambda_usage_reports_failed_metric_batches(self):
+        import boto3
+
+        functions = [{"FunctionName": f"fn{i}", "MemorySize": 128, "Runtime": "python3.11"} for i in range(3)]
+        mock_lambda = MagicMock()
+        mock_lambda.get_paginator.return_value.paginate.return_value = [{"Functions": functions}]
+        mock_cw = MagicMock()
+        mock_cw.get_metric_data.side_effect = RuntimeError("Throttling")
+        boto3.Session.return_value.client.side_effect = lambda name, region_name=None: mock_cw if name == "cloudwatch" else mock_lambda
+
+        LambdaAnalyzer = importlib.import_module("aws_resources.analyzers.lambda").LambdaAnalyzer
+
+        out = LambdaAnalyzer().analyze(include_details=True)
+        summary = out["summary"]
+
+        # a failed request is reported, not shown as idle functions
+        self.assertFalse(summary["usage_complete"])
+        self.assertEqual(summary["usage_failed_batches"], 1)
+        self.assertEqual(summary["total_invocations"], 0)
+        self.assertEqual(summary["top_by_gb_seconds"], [])
+        self.assertIsNone(out["functions"][0]["invocations"])
+        self.assertIsNone(out["functions"][0]["gb_seconds"])
 
 
 if __name__ == "__main__":
@@ -8,3 +8,122 @@ def test_discover_scaffold_runs():
     assert proc.returncode == 0
     data = json.loads(proc.stdout)
     assert data.get("status") == "scaffold"
+
+
+def test_analyzer_options_reach_registered_factories():
+    import argparse
+    from unittest.mock import MagicMock, patch
+
+    with patch.dict(sys.modules, {"boto3": MagicMock()}):
+        from aws_resources.__main__ import analyzer_options
+        from aws_resources.analyzers import get_analyzer_for_service
+
+        assert analyzer_options(argparse.Namespace(sns_attributes=False)) == {}
+        options = analyzer_options(argparse.Namespace(sns_attributes=True))
+        assert options["sns"] == {"fetch_attributes": True}
+
+        sns = get_analyzer_for_service("Amazon Simple Notification Service")(options=options)
+        assert sns.fetch_attributes is True
+        # no options: analyzer defaults
+        assert get_analyzer_for_service("Amazon Simple Notification Service")().fetch_attributes is False
+
+
+def test_dynamodb_sample_size_option():
+    import argparse
+    from unittest.mock import MagicMock, patch
+
+    with patch.dict(sys.modules, {"boto3": MagicMock()}):
+        from aws_resources.__main__ import analyzer_options
+        from aws_resources.analyzers import get_analyzer_for_service
+
+        options = analyzer_options(argparse.Namespace(dynamodb_sample_size=50))
+        assert options["dynamodb"] == {"sample_size": 50}
+        assert get_analyzer_for_service("Amazon DynamoDB")(options=options).sample_size == 50
+        assert get_analyzer_for_service("Amazon DynamoDB")().sample_size is None
+
+
+def test_dynamodb_sample_size_must_be_positive():
+    import argparse
+    from unittest.mock import MagicMock, patch
+
+    import pytest
+
+    with patch.dict(sys.modules, {"boto3": MagicMock()}):
+        from aws_resources.__main__ import positive_int
+        from aws_resources.analyzers.dynamodb import DynamoDBAnalyzer
+
+        assert positive_int("3") == 3
+        for bad in ("0", "-5", "many"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                positive_int(bad)
+        with pytest.raises(ValueError):
+            DynamoDBAnalyzer(sample_size=-5)
+
+
+def test_route53_deep_scan_option():
+    import argparse
+    from unittest.mock import MagicMock, patch
+
+    with patch.dict(sys.modules, {"boto3": MagicMock()}):
+        from aws_resources.__main__ import analyzer_options
+        from aws_resources.analyzers import get_analyzer_for_service
+
+        options = analyzer_options(argparse.Namespace(route53_deep_scan=True))
+        assert options["route53"] == {"deep_scan": True}
+        assert get_analyzer_for_service("Amazon Route 53")(options=options).deep_scan is True
+        assert get_analyzer_for_service("Amazon Route 53")().deep_scan is False
+
+
+def test_s3_inventory_dir_option():
+    import argparse
+    from unittest.mock import MagicMock, patch
+
+    with patch.dict(sys.modules, {"boto3": MagicMock()}):
+        from aws_resources.__main__ import analyzer_options
+        from aws_resources.analyzers import get_analyzer_for_service
+
+        options = analyzer_options(argparse.Namespace(s3_inventory_dir="./inventory"))
+        assert options["s3"] == {"inventory_dir": "./inventory"}
+        assert get_analyzer_for_service("Amazon S3")(options=options).inventory_dir == "./inventory"
+
+
+def test_s3_deep_scan_option():
+    import argparse
+    from unittest.mock import MagicMock, patch
+
+    with patch.dict(sys.modules, {"boto3": MagicMock()}):
+        from aws_resources.__main__ import analyzer_options
+        from aws_resources.analyzers import get_analyzer_for_service
+
+        options = analyzer_options(argparse.Namespace(s3_deep_scan=True))
+        assert options["s3"] == {"deep_scan": True}
+        assert get_analyzer_for_service("Amazon S3")(options=options).deep_scan is True
+        assert get_analyzer_for_service("Amazon S3")().deep_scan is False
+
+
+def test_kms_include_aws_managed_option():
+    import argparse
+    from unittest.mock import MagicMock, patch
+
+    with patch.dict(sys.modules, {"boto3": MagicMock()}):
+        from aws_resources.__main__ import analyzer_options
+        from aws_resources.analyzers import get_analyzer_for_service
+
+        options = analyzer_options(argparse.Namespace(kms_include_aws_managed=True))
+        assert options["kms"] == {"include_aws_managed": True}
+        assert get_analyzer_for_service("AWS Key Management Service")(options=options).include_aws_managed is True
+        assert get_analyzer_for_service("AWS Key Management Service")().include_aws_managed is False
+
+
+def test_kms_cache_ttl_option():
+    import argparse
+    from unittest.mock import MagicMock, patch
+
+    with patch.dict(sys.modules, {"boto3": MagicMock()}):
+        from aws_resources.__main__ import analyzer_options
+        from aws_resources.analyzers import get_analyzer_for_service
+
+        options = analyzer_options(argparse.Namespace(kms_cache_ttl=3600.0))
+        assert options["kms"] == {"cache_ttl_seconds": 3600.0}
+        assert get_analyzer_for_service("AWS Key Management Service")(options=options).cache_ttl_seconds == 3600.0
+        assert get_analyzer_for_service("AWS Key Management Service")().cache_ttl_seconds == 24 * 3600
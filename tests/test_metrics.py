@@ -0,0 +1,92 @@
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+class TestCloudWatchMetrics(unittest.TestCase):
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_batches_pages_and_summarizes_per_region(self):
+        from aws_resources.analyzers.metrics import CloudWatchMetrics
+
+        clients = {}
+
+        def cloudwatch(region):
+            cw = MagicMock()
+
+            def get_metric_data(MetricDataQueries=None, NextToken=None, **kw):
+                self.assertLessEqual(len(MetricDataQueries), 500)
+                self.assertEqual(kw["ScanBy"], "TimestampDescending")
+                # every query's datapoints are split across two pages
+                if NextToken is None:
+                    return {"MetricDataResults": [{"Id": q["Id"], "Values": [4.0]} for q in MetricDataQueries], "NextToken": "t"}
+                return {"MetricDataResults": [{"Id": q["Id"], "Values": [2.0]} for q in MetricDataQueries]}
+
+            cw.get_metric_data.side_effect = get_metric_data
+            clients[region] = cw
+            return cw
+
+        session = MagicMock()
+        session.client.side_effect = lambda name, region_name=None: cloudwatch(region_name)
+
+        m = CloudWatchMetrics(session, "us-east-1")
+        for i in range(600):
+            m.add(f"i-{i}", "AWS/EC2", "CPUUtilization", {"InstanceId": f"i-{i}"}, label="cpu")
+        m.add("db-1", "AWS/RDS", "DatabaseConnections", {"DBInstanceIdentifier": "db-1"}, stat="Maximum", region="eu-west-1")
+        self.assertEqual(len(m), 601)
+
+        out = m.fetch()
+
+        self.assertEqual(set(clients), {"us-east-1", "eu-west-1"})
+        # 600 queries -> two batches, each followed by one NextToken page
+        self.assertEqual(clients["us-east-1"].get_metric_data.call_count, 4)
+        self.assertEqual(clients["eu-west-1"].get_metric_data.call_count, 2)
+        self.assertEqual(len(out), 601)
+        self.assertEqual(out["i-599"]["cpu"], {"latest": 4.0, "average": 3.0, "maximum": 4.0, "sum": 6.0, "datapoints": 2})
+        self.assertIn("DatabaseConnections", out["db-1"])
+
+        first = clients["eu-west-1"].get_metric_data.call_args_list[0].kwargs["MetricDataQueries"][0]
+        self.assertEqual(first["MetricStat"]["Stat"], "Maximum")
+        self.assertEqual(first["MetricStat"]["Metric"]["Dimensions"], [{"Name": "DBInstanceIdentifier", "Value": "db-1"}])
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_failed_batches_and_empty_series_are_omitted(self):
+        from aws_resources.analyzers.metrics import CloudWatchMetrics
+
+        cw = MagicMock()
+        cw.get_metric_data.return_value = {"MetricDataResults": [{"Id": "q0", "Values": []}, {"Id": "q1", "Values": [1.0]}]}
+        failing = MagicMock()
+        failing.get_metric_data.side_effect = RuntimeError("throttled")
+        session = MagicMock()
+        session.client.side_effect = lambda name, region_name=None: failing if region_name == "ap-south-1" else cw
+
+        m = CloudWatchMetrics(session, "us-east-1")
+        m.add("a", "AWS/Lambda", "Invocations", {"FunctionName": "a"}, stat="Sum")
+        m.add("b", "AWS/Lambda", "Invocations", {"FunctionName": "b"}, stat="Sum")
+        m.add("c", "AWS/Lambda", "Invocations", {"FunctionName": "c"}, stat="Sum", region="ap-south-1")
+
+        self.assertEqual(m.fetch(), {"b": {"Invocations": {"latest": 1.0, "average": 1.0, "maximum": 1.0, "sum": 1.0, "datapoints": 1}}})
+        self.assertEqual(m.failed_batches, 1)
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_batch_failing_on_later_page_drops_partial_series(self):
+        from aws_resources.analyzers.metrics import CloudWatchMetrics
+
+        cw = MagicMock()
+        cw.get_metric_data.side_effect = [
+            {"MetricDataResults": [{"Id": "q0", "Values": [5.0]}, {"Id": "q1", "Values": [2.0]}], "NextToken": "t1"},
+            RuntimeError("throttled"),
+        ]
+        session = MagicMock()
+        session.client.return_value = cw
+
+        m = CloudWatchMetrics(session, "us-east-1")
+        m.add("a", "AWS/Lambda", "Invocations", {"FunctionName": "a"}, stat="Sum")
+        m.add("b", "AWS/Lambda", "Invocations", {"FunctionName": "b"}, stat="Sum")
+
+        self.assertEqual(m.fetch(), {})
+        self.assertEqual(cw.get_metric_data.call_count, 2)
+        self.assertEqual(m.failed_batches, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
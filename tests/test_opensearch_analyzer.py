@@ -25,12 +25,10 @@ class TestOpenSearchAnalyzer(unittest.TestCase):
             "ClusterConfig": {"InstanceType": "r5.large.search", "InstanceCount": 1},
         }
 
+        statuses = {"d1": d1_status, "d2": d2_status}
+
         def describe_domains_side_effect(DomainNames=None):
-            if DomainNames and DomainNames[0] == "d1":
-                return {"DomainStatusList": [d1_status]}
-            if DomainNames and DomainNames[0] == "d2":
-                return {"DomainStatusList": [d2_status]}
-            return {"DomainStatusList": []}
+            return {"DomainStatusList": [statuses[n] for n in DomainNames or [] if n in statuses]}
 
         mock_os.describe_domains.side_effect = describe_domains_side_effect
 
@@ -62,10 +60,32 @@ class TestOpenSearchAnalyzer(unittest.TestCase):
         self.assertEqual(out["summary"]["total_vCPU"], 2 * 2 + 2 * 1)
         self.assertEqual(out["summary"]["total_memory_mib"], 8192 * 2 + 16384 * 1)
 
+        # both domains are described in a single batched call
+        self.assertEqual(mock_os.describe_domains.call_count, 1)
+
         out2 = a.analyze(include_details=True)
         self.assertIn("domains", out2)
         self.assertEqual(out2["domains"][0]["endpoint"], "d1.example.com")
 
+        # dedicated master and UltraWarm nodes count towards the totals
+        d2_status["ClusterConfig"].update({
+            "DedicatedMasterEnabled": True,
+            "DedicatedMasterType": "m5.large.search",
+            "DedicatedMasterCount": 3,
+            "WarmEnabled": True,
+            "WarmType": "ultrawarm1.medium.search",
+            "WarmCount": 2,
+        })
+        out3 = a.analyze()
+        self.assertEqual(out3["summary"]["total_nodes"], 8)
+        self.assertEqual(out3["summary"]["nodes_by_role"], {"data": 3, "master": 3, "warm": 2})
+        self.assertEqual(out3["summary"]["by_instance_type"]["m5.large"]["count"], 5)
+        self.assertEqual(out3["summary"]["by_instance_type"]["ultrawarm1.medium"]["vCPU_total"], 4)
+        self.assertEqual(out3["summary"]["total_vCPU"], 2 * 5 + 2 * 1 + 2 * 2)
+        # UltraWarm types are never sent to EC2 DescribeInstanceTypes
+        sent = mock_ec2.describe_instance_types.call_args.kwargs["InstanceTypes"]
+        self.assertNotIn("ultrawarm1.medium", sent)
+
 
 if __name__ == "__main__":
     unittest.main()
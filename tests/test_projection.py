@@ -0,0 +1,31 @@
+import json
+import sys
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+
+class TestProjection(unittest.TestCase):
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_project_pages_keeps_declared_fields_only(self):
+        from aws_resources.analyzers.projection import project_pages
+
+        created = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+        pages = [
+            {"Items": [{"Id": "a", "Endpoint": {"Address": "a.example.com", "Port": 1}, "Created": created, "Big": "x" * 1000}]},
+            {"Items": [{"Id": "b", "Endpoint": None, "Tags": [{"At": created}]}]},
+            {},
+        ]
+        fields = {"id": "Id", "endpoint": "Endpoint.Address", "created": "Created", "tags": "Tags", "upper": lambda i: i["Id"].upper()}
+
+        out = list(project_pages(pages, "Items", fields))
+
+        self.assertEqual(out[0], {"id": "a", "endpoint": "a.example.com", "created": "2024-05-01T12:00:00+00:00", "tags": None, "upper": "A"})
+        self.assertEqual(out[1]["endpoint"], None)
+        self.assertEqual(out[1]["tags"], [{"At": "2024-05-01T12:00:00+00:00"}])
+        # projected records are JSON-safe
+        json.dumps(out)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,40 +10,83 @@ class TestRDSAnalyzer(unittest.TestCase):
 
         mock_client = MagicMock()
 
-        # Paginator returns one page with two DB instances
-        mock_client.get_paginator.return_value.paginate.return_value = [
-            {
-                "DBInstances": [
-                    {
-                        "DBInstanceIdentifier": "db-1",
-                        "DBInstanceClass": "db.t3.micro",
-                        "Engine": "postgres",
-                        "DBInstanceStatus": "available",
-                        "MultiAZ": False,
-                        "AllocatedStorage": 20,
-                        "Endpoint": {"Address": "db-1.example.com"},
-                    },
-                    {
-                        "DBInstanceIdentifier": "db-2",
-                        "DBInstanceClass": "db.t3.medium",
-                        "Engine": "mysql",
-                        "DBInstanceStatus": "available",
-                        "MultiAZ": True,
-                        "AllocatedStorage": 100,
-                        "Endpoint": {"Address": "db-2.example.com"},
-                    },
-                ]
-            }
-        ]
-
-        # For this test, the same mock_client will be used for both rds and ec2
-        # clients; provide describe_instance_types response as well.
-        mock_client.describe_instance_types.return_value = {
-            "InstanceTypes": [
-                {"InstanceType": "t3.micro", "VCpuInfo": {"DefaultVCpus": 2}, "MemoryInfo": {"SizeInMiB": 1024}},
-                {"InstanceType": "t3.medium", "VCpuInfo": {"DefaultVCpus": 2}, "MemoryInfo": {"SizeInMiB": 4096}},
-            ]
+        pages = {
+            "describe_db_instances": [
+                {
+                    "DBInstances": [
+                        {
+                            "DBInstanceIdentifier": "db-1",
+                            "DBInstanceClass": "db.t3.micro",
+                            "Engine": "postgres",
+                            "DBInstanceStatus": "available",
+                            "MultiAZ": False,
+                            "AllocatedStorage": 20,
+                            "Endpoint": {"Address": "db-1.example.com"},
+                        },
+                        {
+                            "DBInstanceIdentifier": "db-2",
+                            "DBInstanceClass": "db.t3.medium",
+                            "Engine": "mysql",
+                            "DBInstanceStatus": "available",
+                            "MultiAZ": True,
+                            "AllocatedStorage": 100,
+                            "Endpoint": {"Address": "db-2.example.com"},
+                        },
+                    ]
+                },
+                {
+                    "DBInstances": [
+                        # Aurora instances report AllocatedStorage 1; it must not be counted
+                        {"DBInstanceIdentifier": "au-1", "DBInstanceClass": "db.r6g.2xlarge", "Engine": "aurora-postgresql", "AllocatedStorage": 1, "DBClusterIdentifier": "au"},
+                        {"DBInstanceIdentifier": "au-2", "DBInstanceClass": "db.serverless", "Engine": "aurora-postgresql", "AllocatedStorage": 1, "DBClusterIdentifier": "au"},
+                        # DocumentDB and Neptune share the endpoint and are dropped client-side
+                        {"DBInstanceIdentifier": "doc-1", "DBInstanceClass": "db.r5.large", "Engine": "docdb", "AllocatedStorage": 1},
+                        {"DBInstanceIdentifier": "nep-1", "DBInstanceClass": "db.r5.large", "Engine": "neptune", "AllocatedStorage": 1},
+                        # legacy Aurora MySQL 5.6 engine name
+                        {"DBInstanceIdentifier": "old-1", "DBInstanceClass": "db.t3.micro", "Engine": "aurora", "AllocatedStorage": 1},
+                        # Multi-AZ DB cluster members each report the cluster's 400 GiB
+                        {"DBInstanceIdentifier": "maz-1", "DBInstanceClass": "db.m6gd.large", "Engine": "postgres", "AllocatedStorage": 400, "DBClusterIdentifier": "maz"},
+                        {"DBInstanceIdentifier": "maz-2", "DBInstanceClass": "db.m6gd.large", "Engine": "postgres", "AllocatedStorage": 400, "DBClusterIdentifier": "maz"},
+                        {"DBInstanceIdentifier": "maz-3", "DBInstanceClass": "db.m6gd.large", "Engine": "postgres", "AllocatedStorage": 400, "DBClusterIdentifier": "maz"},
+                    ]
+                },
+            ],
+            "describe_db_clusters": [
+                {
+                    "DBClusters": [
+                        {
+                            "DBClusterIdentifier": "au",
+                            "Engine": "aurora-postgresql",
+                            "EngineMode": "provisioned",
+                            "AllocatedStorage": 1,
+                            "ServerlessV2ScalingConfiguration": {"MinCapacity": 0.5, "MaxCapacity": 16},
+                            "DBClusterMembers": [{"DBInstanceIdentifier": "au-1"}, {"DBInstanceIdentifier": "au-2"}],
+                        },
+                        {
+                            "DBClusterIdentifier": "maz",
+                            "Engine": "postgres",
+                            "AllocatedStorage": 400,
+                            "DBClusterMembers": [{"DBInstanceIdentifier": f"maz-{i}"} for i in (1, 2, 3)],
+                        },
+                    ]
+                }
+            ],
         }
+        paginators = {op: MagicMock(paginate=MagicMock(return_value=p)) for op, p in pages.items()}
+        mock_client.get_paginator.side_effect = lambda op: paginators[op]
+
+        # CloudWatch: connections for db-1 only, volume bytes for the Aurora cluster
+        def get_metric_data(MetricDataQueries=None, **kw):
+            results = []
+            for q in MetricDataQueries:
+                dims = q["MetricStat"]["Metric"]["Dimensions"][0]
+                if dims["Value"] == "db-1":
+                    results.append({"Id": q["Id"], "Values": [3.0, 5.0]})
+                elif dims["Name"] == "DBClusterIdentifier":
+                    results.append({"Id": q["Id"], "Values": [2.0 ** 30]})
+            return {"MetricDataResults": results}
+
+        mock_client.get_metric_data.side_effect = get_metric_data
 
         boto3.Session.return_value.client.return_value = mock_client
 
@@ -52,18 +95,113 @@ class TestRDSAnalyzer(unittest.TestCase):
         a = RDSAnalyzer()
         out = a.analyze()
 
-        self.assertEqual(out["summary"]["total_instances"], 2)
-        self.assertEqual(out["summary"]["total_allocated_storage_gib"], 120)
-        # vCPU mapping present in STATIC_RDS_CLASS_MAP for our test classes
-        self.assertEqual(out["summary"]["total_vCPU"], 2 + 2)
+        self.assertEqual(out["summary"]["total_instances"], 8)
+        # 20 + 100 from standalone instances, 400 once for the Multi-AZ DB cluster and none from its members
+        self.assertEqual(out["summary"]["total_allocated_storage_gib"], 520)
+        # classes resolve from the bundled catalog; db.serverless adds no fixed vCPU
+        self.assertEqual(out["summary"]["total_vCPU"], 2 + 2 + 8 + 2 + 3 * 2)
+        self.assertEqual(out["summary"]["total_memory_mib"], 1024 + 4096 + 65536 + 1024 + 3 * 8192)
         self.assertTrue("postgres" in out["summary"]["by_engine"])
         self.assertTrue("db.t3.micro" in out["summary"]["by_class"])
+        self.assertEqual(out["summary"]["total_clusters"], 2)
+        self.assertEqual(out["summary"]["serverless_instances"], 1)
+        self.assertEqual(out["summary"]["total_acu_range"], {"min": 0.5, "max": 16})
+        self.assertNotIn("unmapped_classes", out["summary"])
+        self.assertNotIn("docdb", out["summary"]["by_engine"])
+        self.assertNotIn("neptune", out["summary"]["by_engine"])
+        self.assertEqual(out["summary"]["by_engine"]["aurora"], 1)
+        # no engine allowlist server-side: engines it would not name stay visible
+        for paginator in paginators.values():
+            self.assertNotIn("Filters", paginator.paginate.call_args.kwargs)
+        # summary costs only the two listings
+        mock_client.describe_instance_types.assert_not_called()
+        mock_client.get_metric_data.assert_not_called()
 
-        # verify include_details returns instance list
+        # verify include_details returns instance and cluster lists
         out_details = a.analyze(include_details=True)
         self.assertIn("instances", out_details)
-        self.assertEqual(len(out_details["instances"]), 2)
+        self.assertEqual(len(out_details["instances"]), 8)
         self.assertEqual(out_details["instances"][0]["id"], "db-1")
+        self.assertEqual(out_details["instances"][0]["utilization"]["database_connections"]["maximum"], 5.0)
+        self.assertEqual(out_details["instances"][1]["utilization"], {})
+        self.assertEqual(out_details["instances"][3]["cluster_id"], "au")
+        self.assertEqual(out_details["instances"][3]["acu_range"], {"min": 0.5, "max": 16})
+        self.assertEqual([i["allocated_storage_gib"] for i in out_details["instances"][5:]], [0, 0, 0])
+        self.assertEqual(out_details["instances"][5]["cluster_id"], "maz")
+        self.assertEqual(out_details["clusters"][0]["volume_bytes_used"], 2 ** 30)
+        self.assertEqual(out_details["clusters"][0]["members"], ["au-1", "au-2"])
+        self.assertNotIn("volume_bytes_used", out_details["clusters"][1])
+        self.assertEqual(mock_client.get_metric_data.call_count, 1)
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_rds_class_catalog(self):
+        from aws_resources.analyzers.rds_classes import resolve_db_class
+
+        self.assertEqual(resolve_db_class("db.x2g.large"), {"vCPU": 2, "memory_mib": 32768, "serverless": False})
+        self.assertEqual(resolve_db_class("db.r5.24xlarge")["memory_mib"], 96 * 8192)
+        self.assertEqual(resolve_db_class("db.m3.medium")["vCPU"], 1)
+        self.assertEqual(resolve_db_class("db.r4.large")["memory_mib"], 15616)
+        self.assertEqual(resolve_db_class("db.r5.4xlarge.tpc2.mem4x"), {"vCPU": 16, "memory_mib": 524288, "serverless": False})
+        self.assertEqual(resolve_db_class("db.r5.2xlarge.tpc1.mem2x")["vCPU"], 4)
+        self.assertTrue(resolve_db_class("db.serverless")["serverless"])
+        self.assertEqual(resolve_db_class("db.c6gd.medium"), {"vCPU": 1, "memory_mib": 2048, "serverless": False})
+        self.assertEqual(resolve_db_class("db.x2idn.16xlarge"), {"vCPU": 64, "memory_mib": 1048576, "serverless": False})
+        self.assertIsNone(resolve_db_class("db.q9.large"))
+        self.assertIsNone(resolve_db_class("m5.large"))
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_rds_unmapped_classes_fall_back_to_ec2(self):
+        import boto3
+
+        instances = [
+            {"DBInstanceIdentifier": "new-1", "DBInstanceClass": "db.r9gd.xlarge", "Engine": "postgres", "AllocatedStorage": 10},
+            {"DBInstanceIdentifier": "new-2", "DBInstanceClass": "db.r9gd.xlarge", "Engine": "postgres", "AllocatedStorage": 10},
+            {"DBInstanceIdentifier": "odd-1", "DBInstanceClass": "db.q9.large", "Engine": "mysql", "AllocatedStorage": 10},
+            {"DBInstanceIdentifier": "known", "DBInstanceClass": "db.m5.large", "Engine": "mysql", "AllocatedStorage": 10},
+        ]
+        pages = {"describe_db_instances": [{"DBInstances": instances}], "describe_db_clusters": [{"DBClusters": []}]}
+        mock_client = MagicMock()
+        mock_client.get_paginator.side_effect = lambda op: MagicMock(paginate=MagicMock(return_value=pages[op]))
+        mock_client.describe_instance_types.return_value = {
+            "InstanceTypes": [{"InstanceType": "r9gd.xlarge", "VCpuInfo": {"DefaultVCpus": 4}, "MemoryInfo": {"SizeInMiB": 32768}}]
+        }
+        boto3.Session.return_value.client.return_value = mock_client
+
+        from aws_resources.analyzers.rds import RDSAnalyzer
+
+        out = RDSAnalyzer(collect_utilization=False).analyze(include_details=True)
+
+        # one batched lookup for the catalog misses only
+        mock_client.describe_instance_types.assert_called_once()
+        self.assertEqual(sorted(mock_client.describe_instance_types.call_args.kwargs["InstanceTypes"]), ["q9.large", "r9gd.xlarge"])
+        self.assertEqual(out["summary"]["total_vCPU"], 4 + 4 + 2)
+        self.assertEqual(out["summary"]["total_memory_mib"], 2 * 32768 + 8192)
+        self.assertEqual(out["summary"]["unmapped_classes"], ["db.q9.large"])
+        self.assertTrue(out["instances"][0]["mapping_supported"])
+        self.assertEqual(out["instances"][0]["ec2_instance_type"], "r9gd.xlarge")
+        self.assertFalse(out["instances"][2]["mapping_supported"])
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_rds_cluster_listing_failure_keeps_instances(self):
+        import boto3
+
+        instances = [{"DBInstanceIdentifier": "db-1", "DBInstanceClass": "db.m5.large", "Engine": "mysql", "AllocatedStorage": 10}]
+
+        def paginate(op):
+            if op == "describe_db_clusters":
+                raise RuntimeError("AccessDenied")
+            return [{"DBInstances": instances}]
+
+        mock_client = MagicMock()
+        mock_client.get_paginator.side_effect = lambda op: MagicMock(paginate=lambda: paginate(op))
+        boto3.Session.return_value.client.return_value = mock_client
+
+        from aws_resources.analyzers.rds import RDSAnalyzer
+
+        out = RDSAnalyzer(collect_utilization=False).analyze()
+        self.assertEqual(out["summary"]["total_instances"], 1)
+        self.assertEqual(out["summary"]["total_allocated_storage_gib"], 10)
+        self.assertEqual(out["summary"]["total_clusters"], 0)
 
 
 if __name__ == "__main__":
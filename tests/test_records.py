@@ -0,0 +1,40 @@
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+class TestRecords(unittest.TestCase):
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_slotted_record_interns_and_serializes(self):
+        from aws_resources.analyzers.records import EC2InstanceRecord, LambdaFunctionRecord, RDSInstanceRecord
+
+        a = EC2InstanceRecord(instance_id="i-1", type="".join(["t3.", "micro"]), state="running")
+        b = EC2InstanceRecord(instance_id="i-2", type="".join(["t3.", "micro"]), state="running")
+        # categorical values share one string object
+        self.assertIs(a.type, b.type)
+        self.assertFalse(hasattr(a, "__dict__"))
+        with self.assertRaises(AttributeError):
+            a.unknown_field = 1
+
+        # enrichment happens in place; unset optional fields are omitted
+        a.vCPU = 2
+        self.assertEqual(a.to_dict(), {"instance_id": "i-1", "type": "t3.micro", "state": "running", "vCPU": 2})
+        self.assertIsNone(a.get("utilization"))
+
+        r = RDSInstanceRecord(**{"id": "db-1", "class": "db.t3.micro"})
+        self.assertEqual(r.to_dict(), {"id": "db-1", "class": "db.t3.micro"})
+
+        # only categorical values are interned; per-function handlers are not
+        def fresh(*parts):
+            return "".join(parts)
+
+        f1 = LambdaFunctionRecord(name="f1", runtime=fresh("python", "3.12"), handler=fresh("app.", "handler"))
+        f2 = LambdaFunctionRecord(name="f2", runtime=fresh("python", "3.12"), handler=fresh("app.", "handler"))
+        self.assertEqual(f1.runtime, f2.runtime)
+        self.assertIs(f1.runtime, f2.runtime)
+        self.assertEqual(f1.handler, f2.handler)
+        self.assertIsNot(f1.handler, f2.handler)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,24 +8,74 @@ class TestRoute53Analyzer(unittest.TestCase):
     def test_route53_summary_and_details(self):
         import boto3
 
+        records = {
+            "Z1": [{"ResourceRecordSets": [{"Type": "A"}, {"Type": "NS"}]}, {"ResourceRecordSets": [{"Type": "A"}]}],
+            "Z2": [{"ResourceRecordSets": [{"Type": "CNAME"}]}],
+        }
+        pages = {
+            # zones span two ListHostedZones pages
+            "list_hosted_zones": lambda: [
+                {"HostedZones": [{"Id": "Z1", "Name": "example.com.", "Config": {"PrivateZone": False}, "ResourceRecordSetCount": 3}]},
+                {"HostedZones": [{"Id": "Z2", "Name": "internal.", "Config": {"PrivateZone": True}, "ResourceRecordSetCount": 1}]},
+            ],
+            "list_resource_record_sets": lambda HostedZoneId=None: records[HostedZoneId],
+        }
         mock_client = MagicMock()
-        mock_client.list_hosted_zones.return_value = {"HostedZones": [{"Id": "Z1", "Name": "example.com.", "Config": {"PrivateZone": False}}]}
+        mock_client.get_paginator.side_effect = lambda op: MagicMock(paginate=pages[op])
+        mock_client.get_health_check_count.return_value = {"HealthCheckCount": 4}
 
         boto3.Session.return_value.client.return_value = mock_client
 
         from aws_resources.analyzers.route53 import Route53Analyzer
 
-        a = Route53Analyzer()
+        a = Route53Analyzer(top_n=1)
         out = a.analyze()
-        self.assertEqual(out["summary"]["total_hosted_zones"], 1)
+        self.assertEqual(out["summary"]["total_hosted_zones"], 2)
         # breakdown by type: public vs private
         self.assertIn("by_type", out["summary"])
         self.assertEqual(out["summary"]["by_type"]["public"], 1)
-        self.assertEqual(out["summary"]["by_type"]["private"], 0)
+        self.assertEqual(out["summary"]["by_type"]["private"], 1)
+        self.assertEqual(out["summary"]["total_record_sets"], 4)
+        self.assertEqual(out["summary"]["record_sets_by_zone_type"], {"public": 3, "private": 1})
+        self.assertEqual([z["id"] for z in out["summary"]["largest_zones"]], ["Z1"])
+        self.assertEqual(out["summary"]["total_health_checks"], 4)
+        self.assertNotIn("record_sets_by_type", out["summary"])
 
         out2 = a.analyze(include_details=True)
         self.assertIn("hosted_zones", out2)
         self.assertEqual(out2["hosted_zones"][0]["name"], "example.com.")
+        self.assertEqual(out2["hosted_zones"][1]["record_set_count"], 1)
+
+        deep = Route53Analyzer(deep_scan=True).analyze(include_details=True)
+        self.assertEqual(deep["summary"]["record_sets_by_type"], {"A": 2, "NS": 1, "CNAME": 1})
+        self.assertEqual(deep["summary"]["failed_zones"], [])
+        self.assertEqual(deep["hosted_zones"][0]["record_sets_by_type"], {"A": 2, "NS": 1})
+        # concurrency stays under the 5 req/s account limit
+        self.assertLessEqual(Route53Analyzer(deep_scan=True, max_workers=16).max_workers, 5)
+
+        class ClientError(Exception):
+            response = {"Error": {"Code": "Throttling"}}
+
+        attempts = {"Z1": 0}
+
+        def flaky(HostedZoneId=None):
+            if HostedZoneId == "Z2":
+                raise RuntimeError("AccessDenied")
+            attempts["Z1"] += 1
+            if attempts["Z1"] == 1:
+                # throttled after the first page; the retry must not double count
+                def pages():
+                    yield records["Z1"][0]
+                    raise ClientError()
+                return pages()
+            return records["Z1"]
+
+        pages["list_resource_record_sets"] = flaky
+        with patch("aws_resources.analyzers.batching.time.sleep"):
+            partial = Route53Analyzer(deep_scan=True).analyze()
+        self.assertEqual(attempts["Z1"], 2)
+        self.assertEqual(partial["summary"]["record_sets_by_type"], {"A": 2, "NS": 1})
+        self.assertEqual(partial["summary"]["failed_zones"], ["Z2"])
 
 
 if __name__ == "__main__":
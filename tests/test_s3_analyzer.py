@@ -1,4 +1,5 @@
 import sys
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -10,32 +11,223 @@ class TestS3Analyzer(unittest.TestCase):
 
         mock_client = MagicMock()
 
-        mock_client.list_buckets.return_value = {
-            "Buckets": [
-                {"Name": "bucket-1", "CreationDate": "2020-01-01"},
-                {"Name": "bucket-2", "CreationDate": "2021-01-01"},
-            ]
-        }
+        # paginated ListBuckets; bucket-3 carries its region in the listing
+        mock_client.get_paginator.return_value.paginate.return_value = [
+            {
+                "Buckets": [
+                    {"Name": "bucket-1", "CreationDate": "2020-01-01"},
+                    {"Name": "bucket-2", "CreationDate": "2021-01-01"},
+                ],
+                "ContinuationToken": "t",
+            },
+            {"Buckets": [{"Name": "bucket-3", "CreationDate": "2022-01-01", "BucketRegion": "eu-west-1"}]},
+        ]
 
         # get_bucket_location should be called when include_details is True
-        mock_client.get_bucket_location.return_value = {"LocationConstraint": "us-west-2"}
+        mock_client.get_bucket_location.side_effect = lambda Bucket=None: {"LocationConstraint": "us-west-2"} if Bucket == "bucket-1" else {"LocationConstraint": None}
 
         boto3.Session.return_value.client.return_value = mock_client
 
         from aws_resources.analyzers.s3 import S3Analyzer
 
-        # default summary-only
-        a = S3Analyzer()
-        out = a.analyze()
-        self.assertEqual(out["summary"]["total_buckets"], 2)
-
-        # with details
-        a2 = S3Analyzer()
-        out2 = a2.analyze(include_details=True)
-        self.assertEqual(out2["summary"]["total_buckets"], 2)
-        self.assertIn("buckets", out2)
-        self.assertEqual(len(out2["buckets"]), 2)
-        self.assertEqual(out2["buckets"][0]["name"], "bucket-1")
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # default summary-only
+            a = S3Analyzer(cache_dir=cache_dir)
+            out = a.analyze()
+            self.assertEqual(out["summary"]["total_buckets"], 3)
+            mock_client.get_bucket_location.assert_not_called()
+
+            # with details
+            a2 = S3Analyzer(cache_dir=cache_dir)
+            out2 = a2.analyze(include_details=True)
+            self.assertEqual(out2["summary"]["total_buckets"], 3)
+            self.assertIn("buckets", out2)
+            self.assertEqual(len(out2["buckets"]), 3)
+            self.assertEqual(out2["buckets"][0]["name"], "bucket-1")
+            self.assertEqual([b["region"] for b in out2["buckets"]], ["us-west-2", "us-east-1", "eu-west-1"])
+            self.assertEqual(out2["summary"]["by_region"], {"us-west-2": 1, "us-east-1": 1, "eu-west-1": 1})
+            # the bucket with BucketRegion is never looked up
+            self.assertEqual(mock_client.get_bucket_location.call_count, 2)
+            # MaxBuckets is what makes ListBuckets report BucketRegion at all
+            self.assertEqual(mock_client.get_paginator.call_args_list[0].args, ("list_buckets",))
+            list_call = mock_client.get_paginator.return_value.paginate.call_args_list[0]
+            self.assertEqual(list_call.kwargs["PaginationConfig"]["PageSize"], 10000)
+
+            # regions are cached across runs
+            out3 = S3Analyzer(cache_dir=cache_dir).analyze(include_details=True)
+            self.assertEqual(mock_client.get_bucket_location.call_count, 2)
+            self.assertEqual(out3["buckets"][1]["region"], "us-east-1")
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_s3_region_cache_is_scoped_per_account(self):
+        from aws_resources.analyzers.s3 import S3Analyzer
+
+        def account(owner, bucket):
+            client = MagicMock()
+            client.get_paginator.return_value.paginate.return_value = [
+                {"Buckets": [{"Name": bucket, "CreationDate": "2020-01-01"}], "Owner": {"ID": owner}}
+            ]
+            client.get_bucket_location.return_value = {"LocationConstraint": "eu-west-1"}
+            return client
+
+        accounts = {"a": account("owner-a", "bucket-a"), "b": account("owner-b", "bucket-b")}
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for name in ("a", "b", "a", "b"):
+                a = S3Analyzer(cache_dir=cache_dir, collect_metrics=False)
+                a.client = accounts[name]
+                out = a.analyze(include_details=True)
+                self.assertEqual(out["buckets"][0]["region"], "eu-west-1")
+            # switching accounts did not evict the other account's regions
+            self.assertEqual(accounts["a"].get_bucket_location.call_count, 1)
+            self.assertEqual(accounts["b"].get_bucket_location.call_count, 1)
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_s3_legacy_eu_location_maps_to_eu_west_1(self):
+        from aws_resources.analyzers.s3 import S3Analyzer
+
+        client = MagicMock()
+        client.get_paginator.return_value.paginate.return_value = [{"Buckets": [{"Name": "old", "CreationDate": "2010-01-01"}]}]
+        client.get_bucket_location.return_value = {"LocationConstraint": "EU"}
+        with tempfile.TemporaryDirectory() as cache_dir:
+            a = S3Analyzer(cache_dir=cache_dir, collect_metrics=False)
+            a.client = client
+            out = a.analyze(include_details=True)
+        self.assertEqual(out["buckets"][0]["region"], "eu-west-1")
+        self.assertEqual(out["summary"]["by_region"], {"eu-west-1": 1})
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_s3_cloudwatch_storage_metrics(self):
+        from aws_resources.analyzers.s3 import S3Analyzer
+
+        buckets = [{"Name": f"b{i}", "CreationDate": "2020-01-01", "BucketRegion": "us-east-1" if i % 2 else "eu-west-1"} for i in range(600)]
+        s3 = MagicMock()
+        s3.get_paginator.return_value.paginate.return_value = [{"Buckets": buckets}]
+
+        def dims(name, storage):
+            return [{"Name": "BucketName", "Value": name}, {"Name": "StorageType", "Value": storage}]
+
+        cw_clients = {}
+
+        def cloudwatch(region):
+            names = [b["Name"] for b in buckets if b["BucketRegion"] == region]
+            metrics = [{"MetricName": "BucketSizeBytes", "Dimensions": dims(n, "StandardStorage")} for n in names]
+            metrics += [{"MetricName": "BucketSizeBytes", "Dimensions": dims(names[0], "GlacierStorage")}]
+            metrics += [{"MetricName": "NumberOfObjects", "Dimensions": dims(n, "AllStorageTypes")} for n in names]
+            metrics += [{"MetricName": "BucketSizeBytes", "Dimensions": dims("someone-elses", "StandardStorage")}]
+            cw = MagicMock()
+            cw.get_paginator.return_value.paginate.return_value = [{"Metrics": metrics}]
+
+            def get_metric_data(MetricDataQueries=None, **kw):
+                self.assertLessEqual(len(MetricDataQueries), 500)
+                results = []
+                for q in MetricDataQueries:
+                    metric = q["MetricStat"]["Metric"]
+                    value = 10.0 if metric["MetricName"] == "NumberOfObjects" else 1000.0
+                    results.append({"Id": q["Id"], "Values": [value, 1.0]})
+                return {"MetricDataResults": results}
+
+            cw.get_metric_data.side_effect = get_metric_data
+            cw_clients[region] = cw
+            return cw
+
+        a = S3Analyzer(collect_metrics=True)
+        a.client = s3
+        a.session = MagicMock()
+        a.session.client.side_effect = lambda name, region_name=None: cloudwatch(region_name)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            a.cache_dir = cache_dir
+            out = a.analyze(include_details=True)
+
+        self.assertEqual(set(cw_clients), {"us-east-1", "eu-west-1"})
+        # 300 buckets per region -> 601 series -> two GetMetricData calls per region
+        self.assertEqual([cw.get_metric_data.call_count for cw in cw_clients.values()], [2, 2])
+        b0 = out["buckets"][0]
+        self.assertEqual(b0["size_bytes_by_storage_type"], {"StandardStorage": 1000, "GlacierStorage": 1000})
+        self.assertEqual(b0["size_bytes"], 2000)
+        self.assertEqual(b0["object_count"], 10)
+        self.assertNotIn("note", b0)
+        self.assertEqual(out["summary"]["total_object_count"], 6000)
+        self.assertEqual(out["summary"]["size_bytes_by_storage_type"]["GlacierStorage"], 2000)
+        self.assertEqual(out["summary"]["total_size_bytes"], 600 * 1000 + 2000)
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_s3_inventory_merge(self):
+        from aws_resources.analyzers.s3 import S3Analyzer
+
+        s3 = MagicMock()
+        s3.get_paginator.return_value.paginate.return_value = [
+            {"Buckets": [{"Name": "big", "CreationDate": "2020-01-01", "BucketRegion": "us-east-1"}, {"Name": "small", "CreationDate": "2020-01-01", "BucketRegion": "us-east-1"}]}
+        ]
+        stats = {
+            "object_count": 3,
+            "size_bytes": 30,
+            "by_storage_class": {"STANDARD": {"object_count": 2, "size_bytes": 20}, "INTELLIGENT_TIERING": {"object_count": 1, "size_bytes": 10}},
+            "by_age": {},
+            "by_prefix": {"logs/": {"object_count": 3, "size_bytes": 30}},
+            "failed_files": 1,
+        }
+
+        with tempfile.TemporaryDirectory() as d, patch("aws_resources.analyzers.s3.S3InventoryCollector") as collector:
+            collector.return_value.collect.return_value = {"big": stats, "other-account-bucket": stats}
+            a = S3Analyzer(cache_dir=d, collect_metrics=False, inventory_dir=d)
+            a.client = s3
+            out = a.analyze(include_details=True)
+
+        collector.assert_called_once_with(d)
+        big, small = out["buckets"]
+        self.assertEqual(big["inventory"], stats)
+        self.assertEqual((big["size_bytes"], big["object_count"]), (30, 3))
+        self.assertNotIn("note", big)
+        self.assertIn("note", small)
+        self.assertEqual(out["summary"]["inventory_buckets"], 1)
+        self.assertEqual(out["summary"]["inventory_failed_files"], 1)
+        self.assertEqual(out["summary"]["total_size_bytes"], 30)
+        # inventory classes fold into the CloudWatch storage-type breakdown
+        self.assertEqual(out["summary"]["size_bytes_by_storage_type"], {"StandardStorage": 20, "INTELLIGENT_TIERING": 10})
+
+    @patch.dict(sys.modules, {"boto3": MagicMock()})
+    def test_s3_deep_scan_budget_and_extrapolation(self):
+        from aws_resources.analyzers.s3 import S3Analyzer
+
+        def objects(n):
+            return [{"Key": "ignored", "Size": 10} for _ in range(n)]
+
+        pages = {
+            None: [{"Contents": [{"Key": "root.txt", "Size": 5}], "CommonPrefixes": [{"Prefix": "a/"}, {"Prefix": "b/"}, {"Prefix": "c/"}]}],
+            "a/": [{"Contents": objects(2)}],
+            "b/": [{"Contents": objects(2), "IsTruncated": True}, {"Contents": objects(2), "IsTruncated": True}, {"Contents": objects(2)}],
+            "c/": [{"Contents": objects(2)}],
+        }
+        regional = MagicMock()
+        regional.get_paginator.return_value.paginate.side_effect = lambda Bucket=None, Prefix=None, Delimiter=None: iter(pages[Prefix])
+
+        s3 = MagicMock()
+        s3.get_paginator.return_value.paginate.return_value = [{"Buckets": [{"Name": "dark", "CreationDate": "2020-01-01", "BucketRegion": "eu-west-1"}]}]
+
+        with tempfile.TemporaryDirectory() as d:
+            a = S3Analyzer(cache_dir=d, collect_metrics=False, deep_scan=True, max_workers=1)
+            a.client = s3
+            a.session = MagicMock()
+            a.session.client.return_value = regional
+
+            out = a.analyze(include_details=True)
+            full = out["buckets"][0]["deep_scan"]
+            self.assertTrue(full["complete"])
+            self.assertEqual((full["object_count"], full["size_bytes"]), (11, 105))
+            self.assertEqual(out["summary"]["deep_scanned_buckets"], 1)
+            self.assertEqual(out["summary"]["total_object_count"], 11)
+            self.assertEqual(out["summary"]["size_bytes_by_storage_type"], {"Unclassified": 105})
+            a.session.client.assert_called_with("s3", region_name="eu-west-1")
+
+            # budget runs out inside b/; c/ is never listed and both are extrapolated from a/
+            a.scan_max_objects = 4
+            partial = a.analyze(include_details=True)["buckets"][0]
+            scan = partial["deep_scan"]
+            self.assertFalse(scan["complete"])
+            self.assertTrue(scan["estimated"])
+            self.assertEqual((scan["scanned_object_count"], scan["prefixes_completed"]), (5, 1))
+            self.assertEqual((scan["object_count"], scan["size_bytes"]), (7, 65))
+            self.assertEqual(partial["object_count"], 7)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from aws_resources.collectors.s3_inventory import S3InventoryCollector, _prefix
+
+DAY_MS = 86400 * 1000
+# 2024-06-01T00:00:00Z
+CREATED_MS = 1717200000000
+
+
+def _write_report(root, bucket, created_ms, files):
+    """Write an inventory report laid out like `aws s3 sync` of the destination bucket."""
+    base = os.path.join(root, bucket, "daily")
+    os.makedirs(os.path.join(base, "data"), exist_ok=True)
+    entries = []
+    for i, rows in enumerate(files):
+        name = f"part-{created_ms}-{i}.csv.gz"
+        buf = io.StringIO()
+        csv.writer(buf, quoting=csv.QUOTE_ALL).writerows(rows)
+        with gzip.open(os.path.join(base, "data", name), "wt", encoding="utf-8") as f:
+            f.write(buf.getvalue())
+        entries.append({"key": f"inventory/{bucket}/daily/data/{name}", "size": 1})
+    entries.append({"key": f"inventory/{bucket}/daily/data/not-downloaded.csv.gz", "size": 1})
+    manifest_dir = os.path.join(base, str(created_ms))
+    os.makedirs(manifest_dir)
+    with open(os.path.join(manifest_dir, "manifest.json"), "w") as f:
+        json.dump(
+            {
+                "sourceBucket": bucket,
+                "fileFormat": "CSV",
+                "fileSchema": "Bucket, Key, Size, LastModifiedDate, StorageClass, IsDeleteMarker",
+                "creationTimestamp": str(created_ms),
+                "files": entries,
+            },
+            f,
+        )
+
+
+class TestS3InventoryCollector(unittest.TestCase):
+    def test_prefix(self):
+        self.assertEqual(_prefix("a/b/c.txt", 1), "a/")
+        self.assertEqual(_prefix("a/b/c.txt", 2), "a/b/")
+        self.assertEqual(_prefix("a/c.txt", 2), "a/")
+        self.assertEqual(_prefix("c.txt", 1), "")
+
+    def test_aggregates_latest_report(self):
+        with tempfile.TemporaryDirectory() as root:
+            _write_report(root, "logs", CREATED_MS - DAY_MS, [[["logs", "stale/x", "999", "2020-01-01T00:00:00.000Z", "STANDARD", "false"]]])
+            _write_report(
+                root,
+                "logs",
+                CREATED_MS,
+                [
+                    [
+                        ["logs", "app/2024/a.log", "100", "2024-05-30T00:00:00.000Z", "STANDARD", "false"],
+                        ["logs", "app/2023/b.log", "200", "2023-01-01T00:00:00.000Z", "GLACIER", "false"],
+                        ["logs", "app/2023/gone.log", "", "2023-01-01T00:00:00.000Z", "", "true"],
+                    ],
+                    [
+                        ["logs", "top%20level.txt", "5", "2024-03-01T00:00:00.000Z", "STANDARD_IA", "false"],
+                        ["logs", "web/index.html", "7", "2024-05-31T12:00:00.000Z", "STANDARD", "false"],
+                    ],
+                ],
+            )
+
+            serial = S3InventoryCollector(root, prefix_depth=2, max_workers=1).collect()
+            parallel = S3InventoryCollector(root, prefix_depth=2, max_workers=2).collect()
+
+        self.assertEqual(serial, parallel)
+        logs = serial["logs"]
+        self.assertEqual(logs["object_count"], 4)
+        self.assertEqual(logs["size_bytes"], 312)
+        self.assertEqual(logs["data_files"], 2)
+        self.assertEqual(logs["missing_files"], 1)
+        self.assertEqual(logs["failed_files"], 0)
+        self.assertEqual(logs["inventory_date"], "2024-06-01T00:00:00+00:00")
+        self.assertEqual(logs["by_storage_class"]["GLACIER"], {"object_count": 1, "size_bytes": 200})
+        self.assertEqual(logs["by_storage_class"]["STANDARD"], {"object_count": 2, "size_bytes": 107})
+        self.assertEqual(logs["by_age"]["0-30d"], {"object_count": 2, "size_bytes": 107})
+        self.assertEqual(logs["by_age"]["90-180d"], {"object_count": 1, "size_bytes": 5})
+        self.assertEqual(logs["by_age"]["365d+"], {"object_count": 1, "size_bytes": 200})
+        self.assertEqual(
+            logs["by_prefix"],
+            {
+                "app/2024/": {"object_count": 1, "size_bytes": 100},
+                "app/2023/": {"object_count": 1, "size_bytes": 200},
+                "": {"object_count": 1, "size_bytes": 5},
+                "web/": {"object_count": 1, "size_bytes": 7},
+            },
+        )
+
+    def test_unreadable_data_file_is_counted(self):
+        with tempfile.TemporaryDirectory() as root:
+            rows = [["logs", "a.log", "10", "2024-05-30T00:00:00.000Z", "STANDARD", "false"]]
+            _write_report(root, "logs", CREATED_MS, [rows, rows])
+            data_dir = os.path.join(root, "logs", "daily", "data")
+            with open(os.path.join(data_dir, sorted(os.listdir(data_dir))[0]), "wb") as f:
+                f.write(b"not gzip")
+
+            logs = S3InventoryCollector(root, max_workers=1).collect()["logs"]
+
+        self.assertEqual((logs["data_files"], logs["failed_files"]), (2, 1))
+        self.assertEqual(logs["size_bytes"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,29 +8,56 @@ class TestSESAnalyzer(unittest.TestCase):
     def test_ses_summary_and_details(self):
         import boto3
 
+        # 150 email identities over two pages plus one domain
+        emails = [f"user{i}@example.com" for i in range(150)]
+        listing = {
+            "EmailAddress": [{"Identities": emails[:100]}, {"Identities": emails[100:]}],
+            "Domain": [{"Identities": ["example.com"]}],
+        }
         mock_client = MagicMock()
-        # first call (EmailAddress) returns the email identity, second (Domain) returns empty
-        # Provide responses for two calls per analyze invocation (EmailAddress, Domain).
-        # The test calls analyze() twice, so provide four items.
-        mock_client.list_identities.side_effect = [
-            {"Identities": ["user@example.com"]},
-            {"Identities": []},
-            {"Identities": ["user@example.com"]},
-            {"Identities": []},
-        ]
-        mock_client.get_identity_verification_attributes.return_value = {"VerificationAttributes": {"user@example.com": {"VerificationStatus": "Success"}}}
+        mock_client.get_paginator.return_value.paginate.side_effect = lambda IdentityType=None: listing[IdentityType]
+
+        class ClientError(Exception):
+            response = {"Error": {"Code": "Throttling"}}
+
+        throttled = []
+
+        def verification(Identities=None):
+            self.assertLessEqual(len(Identities), 100)
+            if "user0@example.com" in Identities:
+                # the first chunk fails; others must still be reported
+                raise RuntimeError("access denied")
+            if not throttled:
+                # a throttled chunk is retried
+                throttled.append(1)
+                raise ClientError()
+            return {"VerificationAttributes": {i: {"VerificationStatus": "Success"} for i in Identities}}
+
+        mock_client.get_identity_verification_attributes.side_effect = verification
+        mock_client.get_identity_dkim_attributes.side_effect = lambda Identities=None: {
+            "DkimAttributes": {i: {"DkimEnabled": True, "DkimVerificationStatus": "Success"} for i in Identities if i == "example.com"}
+        }
 
         boto3.Session.return_value.client.return_value = mock_client
 
         from aws_resources.analyzers.ses import SESAnalyzer
 
-        a = SESAnalyzer()
+        a = SESAnalyzer(request_interval=0)
         out = a.analyze()
-        self.assertEqual(out["summary"]["total_identities"], 1)
+        self.assertEqual(out["summary"]["total_identities"], 151)
+        self.assertEqual(out["summary"]["by_identity_type"], {"EmailAddress": 150, "Domain": 1})
 
-        out2 = a.analyze(include_details=True)
+        with patch("aws_resources.analyzers.batching.time.sleep") as sleep:
+            out2 = a.analyze(include_details=True)
+        sleep.assert_called_once()
         self.assertIn("identities", out2)
-        self.assertEqual(out2["identities"][0]["verification_status"], "Success")
+        self.assertEqual(mock_client.get_identity_verification_attributes.call_count, 3)
+        self.assertEqual(out2["summary"]["failed_attribute_chunks"], 1)
+        self.assertIsNone(out2["identities"][0]["verification_status"])
+        self.assertEqual(out2["identities"][100]["verification_status"], "Success")
+        self.assertEqual(out2["summary"]["by_verification_status"], {"unknown": 100, "Success": 51})
+        self.assertEqual(out2["summary"]["dkim_enabled"], 1)
+        self.assertTrue(out2["identities"][-1]["dkim_enabled"])
 
 
 if __name__ == "__main__":
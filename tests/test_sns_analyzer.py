@@ -8,8 +8,18 @@ class TestSNSAnalyzer(unittest.TestCase):
     def test_sns_summary_and_details(self):
         import boto3
 
+        pages = {
+            "list_topics": [{"Topics": [{"TopicArn": "arn:topic:1"}, {"TopicArn": "arn:topic:2"}]}],
+            "list_subscriptions": [
+                {"Subscriptions": [
+                    {"TopicArn": "arn:topic:1", "Protocol": "sqs", "SubscriptionArn": "arn:topic:1:a"},
+                    {"TopicArn": "arn:topic:1", "Protocol": "email", "SubscriptionArn": "PendingConfirmation"},
+                ]},
+                {"Subscriptions": [{"TopicArn": "arn:topic:1", "Protocol": "sqs", "SubscriptionArn": "arn:topic:1:b"}]},
+            ],
+        }
         mock_client = MagicMock()
-        mock_client.get_paginator.return_value.paginate.return_value = [{"Topics": [{"TopicArn": "arn:topic:1"}, {"TopicArn": "arn:topic:2"}]}]
+        mock_client.get_paginator.side_effect = lambda op: MagicMock(paginate=lambda: pages[op])
         mock_client.get_topic_attributes.return_value = {"Attributes": {"DisplayName": "t1"}}
 
         boto3.Session.return_value.client.return_value = mock_client
@@ -20,9 +30,34 @@ class TestSNSAnalyzer(unittest.TestCase):
         out = a.analyze()
         self.assertEqual(out["summary"]["total_topics"], 2)
 
+        # subscription sweep only: no per-topic attribute calls
         out2 = a.analyze(include_details=True)
         self.assertIn("topics", out2)
-        self.assertEqual(out2["topics"][0]["attributes"]["DisplayName"], "t1")
+        mock_client.get_topic_attributes.assert_not_called()
+        self.assertNotIn("attributes", out2["topics"][0])
+        self.assertEqual(out2["topics"][0]["subscription_count"], 3)
+        self.assertEqual(out2["topics"][0]["pending_confirmation"], 1)
+        self.assertEqual(out2["topics"][0]["by_protocol"], {"sqs": 2, "email": 1})
+        self.assertEqual(out2["topics"][1]["subscription_count"], 0)
+        self.assertEqual(out2["summary"]["total_subscriptions"], 3)
+        self.assertEqual(out2["summary"]["topics_without_subscriptions"], 1)
+
+        a_attrs = SNSAnalyzer(fetch_attributes=True)
+        out3 = a_attrs.analyze(include_details=True)
+        self.assertEqual(out3["topics"][0]["attributes"]["DisplayName"], "t1")
+        self.assertEqual(mock_client.get_topic_attributes.call_count, 2)
+
+        # a failed subscription sweep is reported as unknown, not as zero subscriptions
+        def denied():
+            raise RuntimeError("AccessDenied")
+
+        mock_client.get_paginator.side_effect = lambda op: MagicMock(paginate=denied if op == "list_subscriptions" else lambda: pages[op])
+        out4 = SNSAnalyzer().analyze(include_details=True)
+        self.assertTrue(out4["summary"]["subscriptions_error"])
+        self.assertIsNone(out4["summary"]["total_subscriptions"])
+        self.assertNotIn("topics_without_subscriptions", out4["summary"])
+        self.assertIsNone(out4["topics"][1]["subscription_count"])
+        self.assertEqual(out4["summary"]["total_topics"], 2)
 
 
 if __name__ == "__main__":
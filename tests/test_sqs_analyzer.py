@@ -9,20 +9,40 @@ class TestSQSAnalyzer(unittest.TestCase):
         import boto3
 
         mock_client = MagicMock()
-        mock_client.list_queues.return_value = {"QueueUrls": ["https://sqs.us-east-1.amazonaws.com/123/queue1"]}
-        mock_client.get_queue_attributes.return_value = {"Attributes": {"ApproximateNumberOfMessages": "5"}}
+        # queue URLs span two ListQueues pages
+        mock_client.get_paginator.return_value.paginate.return_value = [
+            {"QueueUrls": ["https://sqs.us-east-1.amazonaws.com/123/queue1"], "NextToken": "t"},
+            {"QueueUrls": ["https://sqs.us-east-1.amazonaws.com/123/queue2.fifo"]},
+        ]
+
+        def get_queue_attributes(QueueUrl=None, AttributeNames=None):
+            if QueueUrl.endswith("queue1"):
+                return {"Attributes": {"ApproximateNumberOfMessages": "5", "ApproximateNumberOfMessagesNotVisible": "2", "RedrivePolicy": "{}"}}
+            return {"Attributes": {"ApproximateNumberOfMessages": "7"}}
+
+        mock_client.get_queue_attributes.side_effect = get_queue_attributes
 
         boto3.Session.return_value.client.return_value = mock_client
 
-        from aws_resources.analyzers.sqs import SQSAnalyzer
+        from aws_resources.analyzers.sqs import SQSAnalyzer, SUMMARY_ATTRIBUTES
 
         a = SQSAnalyzer()
         out = a.analyze()
-        self.assertEqual(out["summary"]["total_queues"], 1)
+        self.assertEqual(out["summary"]["total_queues"], 2)
+        self.assertEqual(out["summary"]["by_type"], {"fifo": 1, "standard": 1})
+        mock_client.get_queue_attributes.assert_not_called()
 
         out2 = a.analyze(include_details=True)
         self.assertIn("queues", out2)
         self.assertEqual(out2["queues"][0]["attributes"]["ApproximateNumberOfMessages"], "5")
+        self.assertEqual(out2["summary"]["total_backlog_messages"], 12)
+        self.assertEqual(out2["summary"]["total_in_flight_messages"], 2)
+        self.assertEqual(out2["summary"]["queues_with_dlq"], 1)
+        self.assertEqual(mock_client.get_queue_attributes.call_args.kwargs["AttributeNames"], ["All"])
+
+        a_subset = SQSAnalyzer(attribute_names=SUMMARY_ATTRIBUTES)
+        a_subset.analyze(include_details=True)
+        self.assertEqual(mock_client.get_queue_attributes.call_args.kwargs["AttributeNames"], SUMMARY_ATTRIBUTES)
 
 
 if __name__ == "__main__":